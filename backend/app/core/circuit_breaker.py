@@ -0,0 +1,100 @@
+import math
+import threading
+import time
+
+from app.core.config import settings
+
+
+class CircuitOpen(Exception):
+    """
+    Levée quand le disjoncteur est ouvert : la dépendance est considérée
+    indisponible. Traduite en 503 + Retry-After.
+    """
+
+    def __init__(self, retry_after: int):
+        super().__init__("Circuit open")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur à trois états :
+
+    - fermé : tout passe ; `failure_threshold` échecs consécutifs l'ouvrent
+    - ouvert : tout est refusé immédiatement pendant `reset_timeout` secondes
+    - semi-ouvert : une requête d'essai passe par intervalle de `reset_timeout` ;
+      un succès referme le disjoncteur, un échec le rouvre
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 10):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self._lock = threading.Lock()
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self.opened_total = 0
+        self.rejected = 0
+
+    def before_call(self) -> None:
+        """
+        Raises:
+            CircuitOpen: le disjoncteur est ouvert (ou un essai est déjà en cours)
+        """
+        if self.state == self.CLOSED:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait = self._opened_at + self.reset_timeout - now
+            if wait > 0:
+                self.rejected += 1
+                raise CircuitOpen(max(1, math.ceil(wait)))
+            # Requête d'essai ; la suivante attendra un nouvel intervalle
+            self.state = self.HALF_OPEN
+            self._opened_at = now
+
+    def record_success(self) -> None:
+        if self.state == self.CLOSED and self.failures == 0:
+            return
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or (
+                self.state == self.CLOSED and self.failure_threshold > 0
+                and self.failures >= self.failure_threshold
+            ):
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self.opened_total += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "state": self.state,
+                "open": self.state != self.CLOSED,
+                "failures": self.failures,
+                "opened_total": self.opened_total,
+                "rejected": self.rejected,
+            }
+
+
+# Disjoncteur de la base : alimenté par les checkouts du pool de connexions,
+# consulté par get_db avant d'ouvrir une session
+db_breaker = CircuitBreaker(
+    failure_threshold=settings.DB_BREAKER_FAILURE_THRESHOLD,
+    reset_timeout=settings.DB_BREAKER_RESET_SECONDS
+)
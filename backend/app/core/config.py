@@ -1,3 +1,6 @@
+from typing import Optional
+
+from pydantic import Field
 from pydantic_settings import BaseSettings
 
 
@@ -11,12 +14,26 @@ class Settings(BaseSettings):
     # Clé secrète utilisée pour signer les JWT
     SECRET_KEY: str
 
-    # Algorithme de signature JWT
+    # Algorithme de signature JWT : "HS256" (SECRET_KEY partagée) ou "ES256"
+    # (clé privée EC, les services tiers vérifient via /.well-known/jwks.json)
     ALGORITHM: str = "HS256"
 
+    # Clé privée PEM (ES256) et son identifiant `kid` (défaut : empreinte RFC 7638)
+    JWT_PRIVATE_KEY: Optional[str] = None
+    JWT_KEY_ID: Optional[str] = None
+
+    # Clés publiques encore acceptées, au format JWKS JSON (rotation ES256)
+    JWT_PUBLIC_KEYS: Optional[str] = None
+
+    # Cache des tokens déjà vérifiés (nombre max d'entrées, 0 = désactivé)
+    JWT_VERIFY_CACHE_SIZE: int = 10000
+
     # Durée de vie du token (en minutes)
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
+    # Durée de vie d'un refresh token (en jours, prolongée à chaque rotation)
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+
     # Configuration base de données
     POSTGRES_DB: str
     POSTGRES_USER: str
@@ -24,9 +41,140 @@ class Settings(BaseSettings):
     POSTGRES_HOST: str
     POSTGRES_PORT: int
 
-    # Clé de chiffrement pour les secrets (Fernet)
+    # Pool de connexions SQLAlchemy
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    # Attente max (secondes) d'une connexion libre avant QueuePool timeout
+    DB_POOL_TIMEOUT: float = 30
+    # Recyclage des connexions (secondes, -1 = jamais)
+    DB_POOL_RECYCLE: int = 1800
+    # Vérifie la connexion avant usage (évite les connexions mortes après failover)
+    DB_POOL_PRE_PING: bool = True
+    # statement_timeout PostgreSQL en millisecondes (0 = désactivé)
+    DB_STATEMENT_TIMEOUT_MS: int = 30000
+    # Délai max d'ouverture d'une connexion PostgreSQL (secondes)
+    DB_CONNECT_TIMEOUT: float = 5
+    # Disjoncteur : après N échecs de connexion consécutifs, les requêtes
+    # échouent immédiatement en 503 pendant DB_BREAKER_RESET_SECONDS, puis une
+    # requête d'essai passe par intervalle (threshold = 0 : désactivé)
+    DB_BREAKER_FAILURE_THRESHOLD: int = 5
+    DB_BREAKER_RESET_SECONDS: float = 10
+
+    # Sonde de disponibilité (GET /health/ready) : délai max du SELECT 1
+    # et durée de cache du résultat (secondes)
+    HEALTH_DB_TIMEOUT_SECONDS: float = 1
+    HEALTH_CACHE_SECONDS: float = 2
+
+    # Clés de chiffrement pour les secrets (Fernet), séparées par des virgules :
+    # la première chiffre, toutes déchiffrent (rotation sans interruption)
     SECRET_ENCRYPTION_KEY: str
 
+    # Job de re-chiffrement (python -m app.jobs.reencrypt) :
+    # secrets traités par transaction, et débit max pour ménager la prod
+    # (strictement positifs)
+    REENCRYPT_BATCH_SIZE: int = Field(500, gt=0)
+    REENCRYPT_MAX_ROWS_PER_SECOND: float = Field(1000, gt=0)
+
+    # Recherche floue : seuil de similarité pg_trgm (0 à 1, plus bas = plus tolérant)
+    SEARCH_SIMILARITY_THRESHOLD: float = 0.5
+
+    # Nombre max d'éléments par requête sur les endpoints /secrets/batch
+    SECRETS_BATCH_MAX_SIZE: int = 1000
+
+    # Notifications de changements (GET /secrets/events, SSE) :
+    # "postgres" = LISTEN/NOTIFY entre workers, "memory" = un seul processus
+    CHANGE_BROKER: str = "postgres"
+    # Événements en attente max par abonné avant un "resync" (contre-pression)
+    SSE_MAX_QUEUE: int = 16
+    # Intervalle des pings de maintien de connexion (secondes)
+    SSE_PING_SECONDS: float = 15
+    # Délai de reconnexion conseillé au client (millisecondes)
+    SSE_RETRY_MS: int = 5000
+
+    # Export du coffre : nombre de lignes lues par aller-retour du curseur serveur
+    EXPORT_YIELD_PER: int = 1000
+
+    # Import du coffre : lignes validées, chiffrées et insérées par transaction
+    IMPORT_CHUNK_SIZE: int = 500
+
+    # Hash des mots de passe : "bcrypt" ou "argon2id" (dépendance optionnelle argon2-cffi)
+    PASSWORD_HASH_SCHEME: str = "bcrypt"
+    # Durée visée pour un hash (ms) : le coût est calibré au démarrage
+    PASSWORD_HASH_TARGET_MS: float = 250
+    # Coût fixé à la main (None = calibration) : rounds bcrypt, time_cost argon2id
+    BCRYPT_ROUNDS: Optional[int] = None
+    ARGON2_TIME_COST: Optional[int] = None
+    # Paramètres argon2id fixes : mémoire (KiB) et parallélisme
+    ARGON2_MEMORY_KIB: int = 65536
+    ARGON2_PARALLELISM: int = 1
+
+    # Limitation des tentatives de login (seaux de jetons, vérifiés avant
+    # toute requête en base et tout hash) : débit par minute et rafale max,
+    # par IP cliente et par compte (burst = 0 : limite désactivée).
+    # Derrière un reverse proxy, lancer uvicorn avec --proxy-headers.
+    LOGIN_RATE_LIMIT_IP_PER_MINUTE: float = 30
+    LOGIN_RATE_LIMIT_IP_BURST: int = 10
+    LOGIN_RATE_LIMIT_ACCOUNT_PER_MINUTE: float = 5
+    LOGIN_RATE_LIMIT_ACCOUNT_BURST: int = 10
+    # Nombre max de seaux suivis en mémoire par worker
+    RATE_LIMIT_MAX_KEYS: int = 100000
+
+    # Logs JSON (logger "app") : niveau, taille de la file d'écriture
+    # (au-delà : logs abandonnés et comptés, jamais d'attente)
+    LOG_LEVEL: str = "INFO"
+    LOG_QUEUE_SIZE: int = 10000
+    # Avalanche d'erreurs : messages max par seconde et rafale, par type de message
+    LOG_RATE_LIMIT_PER_SECOND: float = 5
+    LOG_RATE_LIMIT_BURST: int = 20
+    # Part des requêtes réussies journalisées (logs d'accès ; les 5xx toujours)
+    LOG_ACCESS_SAMPLE_RATE: float = 0.01
+
+    # Traçage par requête (opt-in) : spans des dépendances, requêtes SQL,
+    # chiffrement et hash ; la trace des requêtes plus lentes que le seuil (ms)
+    # est journalisée (logger "app.trace"), avec au plus TRACE_MAX_SQL requêtes
+    TRACING_ENABLED: bool = False
+    TRACE_SLOW_REQUEST_MS: float = 500
+    TRACE_MAX_SQL: int = 50
+
+    # Profileur par échantillonnage (GET /debug/profile), désactivé par défaut,
+    # réservé aux comptes listés dans ADMIN_EMAILS (séparés par des virgules)
+    PROFILER_ENABLED: bool = False
+    PROFILER_MAX_SECONDS: float = 30
+    ADMIN_EMAILS: str = ""
+
+    # Jeton attendu par GET /metrics (header "Authorization: Bearer <jeton>",
+    # bearer_token côté Prometheus) ; vide = endpoint désactivé (404).
+    # Les endpoints JSON /metrics/* sont réservés aux comptes ADMIN_EMAILS
+    METRICS_TOKEN: str = ""
+
+    # Pool de processus dédié au hash bcrypt
+    # (None = un worker par cœur disponible)
+    HASH_POOL_WORKERS: Optional[int] = None
+
+    # Nombre max de hash en attente au-delà des workers occupés
+    # avant de répondre 503 (délestage)
+    HASH_POOL_MAX_QUEUE: int = 32
+
+    # Valeur du header Retry-After (en secondes) renvoyée en cas de saturation
+    HASH_POOL_RETRY_AFTER: int = 2
+
+    # Pool de threads pour le chiffrement Fernet en lot (batch, export, import)
+    # (None = un worker par cœur disponible)
+    CRYPTO_WORKERS: Optional[int] = None
+
+    # Taille min d'un morceau envoyé à un worker (en dessous : pas de parallélisme)
+    CRYPTO_MIN_CHUNK: int = 64
+
+    # Cache d'identité utilisateur de get_current_user
+    # (durée de vie en secondes, nombre max d'entrées ; 0 = désactivé)
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAX_SIZE: int = 10000
+
+    # Cache des secrets déchiffrés de GET /secrets/{id} (opt-in)
+    # (durée de vie en secondes, budget mémoire en octets ; 0 = désactivé)
+    SECRET_CACHE_TTL_SECONDS: int = 30
+    SECRET_CACHE_MAX_BYTES: int = 0
+
     class ConfigDict:
       # Indique à Pydantic de lire le fichier
       env_file = ".env"
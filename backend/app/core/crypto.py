@@ -1,9 +1,70 @@
-from cryptography.fernet import Fernet
+import asyncio
+import hashlib
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Sequence
+
+from cryptography.fernet import Fernet, InvalidToken, MultiFernet
 from app.core.config import settings
+from app.core.metrics import crypto_duration, timed
+from app.core.tracing import span
+
+
+def load_keys(raw_keys: str) -> list[Fernet]:
+    """
+    Clés Fernet séparées par des virgules, la plus récente en premier.
+    """
+    keys = [key.strip() for key in raw_keys.split(",") if key.strip()]
+    if not keys:
+        raise ValueError("SECRET_ENCRYPTION_KEY ne contient aucune clé")
+    return [Fernet(key) for key in keys]
+
+
+def key_fingerprint(raw_keys: str) -> str:
+    """
+    Empreinte courte de la clé primaire (jamais la clé elle-même).
+    """
+    primary = raw_keys.split(",")[0].strip()
+    return hashlib.sha256(primary.encode()).hexdigest()[:16]
+
+
+class Keyring:
+    """
+    Trousseau de clés chargé :
+    chiffrement avec la première, déchiffrement avec n'importe laquelle.
+    """
+
+    def __init__(self, raw_keys: str):
+        keys = load_keys(raw_keys)
+        self.fernet = MultiFernet(keys)
+        self.primary = keys[0]
+        self.fingerprint = key_fingerprint(raw_keys)
+
+
+# Trousseau actif, construit au premier usage (ou au démarrage de l'API)
+# depuis SECRET_ENCRYPTION_KEY : rien n'est fait à l'import
+_keyring: Optional[Keyring] = None
 
 
-# La clé est chargée depuis les variables d'environnement
-fernet = Fernet(settings.SECRET_ENCRYPTION_KEY)
+def get_keyring() -> Keyring:
+    global _keyring
+    if _keyring is None:
+        _keyring = Keyring(settings.SECRET_ENCRYPTION_KEY)
+    return _keyring
+
+
+def set_encryption_keys(raw_keys: str) -> None:
+    """
+    (Re)charge le trousseau de clés (rotation, tests).
+    """
+    global _keyring
+    _keyring = Keyring(raw_keys)
+
+
+# Histogrammes des opérations unitaires, résolus une fois (chemin chaud)
+_encrypt_timer = crypto_duration.labels("encrypt")
+_decrypt_timer = crypto_duration.labels("decrypt")
 
 
 def encrypt_secret(plain_text: str) -> str:
@@ -13,7 +74,8 @@ def encrypt_secret(plain_text: str) -> str:
     - entrée : texte en clair
     - sortie : texte chiffré (base64)
     """
-    return fernet.encrypt(plain_text.encode()).decode()
+    with timed(_encrypt_timer), span("crypto.encrypt"):
+        return get_keyring().fernet.encrypt(plain_text.encode()).decode()
 
 
 def decrypt_secret(encrypted_text: str) -> str:
@@ -21,4 +83,150 @@ def decrypt_secret(encrypted_text: str) -> str:
     Déchiffre une chaîne chiffrée.
 
     """
-    return fernet.decrypt(encrypted_text.encode()).decode()
+    with timed(_decrypt_timer), span("crypto.decrypt"):
+        return get_keyring().fernet.decrypt(encrypted_text.encode()).decode()
+
+
+def _encrypt_chunk(values: Sequence[Optional[str]]) -> list[Optional[str]]:
+    encrypt = get_keyring().fernet.encrypt
+    return [None if value is None else encrypt(value.encode()).decode() for value in values]
+
+
+def _decrypt_chunk(tokens: Sequence[Optional[str]]) -> list[Optional[str]]:
+    # Fernet accepte directement un token str : pas d'encode() intermédiaire
+    decrypt = get_keyring().fernet.decrypt
+    return [None if token is None else decrypt(token).decode() for token in tokens]
+
+
+def _rotate_chunk(tokens: Sequence[str]) -> list[Optional[str]]:
+    # None : token déjà chiffré avec la clé primaire, rien à réécrire
+    # token inchangé : illisible avec toutes les clés connues
+    keyring = get_keyring()
+    rotated = []
+    for token in tokens:
+        try:
+            keyring.primary.decrypt(token)
+            rotated.append(None)
+        except InvalidToken:
+            try:
+                rotated.append(keyring.fernet.rotate(token).decode())
+            except InvalidToken:
+                rotated.append(token)
+    return rotated
+
+
+class CryptoPool:
+    """
+    Pool de threads pour le chiffrement / déchiffrement en lot.
+
+    Des threads plutôt que des processus : ni sérialisation des lots ni
+    copie de la clé. Le gain multi-cœur dépend de la part du calcul faite
+    dans OpenSSL hors GIL (mesurer avec benchmarks/crypto.py) ; dans tous
+    les cas, map_async libère la boucle d'événements pendant le calcul.
+    Les lots sont découpés en un morceau par worker, l'ordre est conservé.
+    En dessous de min_chunk éléments, map reste dans le thread appelant.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, min_chunk: int = 64):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.min_chunk = min_chunk
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        # Création paresseuse : aucun thread n'est lancé à l'import
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="crypto"
+                )
+            return self._executor
+
+    def _chunks(self, values: Sequence) -> list[Sequence]:
+        size = max(self.min_chunk, -(-len(values) // self.max_workers))
+        return [values[i:i + size] for i in range(0, len(values), size)]
+
+    def map(self, fn, values: Sequence) -> list:
+        """
+        Applique fn (traitement d'un morceau) à tout le lot, en parallèle.
+        """
+        chunks = self._chunks(values)
+        if len(chunks) <= 1:
+            return fn(values)
+
+        results = []
+        for chunk_result in self._get_executor().map(fn, chunks):
+            results.extend(chunk_result)
+        return results
+
+    async def map_async(self, fn, values: Sequence) -> list:
+        """
+        Version non bloquante de map : la boucle d'événements reste libre
+        pendant le calcul, même pour un petit lot.
+        """
+        executor = self._get_executor()
+        chunk_results = await asyncio.gather(*[
+            asyncio.wrap_future(executor.submit(fn, chunk))
+            for chunk in self._chunks(values)
+        ])
+
+        results = []
+        for chunk_result in chunk_results:
+            results.extend(chunk_result)
+        return results
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+# Instance globale utilisée par les chemins en lot (batch, export, import)
+crypto_pool = CryptoPool(
+    max_workers=settings.CRYPTO_WORKERS,
+    min_chunk=settings.CRYPTO_MIN_CHUNK
+)
+
+
+def encrypt_many(values: Sequence[Optional[str]]) -> list[Optional[str]]:
+    """
+    Chiffre un lot de chaînes, dans l'ordre (None est conservé tel quel).
+    """
+    with timed(crypto_duration.labels("encrypt_many")), span("crypto.encrypt_many"):
+        return crypto_pool.map(_encrypt_chunk, values)
+
+
+def decrypt_many(tokens: Sequence[Optional[str]]) -> list[Optional[str]]:
+    """
+    Déchiffre un lot de chaînes, dans l'ordre (None est conservé tel quel).
+    """
+    with timed(crypto_duration.labels("decrypt_many")), span("crypto.decrypt_many"):
+        return crypto_pool.map(_decrypt_chunk, tokens)
+
+
+async def encrypt_many_async(values: Sequence[Optional[str]]) -> list[Optional[str]]:
+    """
+    Version non bloquante de encrypt_many, exécutée dans le pool.
+    """
+    with timed(crypto_duration.labels("encrypt_many")), span("crypto.encrypt_many"):
+        return await crypto_pool.map_async(_encrypt_chunk, values)
+
+
+async def decrypt_many_async(tokens: Sequence[Optional[str]]) -> list[Optional[str]]:
+    """
+    Version non bloquante de decrypt_many, exécutée dans le pool.
+    """
+    with timed(crypto_duration.labels("decrypt_many")), span("crypto.decrypt_many"):
+        return await crypto_pool.map_async(_decrypt_chunk, tokens)
+
+
+async def rotate_many_async(tokens: Sequence[str]) -> list[Optional[str]]:
+    """
+    Re-chiffre un lot de tokens avec la clé primaire, dans l'ordre.
+    Renvoie None pour les tokens déjà chiffrés avec la clé primaire,
+    et le token inchangé s'il est illisible avec toutes les clés connues.
+    """
+    return await crypto_pool.map_async(_rotate_chunk, tokens)
@@ -0,0 +1,26 @@
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+
+def encode_cursor(created_at: datetime, secret_id: UUID) -> str:
+    """
+    Encode la position (created_at, id) du dernier élément d'une page
+    en un curseur opaque (base64 url-safe).
+    """
+    raw = json.dumps({"c": created_at.isoformat(), "i": str(secret_id)})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """
+    Décode un curseur produit par encode_cursor.
+    Lève ValueError si le curseur est invalide.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(data["c"]), UUID(data["i"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
@@ -0,0 +1,31 @@
+import hashlib
+from typing import Optional
+
+
+def compute_etag(*parts) -> str:
+    """
+    ETag fort, opaque, dérivé des éléments qui déterminent la réponse
+    (utilisateur, version du coffre, paramètres de requête...).
+    """
+    digest = hashlib.sha256("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Vrai si le header If-None-Match désigne déjà la représentation courante
+    (liste séparée par des virgules, préfixe faible W/ ignoré, ou *).
+    """
+    if not if_none_match:
+        return False
+
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+
+    return False
@@ -0,0 +1,288 @@
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import asyncpg
+
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """
+    Abonnement d'un client aux changements de son coffre.
+
+    File bornée (contre-pression) : si le client ne consomme pas assez vite,
+    les événements en attente sont abandonnés et remplacés par un unique
+    événement `resync` (le client repart de GET /secrets/changes).
+    """
+
+    def __init__(self, user_id: str, max_queue: int):
+        self.user_id = user_id
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self._overflowed = False
+
+    def put(self, event: dict) -> bool:
+        """
+        Dépose un événement sans jamais bloquer l'émetteur.
+        Renvoie False si la file a débordé.
+        """
+        if self._overflowed:
+            return False
+        try:
+            self._queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            self._overflowed = True
+            # Réveille un lecteur en attente pour qu'il envoie le resync
+            while not self._queue.empty():
+                self._queue.get_nowait()
+            self._queue.put_nowait({"type": "resync"})
+            return False
+
+    async def get(self) -> dict:
+        event = await self._queue.get()
+        if event.get("type") == "resync":
+            self._overflowed = False
+        return event
+
+
+class ChangeBroker(ABC):
+    """
+    Diffusion des changements de coffre aux abonnés SSE de ce processus.
+
+    - publish : annonce un changement (après le commit de l'écriture)
+    - subscribe / unsubscribe : abonnés locaux, indexés par utilisateur
+
+    Le backend décide comment un changement publié par un worker
+    atteint les abonnés des autres workers (voir PostgresChangeBroker).
+    """
+
+    def __init__(self, max_queue: int = 16):
+        self.max_queue = max_queue
+        self._subscriptions: dict[str, set[Subscription]] = {}
+        self.published = 0
+        self.delivered = 0
+        self.overflows = 0
+
+    def subscribe(self, user_id) -> Subscription:
+        subscription = Subscription(str(user_id), self.max_queue)
+        self._subscriptions.setdefault(subscription.user_id, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self._subscriptions.get(subscription.user_id)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscriptions[subscription.user_id]
+
+    def _deliver(self, user_id: str, event: dict) -> None:
+        for subscription in self._subscriptions.get(user_id, ()):
+            if subscription.put(event):
+                self.delivered += 1
+            else:
+                self.overflows += 1
+
+    def _resync_all(self) -> None:
+        # Des notifications ont pu être perdues : tous les abonnés resynchronisent
+        for subscriptions in self._subscriptions.values():
+            for subscription in subscriptions:
+                subscription.put({"type": "resync"})
+
+    @abstractmethod
+    async def publish(self, user_id, event: dict) -> None:
+        ...
+
+    async def stop(self) -> None:
+        pass
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self).__name__,
+            "users": len(self._subscriptions),
+            "subscribers": sum(len(s) for s in self._subscriptions.values()),
+            "published": self.published,
+            "delivered": self.delivered,
+            "overflows": self.overflows,
+        }
+
+
+class InMemoryChangeBroker(ChangeBroker):
+    """
+    Diffusion locale au processus (un seul worker, tests).
+    """
+
+    async def publish(self, user_id, event: dict) -> None:
+        self.published += 1
+        self._deliver(str(user_id), event)
+
+
+class PostgresChangeBroker(ChangeBroker):
+    """
+    Diffusion entre workers via PostgreSQL LISTEN/NOTIFY.
+
+    Chaque worker ouvre UNE connexion dédiée (hors pool SQLAlchemy) qui
+    écoute le canal ; publish envoie un NOTIFY, reçu par tous les workers
+    (y compris l'émetteur) qui le distribuent à leurs abonnés locaux.
+    La charge utile reste minimale (utilisateur + version) : aucune
+    donnée de secret ne transite par NOTIFY.
+
+    Si la connexion d'écoute tombe, elle est rouverte en arrière-plan
+    et tous les abonnés reçoivent un `resync`.
+
+    publish ne touche pas au réseau : le NOTIFY part d'une tâche d'envoi,
+    via une file bornée (`max_pending`). Une écriture déjà validée n'attend
+    donc jamais une connexion lente ou en cours de réouverture ; si la file
+    est pleine ou l'envoi échoue, la notification est abandonnée (comptée
+    dans `dropped`) et les clients rattrapent via /secrets/changes.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        channel: str = "secrets_changes",
+        max_queue: int = 16,
+        max_pending: int = 1000
+    ):
+        super().__init__(max_queue=max_queue)
+        self.dsn = dsn
+        self.channel = channel
+        self.max_pending = max_pending
+        self.dropped = 0
+
+        self._connection: Optional[asyncpg.Connection] = None
+        self._connect_lock = asyncio.Lock()
+        self._notify_lock = asyncio.Lock()
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._outbox: Optional[asyncio.Queue] = None
+        self._sender_task: Optional[asyncio.Task] = None
+        self._stopped = False
+
+    async def _ensure_connection(self) -> asyncpg.Connection:
+        async with self._connect_lock:
+            if self._connection is None or self._connection.is_closed():
+                connection = await asyncpg.connect(self.dsn, timeout=settings.DB_CONNECT_TIMEOUT)
+                await connection.add_listener(self.channel, self._on_notify)
+                connection.add_termination_listener(self._on_terminate)
+                self._connection = connection
+            return self._connection
+
+    def _on_notify(self, connection, pid, channel, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+            user_id = event.pop("user_id")
+        except (ValueError, KeyError):
+            return
+        self._deliver(user_id, event)
+
+    def _on_terminate(self, connection) -> None:
+        if self._stopped:
+            return
+        self._connection = None
+        self._resync_all()
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        delay = 0.5
+        while not self._stopped:
+            try:
+                await self._ensure_connection()
+                self._resync_all()
+                return
+            except (OSError, asyncio.TimeoutError, asyncpg.PostgresError) as e:
+                logger.warning("Change broker reconnect failed: %s", type(e).__name__, exc_info=True)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30)
+
+    def subscribe(self, user_id) -> Subscription:
+        subscription = super().subscribe(user_id)
+        if self._connection is None and not self._stopped:
+            # Démarre l'écoute au premier abonné (sans bloquer l'appelant)
+            if self._reconnect_task is None or self._reconnect_task.done():
+                self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect())
+        return subscription
+
+    async def publish(self, user_id, event: dict) -> None:
+        if self._stopped:
+            return
+        if self._outbox is None:
+            self._outbox = asyncio.Queue(maxsize=self.max_pending)
+        if self._sender_task is None or self._sender_task.done():
+            self._sender_task = asyncio.get_running_loop().create_task(self._send_loop())
+        try:
+            self._outbox.put_nowait(json.dumps({"user_id": str(user_id), **event}))
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def _send_loop(self) -> None:
+        while True:
+            payload = await self._outbox.get()
+            try:
+                connection = await self._ensure_connection()
+                # Une connexion asyncpg n'exécute qu'une requête à la fois
+                async with self._notify_lock:
+                    await connection.execute(
+                        "SELECT pg_notify($1, $2)", self.channel, payload,
+                        timeout=settings.DB_CONNECT_TIMEOUT
+                    )
+                self.published += 1
+            except (OSError, asyncio.TimeoutError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+                self.dropped += 1
+                logger.warning("Change notification dropped: %s", type(e).__name__)
+
+    def stats(self) -> dict:
+        stats = super().stats()
+        stats["pending"] = self._outbox.qsize() if self._outbox is not None else 0
+        stats["dropped"] = self.dropped
+        return stats
+
+    async def stop(self) -> None:
+        self._stopped = True
+        for task in (self._reconnect_task, self._sender_task):
+            if task is not None:
+                task.cancel()
+        if self._connection is not None and not self._connection.is_closed():
+            await self._connection.close()
+        self._connection = None
+
+
+def _postgres_dsn() -> str:
+    return (
+        f"postgresql://{settings.POSTGRES_USER}:"
+        f"{settings.POSTGRES_PASSWORD}@"
+        f"{settings.POSTGRES_HOST}:"
+        f"{settings.POSTGRES_PORT}/"
+        f"{settings.POSTGRES_DB}"
+    )
+
+
+def _build_broker() -> ChangeBroker:
+    if settings.CHANGE_BROKER == "memory":
+        return InMemoryChangeBroker(max_queue=settings.SSE_MAX_QUEUE)
+    return PostgresChangeBroker(_postgres_dsn(), max_queue=settings.SSE_MAX_QUEUE)
+
+
+# Backend actif (remplaçable au démarrage ou dans les tests),
+# construit au premier usage : aucune connexion à l'import
+_broker: Optional[ChangeBroker] = None
+
+
+def get_change_broker() -> ChangeBroker:
+    global _broker
+    if _broker is None:
+        _broker = _build_broker()
+    return _broker
+
+
+def set_change_broker(broker: ChangeBroker) -> None:
+    """
+    Remplace le broker de changements (ex. InMemoryChangeBroker en test).
+    """
+    global _broker
+    _broker = broker
@@ -0,0 +1,48 @@
+import csv
+import io
+import json
+from typing import Iterable
+
+
+# Colonnes exportées, dans l'ordre (NDJSON et CSV)
+EXPORT_FIELDS = ("id", "title", "username", "password", "url", "created_at", "updated_at")
+
+
+def _export_value(value):
+    if value is None:
+        return None
+    if isinstance(value, (str, int, float)):
+        return value
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def ndjson_chunk(rows: Iterable[dict]) -> str:
+    """
+    Sérialise un lot de secrets déchiffrés en NDJSON (un objet JSON par ligne).
+    """
+    return "".join(
+        json.dumps({field: _export_value(row[field]) for field in EXPORT_FIELDS}, ensure_ascii=False) + "\n"
+        for row in rows
+    )
+
+
+def csv_header() -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(EXPORT_FIELDS)
+    return buffer.getvalue()
+
+
+def csv_chunk(rows: Iterable[dict]) -> str:
+    """
+    Sérialise un lot de secrets déchiffrés en lignes CSV (sans en-tête).
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([
+            "" if row[field] is None else _export_value(row[field])
+            for field in EXPORT_FIELDS
+        ])
+    return buffer.getvalue()
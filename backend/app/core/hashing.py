@@ -0,0 +1,246 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import secrets
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+
+from app.core.config import settings
+from app.core import security
+from app.core.metrics import password_hash_duration, timed
+from app.core.tracing import span
+
+logger = logging.getLogger(__name__)
+
+
+class HashingPoolSaturated(Exception):
+    """
+    Levée quand le pool de hash a atteint sa profondeur de file max.
+    Le router la traduit en 503 + Retry-After.
+    """
+
+    def __init__(self, retry_after: int):
+        super().__init__("Hashing pool saturated")
+        self.retry_after = retry_after
+
+
+class HashingPool:
+    """
+    Pool de processus dédié aux opérations bcrypt.
+
+    - Les hash ne consomment plus les threads du threadpool AnyIO :
+      /health et /secrets restent servis pendant un pic de logins.
+    - Un processus par worker → vrai parallélisme multi-cœur.
+    - La file d'attente est bornée : au-delà, on déleste (503)
+      plutôt que d'empiler des requêtes qui expireront de toute façon.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_queue: int = 32,
+        retry_after: int = 2
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.retry_after = retry_after
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def max_in_flight(self) -> int:
+        return self.max_workers + self.max_queue
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Création paresseuse : aucun processus n'est lancé à l'import
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                # "spawn" : pas de fork d'un process multi-threadé (uvicorn)
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def run(self, fn, *args):
+        """
+        Exécute fn(*args) dans le pool et attend le résultat
+        sans bloquer la boucle d'événements.
+
+        Raises:
+            HashingPoolSaturated: file d'attente pleine
+        """
+        with self._lock:
+            if self._in_flight >= self.max_in_flight:
+                raise HashingPoolSaturated(self.retry_after)
+            self._in_flight += 1
+            executor = self._get_executor()
+
+        try:
+            try:
+                future = executor.submit(fn, *args)
+            except BaseException:
+                self._release()
+                raise
+            # Libéré quand le job se termine, pas quand l'appelant arrête
+            # d'attendre : une requête annulée (client déconnecté) laisse
+            # son hash tourner, il doit rester compté
+            future.add_done_callback(self._release)
+            return await asyncio.wrap_future(future)
+        except BrokenProcessPool:
+            # Un worker est mort : on repart sur un pool neuf au prochain appel
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            executor.shutdown(wait=False)
+            raise
+
+    def _release(self, future=None) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+# Instance globale utilisée par le router d'authentification
+hashing_pool = HashingPool(
+    max_workers=settings.HASH_POOL_WORKERS,
+    max_queue=settings.HASH_POOL_MAX_QUEUE,
+    retry_after=settings.HASH_POOL_RETRY_AFTER
+)
+
+
+# Politique de hash courante (calibrée une fois par processus) et hash
+# factice associé, vérifié quand l'email est inconnu (coût constant)
+_hash_policy: Optional[dict] = None
+_dummy_hash: Optional[str] = None
+_policy_lock = threading.Lock()
+
+
+def _configured_policy() -> dict:
+    if settings.PASSWORD_HASH_SCHEME == "argon2id":
+        if settings.ARGON2_TIME_COST:
+            return {
+                "scheme": "argon2id",
+                "time_cost": settings.ARGON2_TIME_COST,
+                "memory_kib": settings.ARGON2_MEMORY_KIB,
+                "parallelism": settings.ARGON2_PARALLELISM,
+            }
+    elif settings.BCRYPT_ROUNDS:
+        return {"scheme": "bcrypt", "rounds": settings.BCRYPT_ROUNDS}
+
+    return security.calibrate_policy(
+        settings.PASSWORD_HASH_SCHEME,
+        settings.PASSWORD_HASH_TARGET_MS,
+        memory_kib=settings.ARGON2_MEMORY_KIB,
+        parallelism=settings.ARGON2_PARALLELISM
+    )
+
+
+def get_hash_policy() -> dict:
+    """
+    Politique de hash courante : fixée par la configuration, ou calibrée
+    sur PASSWORD_HASH_TARGET_MS au premier appel (lancé en tâche de fond
+    au démarrage de l'API, voir lifespan). Bloquant : depuis la boucle
+    d'événements, utiliser get_hash_policy_async.
+    """
+    global _hash_policy, _dummy_hash
+    with _policy_lock:
+        if _hash_policy is None:
+            # Hash factice prêt avant de publier la politique (lue sans verrou)
+            policy = _configured_policy()
+            _dummy_hash = security.hash_password(secrets.token_urlsafe(16), policy)
+            _hash_policy = policy
+        return _hash_policy
+
+
+def set_hash_policy(policy: Optional[dict]) -> None:
+    """
+    Remplace la politique de hash (tests) ; None = recalibrer au prochain appel.
+    """
+    global _hash_policy, _dummy_hash
+    with _policy_lock:
+        _hash_policy = None
+        _dummy_hash = security.hash_password(secrets.token_urlsafe(16), policy) if policy else None
+        _hash_policy = policy
+
+
+def hash_policy_ready() -> bool:
+    return _hash_policy is not None
+
+
+async def get_hash_policy_async() -> dict:
+    """
+    get_hash_policy sans bloquer la boucle d'événements : tant que la
+    calibration n'est pas faite, l'attente se fait dans un thread.
+    """
+    policy = _hash_policy
+    if policy is not None:
+        return policy
+    return await asyncio.to_thread(get_hash_policy)
+
+
+async def warm_up_hash_policy() -> None:
+    """
+    Calibration lancée en tâche de fond au démarrage de l'API : le worker
+    répond tout de suite, /health/ready attend la fin de la calibration.
+    """
+    try:
+        await get_hash_policy_async()
+    except Exception:
+        logger.exception("Hash policy calibration failed")
+
+
+async def hash_password_async(password: str) -> str:
+    """
+    Version non bloquante de hash_password, exécutée dans le pool.
+    """
+    with timed(password_hash_duration.labels("hash")), span("password.hash"):
+        policy = await get_hash_policy_async()
+        return await hashing_pool.run(security.hash_password, password, policy)
+
+
+async def verify_password_async(password: str, hashed_password: str) -> bool:
+    """
+    Version non bloquante de verify_password, exécutée dans le pool.
+    """
+    with timed(password_hash_duration.labels("verify")), span("password.verify"):
+        return await hashing_pool.run(security.verify_password, password, hashed_password)
+
+
+async def verify_and_rehash_async(password: str, hashed_password: str) -> tuple[bool, Optional[str]]:
+    """
+    Vérifie le mot de passe dans le pool et renvoie un nouveau hash
+    si le hash stocké ne suit plus la politique courante.
+    """
+    policy = await get_hash_policy_async()
+    with timed(password_hash_duration.labels("verify")), span("password.verify"):
+        return await hashing_pool.run(
+            security.verify_and_rehash,
+            password,
+            hashed_password,
+            policy
+        )
+
+
+async def verify_dummy_async(password: str) -> None:
+    """
+    Vérification factice pour un email inconnu : même coût qu'une vraie
+    vérification, pour ne pas révéler par le temps de réponse
+    qu'un compte n'existe pas.
+    """
+    policy = await get_hash_policy_async()
+    with timed(password_hash_duration.labels("verify_dummy")), span("password.verify_dummy"):
+        await hashing_pool.run(security.verify_and_rehash, password, _dummy_hash, policy)
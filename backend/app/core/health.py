@@ -0,0 +1,89 @@
+import asyncio
+import time
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy import text
+
+from app.core.circuit_breaker import db_breaker
+from app.core.config import settings
+from app.core.hashing import hash_policy_ready
+from app.db.session import get_engine
+
+
+class ReadinessProbe:
+    """
+    Vérification d'une dépendance pour la sonde de disponibilité.
+
+    - timeout : durée max d'une vérification (au-delà : échec)
+    - cache_seconds : le dernier résultat est resservi pendant ce délai,
+      les sondes du load balancer ne frappent donc pas la base à chaque appel
+    - une seule vérification en vol : les appels concurrents l'attendent
+    """
+
+    def __init__(self, check: Callable[[], Awaitable[None]], timeout: float = 1, cache_seconds: float = 2):
+        self.check = check
+        self.timeout = timeout
+        self.cache_seconds = cache_seconds
+
+        self._lock: Optional[asyncio.Lock] = None
+        self._result: Optional[dict] = None
+        self._checked_at = 0.0
+
+    async def result(self) -> dict:
+        if self._result is not None and time.monotonic() - self._checked_at < self.cache_seconds:
+            return self._result
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            # Déjà rafraîchi par un appel concurrent
+            if self._result is not None and time.monotonic() - self._checked_at < self.cache_seconds:
+                return self._result
+
+            start = time.perf_counter()
+            try:
+                await asyncio.wait_for(self.check(), self.timeout)
+                result = {"status": "ok"}
+            except asyncio.TimeoutError:
+                result = {"status": "error", "error": "timeout"}
+            except Exception as e:
+                result = {"status": "error", "error": type(e).__name__}
+            result["latency_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+            self._result, self._checked_at = result, time.monotonic()
+            return result
+
+    def clear(self) -> None:
+        self._result = None
+
+
+async def ping_database() -> None:
+    # Passe par le pool : un succès referme aussi le disjoncteur
+    async with get_engine().connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+database_probe = ReadinessProbe(
+    ping_database,
+    timeout=settings.HEALTH_DB_TIMEOUT_SECONDS,
+    cache_seconds=settings.HEALTH_CACHE_SECONDS
+)
+
+
+async def readiness() -> dict:
+    """
+    État de disponibilité du worker : base joignable (résultat mis en
+    cache), disjoncteur de la base, et préchauffage terminé (calibration
+    du hash des mots de passe, lancée en tâche de fond au démarrage).
+    """
+    database = await database_probe.result()
+    breaker = db_breaker.stats()
+    warm = hash_policy_ready()
+    ready = database["status"] == "ok" and warm
+    return {
+        "status": "ok" if ready else "error",
+        "checks": {
+            "database": database,
+            "db_breaker": {"state": breaker["state"]},
+            "hash_policy": {"status": "ok" if warm else "pending"},
+        },
+    }
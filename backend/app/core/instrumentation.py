@@ -0,0 +1,170 @@
+import logging
+import re
+import time
+import uuid
+
+from fastapi import Request
+from fastapi.exception_handlers import http_exception_handler
+from starlette.exceptions import HTTPException as StarletteHTTPException
+
+from app.core.config import settings
+from app.core.log import request_id_var, should_sample
+from app.core.metrics import errors_total, http_request_duration, http_requests_in_progress, http_requests_total
+from app.core.tracing import start_trace
+
+
+access_logger = logging.getLogger("app.access")
+trace_logger = logging.getLogger("app.trace")
+
+# X-Request-ID accepté tel quel s'il est raisonnable (sinon on en génère un)
+_REQUEST_ID_RE = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+# Requêtes sans route correspondante (404, scans) : une seule série
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def route_template(scope) -> str:
+    """
+    Modèle de chemin de la route servie (ex. /secrets/{secret_id}),
+    jamais le chemin brut : le nombre de séries reste borné.
+    """
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI pur (pas de BaseHTTPMiddleware : les réponses en
+    streaming, export et SSE, ne sont pas mises en mémoire tampon).
+
+    Par requête : compteur par méthode / route / statut, histogramme
+    de durée par méthode / route, requêtes en cours, et exceptions
+    non gérées par type.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_progress.inc(method)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as e:
+            errors_total.inc(type(e).__name__, route_template(scope))
+            raise
+        finally:
+            http_requests_in_progress.inc(method, amount=-1)
+            route = route_template(scope)
+            http_requests_total.inc(method, route, str(status_code))
+            http_request_duration.labels(method, route).observe(time.perf_counter() - start)
+
+
+class RequestContextMiddleware:
+    """
+    Middleware ASGI : identifiant de requête et log d'accès.
+
+    - reprend X-Request-ID du client / proxy (ou en génère un), le rend
+      disponible aux logs via une contextvar et le renvoie en en-tête
+    - log d'accès JSON échantillonné (LOG_ACCESS_SAMPLE_RATE),
+      systématique pour les réponses 5xx
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = dict(scope["headers"]).get(b"x-request-id", b"").decode("latin-1")
+        request_id = incoming if _REQUEST_ID_RE.match(incoming) else uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+        status_code = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-request-id", request_id.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if status_code >= 500 or should_sample(settings.LOG_ACCESS_SAMPLE_RATE):
+                access_logger.info("request", extra={
+                    "method": scope["method"],
+                    "route": route_template(scope),
+                    "status": status_code,
+                    "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+                })
+            request_id_var.reset(token)
+
+
+class TracingMiddleware:
+    """
+    Middleware ASGI de traçage (opt-in, TRACING_ENABLED) : ouvre une trace
+    par requête et, si la requête dépasse TRACE_SLOW_REQUEST_MS, journalise
+    le détail des spans et des requêtes SQL exécutées.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.TRACING_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        with start_trace(max_sql=settings.TRACE_MAX_SQL) as trace:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                duration_ms = trace.elapsed_ms()
+                if duration_ms >= settings.TRACE_SLOW_REQUEST_MS:
+                    trace_logger.warning("Slow request", extra={
+                        "method": scope["method"],
+                        "route": route_template(scope),
+                        "status": status_code,
+                        "duration_ms": duration_ms,
+                        **trace.to_dict(),
+                    })
+
+
+async def count_server_errors(request: Request, exc: StarletteHTTPException):
+    """
+    Handler des HTTPException : les routers traduisent les erreurs
+    (SQLAlchemyError...) en 500 via `raise HTTPException(...)` dans un
+    `except`, l'exception d'origine est donc dans __context__.
+    On compte son type, puis on délègue au handler standard de FastAPI.
+    """
+    if exc.status_code >= 500:
+        cause = exc.__cause__ or exc.__context__ or exc
+        errors_total.inc(type(cause).__name__, route_template(request.scope))
+    return await http_exception_handler(request, exc)
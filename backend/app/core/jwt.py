@@ -1,9 +1,188 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional
-from jose import jwt
+
+from jose import jwk, jwt
+from jose.backends.base import Key
+from jose.utils import base64url_encode
 
 from app.core.config import settings
 
+
+def jwk_thumbprint(public_jwk: dict) -> str:
+    """
+    Empreinte RFC 7638 d'une clé publique EC, utilisée comme `kid` par défaut.
+    """
+    members = {name: public_jwk[name] for name in ("crv", "kty", "x", "y")}
+    canonical = json.dumps(members, separators=(",", ":"), sort_keys=True)
+    return base64url_encode(hashlib.sha256(canonical.encode("utf-8")).digest()).decode("ascii")
+
+
+class JWTKeys:
+    """
+    Matériel de clés JWT préparé une seule fois au chargement
+    (pas de re-parsing de la clé à chaque requête).
+
+    - HS256 : SECRET_KEY partagée, signe et vérifie
+    - ES256 : clé privée EC P-256 pour signer ; les clés publiques
+      (courante + JWT_PUBLIC_KEYS pendant une rotation) sont indexées
+      par `kid` et publiées dans le JWKS pour les services tiers
+    """
+
+    def __init__(
+        self,
+        algorithm: str,
+        secret_key: Optional[str] = None,
+        private_key: Optional[str] = None,
+        key_id: Optional[str] = None,
+        public_keys: Optional[str] = None
+    ):
+        self.algorithm = algorithm
+        self.verify_keys: dict[Optional[str], Key] = {}
+        self.public_jwks: list[dict] = []
+
+        if algorithm.startswith("HS"):
+            self.signing_key = jwk.construct(secret_key, algorithm)
+            self.key_id = None
+            self.verify_keys[None] = self.signing_key
+            return
+
+        if not private_key:
+            raise ValueError(f"JWT_PRIVATE_KEY est requise pour {algorithm}")
+
+        # PEM passée sur une ligne dans une variable d'environnement
+        private_key = private_key.replace("\\n", "\n")
+        self.signing_key = jwk.construct(private_key, algorithm)
+        public_jwk = self.signing_key.public_key().to_dict()
+        self.key_id = key_id or jwk_thumbprint(public_jwk)
+        self._add_public_key({**public_jwk, "kid": self.key_id})
+
+        # Clés publiques encore acceptées (ex. clé précédente en rotation)
+        if public_keys:
+            for extra in json.loads(public_keys).get("keys", []):
+                self._add_public_key({**extra, "kid": extra.get("kid") or jwk_thumbprint(extra)})
+
+    def _add_public_key(self, public_jwk: dict) -> None:
+        public_jwk = {**public_jwk, "alg": self.algorithm, "use": "sig"}
+        self.verify_keys[public_jwk["kid"]] = jwk.construct(public_jwk, self.algorithm)
+        self.public_jwks.append(public_jwk)
+
+    def verify_key(self, key_id: Optional[str]) -> Key:
+        """
+        Clé de vérification d'un token d'après le `kid` de son en-tête
+        (sans `kid` : la clé de signature courante).
+        """
+        if key_id is None and self.key_id is not None:
+            key_id = self.key_id
+        key = self.verify_keys.get(key_id)
+        if key is None:
+            raise jwt.JWTError("Unknown key id")
+        return key
+
+    def jwks(self) -> dict:
+        return {"keys": list(self.public_jwks)}
+
+
+class VerifiedTokenCache:
+    """
+    Cache des tokens déjà vérifiés, LRU de taille bornée.
+
+    - clé : SHA-256 du token (le token lui-même n'est pas conservé)
+    - valeur : (exp, payload) ; l'expiration est revérifiée à chaque hit
+    - max_size : nombre max d'entrées (0 = cache désactivé)
+
+    Seuls des tokens dont la signature a été validée y entrent :
+    un token falsifié ne peut donc jamais produire de hit.
+    """
+
+    def __init__(self, max_size: int = 10_000):
+        self.max_size = max_size
+
+        self._entries: "OrderedDict[bytes, tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, digest: bytes) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, payload = entry
+            if expires_at <= time.time():
+                del self._entries[digest]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return dict(payload)
+
+    def set(self, digest: bytes, payload: dict) -> None:
+        # Pas d'expiration = pas de borne de validité : jamais mis en cache
+        if self.max_size <= 0 or "exp" not in payload:
+            return
+        with self._lock:
+            self._entries[digest] = (float(payload["exp"]), dict(payload))
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+def load_jwt_keys() -> JWTKeys:
+    return JWTKeys(
+        settings.ALGORITHM,
+        secret_key=settings.SECRET_KEY,
+        private_key=settings.JWT_PRIVATE_KEY,
+        key_id=settings.JWT_KEY_ID,
+        public_keys=settings.JWT_PUBLIC_KEYS
+    )
+
+
+# Clés actives et cache de vérification (globaux au processus)
+jwt_keys: JWTKeys = load_jwt_keys()
+verify_cache = VerifiedTokenCache(max_size=settings.JWT_VERIFY_CACHE_SIZE)
+
+
+def set_jwt_keys(keys: JWTKeys) -> None:
+    """
+    Remplace les clés JWT (rotation, tests) et vide le cache :
+    un token vérifié avec l'ancienne clé doit être revérifié.
+    """
+    global jwt_keys
+    jwt_keys = keys
+    verify_cache.clear()
+
+
+def public_jwks() -> dict:
+    """
+    JWKS public des clés actives (vide en HS256).
+    """
+    return jwt_keys.jwks()
+
+
 # Fonction pour générer un token JWT
 def create_access_token(
     data: dict,
@@ -20,10 +199,12 @@ def create_access_token(
     else:
         expire = datetime.now(tz=None) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
+    headers = {"kid": jwt_keys.key_id} if jwt_keys.key_id else None
     encoded_jwt = jwt.encode(
         to_encode,
-        settings.SECRET_KEY,
-        algorithm=settings.ALGORITHM
+        jwt_keys.signing_key,
+        algorithm=jwt_keys.algorithm,
+        headers=headers
     )
     return encoded_jwt
 
@@ -33,11 +214,22 @@ def verify_access_token(token: str) -> dict:
     """
     Vérifie le token JWT et renvoie le contenu.
     Lève une exception si le token est invalide ou expiré.
+
+    Un token déjà vérifié et non expiré est servi depuis le cache
+    sans re-parsing ni vérification de signature.
     """
+    digest = hashlib.sha256(token.encode("utf-8")).digest()
+    cached = verify_cache.get(digest)
+    if cached is not None:
+        return cached
+
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
+        key = jwt_keys.verify_key(jwt.get_unverified_header(token).get("kid"))
+        payload = jwt.decode(token, key, algorithms=[jwt_keys.algorithm])
     except jwt.ExpiredSignatureError:
         raise ValueError("Token expired")
     except jwt.JWTError:
         raise ValueError("Invalid token")
+
+    verify_cache.set(digest, payload)
+    return payload
@@ -0,0 +1,238 @@
+import copy
+import json
+import logging
+import queue
+import random
+import re
+import sys
+import threading
+import time
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from app.core.config import settings
+
+
+# Identifiant de la requête en cours (posé par RequestContextMiddleware)
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Champs jamais écrits en clair, où qu'ils apparaissent (extra, dictionnaires imbriqués)
+REDACTED_FIELDS = {
+    "password", "password_hash", "secret", "token", "access_token",
+    "refresh_token", "authorization", "cookie", "secret_encryption_key",
+}
+REDACTED = "[REDACTED]"
+
+# Motifs masqués dans le texte libre (messages, exceptions)
+_REDACT_PATTERNS = [
+    # En-tête Authorization / JWT
+    (re.compile(r"(?i)(bearer\s+)[\w\-.=]+"), r"\1" + REDACTED),
+    (re.compile(r"eyJ[\w\-]+\.[\w\-]+\.[\w\-]*"), REDACTED),
+    # Tokens Fernet (secrets chiffrés)
+    (re.compile(r"gAAAAA[\w\-=]+"), REDACTED),
+    # password=..., "password": "..."
+    (re.compile(r"(?i)(\"?(?:password|secret|token)\"?\s*[:=]\s*)(\"[^\"]*\"|'[^']*'|\S+)"), r"\1" + REDACTED),
+]
+
+# Attributs standard d'un LogRecord (le reste vient de `extra=`)
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+
+def redact_text(text: str) -> str:
+    for pattern, replacement in _REDACT_PATTERNS:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def redact(value, key: Optional[str] = None):
+    """
+    Masque récursivement les champs sensibles d'une valeur à journaliser.
+    """
+    if key is not None and key.lower() in REDACTED_FIELDS:
+        return REDACTED
+    if isinstance(value, dict):
+        return {k: redact(v, str(k)) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [redact(v) for v in value]
+    if isinstance(value, str):
+        return redact_text(value)
+    return value
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Une ligne JSON par événement : horodatage, niveau, logger, message,
+    request_id, champs `extra`, et type / message / trace de l'exception.
+    Tout passe par la redaction.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": redact_text(record.getMessage()),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and key != "request_id" and not key.startswith("_"):
+                entry[key] = redact(value, key)
+
+        if record.exc_info and record.exc_info[1] is not None:
+            error = record.exc_info[1]
+            entry["error_type"] = type(error).__name__
+            entry["error"] = redact_text(str(error))
+            entry["traceback"] = redact_text(self.formatException(record.exc_info))
+
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class RequestIdFilter(logging.Filter):
+    """
+    Ajoute le request_id courant (contextvar) à chaque enregistrement.
+    Exécuté dans le thread appelant, avant la mise en file.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Borne le volume pendant une avalanche d'erreurs : seau de jetons
+    par modèle de message (record.msg avant formatage, donc toutes les
+    occurrences d'une même erreur partagent le seau). Les messages
+    supprimés sont comptés et signalés au prochain message accepté.
+    """
+
+    def __init__(self, per_second: float, burst: int):
+        super().__init__()
+        self.per_second = per_second
+        self.burst = burst
+        self._buckets: dict[tuple, list] = {}
+        self._lock = threading.Lock()
+        self.suppressed = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.burst <= 0:
+            return True
+        key = (record.name, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= 10_000:
+                    self._buckets.clear()
+                bucket = self._buckets[key] = [float(self.burst), now, 0]
+            tokens, updated_at, dropped = bucket
+            tokens = min(float(self.burst), tokens + (now - updated_at) * self.per_second)
+            if tokens < 1:
+                bucket[:] = [tokens, now, dropped + 1]
+                self.suppressed += 1
+                return False
+            bucket[:] = [tokens - 1, now, 0]
+        if dropped:
+            record.suppressed = dropped
+        return True
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    Met les enregistrements en file (bornée) sans jamais bloquer l'appelant :
+    file pleine = enregistrement abandonné et compté.
+    La ligne JSON est produite dans le thread appelant, l'écriture sur
+    stdout dans le thread du QueueListener.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Sérialisé ici (la trace de l'exception référence des frames
+        # vivantes) ; seule l'écriture, potentiellement bloquante, est déportée
+        record = copy.copy(record)
+        record.msg = self.format(record)
+        record.args = None
+        record.exc_info = None
+        record.exc_text = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _Logging:
+    handler: Optional[DroppingQueueHandler] = None
+    listener: Optional[QueueListener] = None
+    rate_limit: Optional[RateLimitFilter] = None
+
+
+_state = _Logging()
+_configure_lock = threading.Lock()
+
+
+def configure_logging(stream=None) -> None:
+    """
+    Branche le logger `app` (et ses enfants) sur la file de logs JSON.
+    Idempotent : appelé au démarrage de l'API et des jobs.
+    """
+    with _configure_lock:
+        if _state.handler is not None:
+            return
+
+        output = logging.StreamHandler(stream or sys.stdout)
+        output.setFormatter(logging.Formatter("%(message)s"))
+
+        log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+        handler = DroppingQueueHandler(log_queue)
+        handler.setFormatter(JsonFormatter())
+        rate_limit = RateLimitFilter(settings.LOG_RATE_LIMIT_PER_SECOND, settings.LOG_RATE_LIMIT_BURST)
+        handler.addFilter(rate_limit)
+        handler.addFilter(RequestIdFilter())
+
+        logger = logging.getLogger("app")
+        logger.setLevel(settings.LOG_LEVEL)
+        logger.addHandler(handler)
+        logger.propagate = False
+
+        listener = QueueListener(log_queue, output, respect_handler_level=True)
+        listener.start()
+        _state.handler, _state.listener, _state.rate_limit = handler, listener, rate_limit
+
+
+def shutdown_logging() -> None:
+    """
+    Vide la file et arrête le thread d'écriture (fin de l'API).
+    """
+    with _configure_lock:
+        if _state.handler is None:
+            return
+        _state.listener.stop()
+        logging.getLogger("app").removeHandler(_state.handler)
+        _state.handler = _state.listener = _state.rate_limit = None
+
+
+def logging_stats() -> dict:
+    return {
+        "dropped": _state.handler.dropped if _state.handler else 0,
+        "suppressed": _state.rate_limit.suppressed if _state.rate_limit else 0,
+        "queued": _state.handler.queue.qsize() if _state.handler else 0,
+    }
+
+
+def should_sample(rate: float) -> bool:
+    """
+    Échantillonnage des événements à fort volume (logs d'accès) :
+    True avec une probabilité `rate` (0 = jamais, 1 = toujours).
+    """
+    return rate >= 1 or (rate > 0 and random.random() < rate)
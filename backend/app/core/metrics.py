@@ -0,0 +1,192 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Sequence
+
+
+# Bornes par défaut (en secondes) : de 1 ms à 10 s
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """
+    Histogramme cumulatif minimal (même sémantique que Prometheus :
+    chaque bucket compte les observations <= sa borne).
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._counts = [0] * len(self.buckets)
+        self._count = 0
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            self._count += 1
+            self._sum += value
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self._counts[i] += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            buckets = {str(bound): count for bound, count in zip(self.buckets, self._counts)}
+            buckets["+Inf"] = self._count
+            return {
+                "buckets": buckets,
+                "count": self._count,
+                "sum": self._sum,
+            }
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels_text(names: Sequence[str], values: tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def render_histogram(name: str, label_names: Sequence[str], series) -> list[str]:
+    """
+    Lignes d'exposition Prometheus de plusieurs Histogram étiquetés.
+    """
+    lines = []
+    for values, histogram in series:
+        snapshot = histogram.snapshot()
+        for bound, count in snapshot["buckets"].items():
+            le = 'le="%s"' % bound
+            lines.append(f"{name}_bucket{_labels_text(label_names, values, le)} {count}")
+        lines.append(f"{name}_sum{_labels_text(label_names, values)} {snapshot['sum']}")
+        lines.append(f"{name}_count{_labels_text(label_names, values)} {snapshot['count']}")
+    return lines
+
+
+class _Family:
+    """
+    Famille de métriques étiquetées (une série par combinaison de labels),
+    enregistrée pour l'exposition sur /metrics.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._series: dict[tuple, object] = {}
+        self._lock = threading.Lock()
+        REGISTRY.append(self)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            series = list(self._series.items())
+        return [f"{self.name}{_labels_text(self.label_names, values)} {value}" for values, value in series]
+
+
+class Counter(_Family):
+    """
+    Compteur cumulatif étiqueté.
+    """
+
+    kind = "counter"
+
+    def inc(self, *label_values, amount: float = 1) -> None:
+        with self._lock:
+            self._series[label_values] = self._series.get(label_values, 0) + amount
+
+    def value(self, *label_values) -> float:
+        with self._lock:
+            return self._series.get(label_values, 0)
+
+
+class Gauge(Counter):
+    """
+    Valeur instantanée étiquetée (inc avec un montant négatif pour descendre).
+    """
+
+    kind = "gauge"
+
+
+class HistogramFamily(_Family):
+    """
+    Histogrammes étiquetés (un Histogram par combinaison de labels).
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = buckets
+
+    def labels(self, *label_values) -> Histogram:
+        histogram = self._series.get(label_values)
+        if histogram is None:
+            with self._lock:
+                histogram = self._series.setdefault(label_values, Histogram(self.buckets))
+        return histogram
+
+    def render(self) -> list[str]:
+        with self._lock:
+            series = list(self._series.items())
+        return render_histogram(self.name, self.label_names, series)
+
+
+@contextmanager
+def timed(histogram: Histogram):
+    """
+    Mesure la durée du bloc (secondes), y compris en cas d'exception.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.observe(time.perf_counter() - start)
+
+
+def render_prometheus(extra_lines: Sequence[str] = ()) -> str:
+    """
+    Format texte d'exposition Prometheus de toutes les familles enregistrées.
+    """
+    lines = []
+    for family in REGISTRY:
+        lines.append(f"# HELP {family.name} {family.help}")
+        lines.append(f"# TYPE {family.name} {family.kind}")
+        lines.extend(family.render())
+    lines.extend(extra_lines)
+    return "\n".join(lines) + "\n"
+
+
+# Familles enregistrées (ordre d'exposition)
+REGISTRY: list[_Family] = []
+
+# Requêtes HTTP (middleware) : route = modèle de chemin, jamais le chemin brut
+http_requests_total = Counter(
+    "pm_http_requests_total", "Requêtes HTTP traitées", ("method", "route", "status")
+)
+http_request_duration = HistogramFamily(
+    "pm_http_request_duration_seconds", "Durée des requêtes HTTP", ("method", "route")
+)
+http_requests_in_progress = Gauge(
+    "pm_http_requests_in_progress", "Requêtes HTTP en cours", ("method",)
+)
+errors_total = Counter(
+    "pm_errors_total", "Erreurs serveur par type d'exception", ("type", "route")
+)
+
+# Opérations coûteuses
+password_hash_duration = HistogramFamily(
+    "pm_password_hash_seconds", "Durée des hash / vérifications de mot de passe (file du pool comprise)",
+    ("operation",)
+)
+crypto_duration = HistogramFamily(
+    "pm_crypto_seconds", "Durée des opérations de chiffrement Fernet (par appel)", ("operation",),
+    buckets=(0.00005, 0.0001, 0.00025, 0.0005, 0.001) + DEFAULT_BUCKETS[1:]
+)
+db_session_duration = HistogramFamily(
+    "pm_db_session_seconds", "Durée de vie des sessions DB ouvertes par get_db"
+)
@@ -0,0 +1,64 @@
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+
+class ProfilerBusy(Exception):
+    """
+    Levée quand un profil est déjà en cours dans ce processus.
+    Le router la traduit en 409.
+    """
+
+
+# Un seul profil à la fois par worker
+_profile_lock = threading.Lock()
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+def sample_stacks(seconds: float, interval: float = 0.005, thread_ids: Optional[set] = None) -> Counter:
+    """
+    Profileur par échantillonnage : toutes les `interval` secondes, relève
+    la pile de chaque thread (sauf celui du profileur) pendant `seconds`.
+
+    Renvoie le nombre d'échantillons par pile, au format "replié"
+    (thread;fonction appelante;...;fonction courante), lisible par
+    flamegraph.pl ou speedscope.
+
+    Raises:
+        ProfilerBusy: un profil est déjà en cours
+    """
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusy()
+    try:
+        me = threading.get_ident()
+        counts: Counter = Counter()
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == me or (thread_ids is not None and thread_id not in thread_ids):
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                counts[";".join(reversed(stack))] += 1
+            time.sleep(interval)
+        return counts
+    finally:
+        _profile_lock.release()
+
+
+def render_collapsed(counts: Counter) -> str:
+    """
+    Une ligne "pile nombre" par pile, les plus fréquentes en premier.
+    """
+    return "".join(f"{stack} {count}\n" for stack, count in counts.most_common())
@@ -0,0 +1,142 @@
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from app.core.config import settings
+
+
+class RateLimited(Exception):
+    """
+    Levée quand un seau de jetons est vide.
+    Le router la traduit en 429 + Retry-After.
+    """
+
+    def __init__(self, retry_after: int):
+        super().__init__("Rate limited")
+        self.retry_after = retry_after
+
+
+class RateLimitBackend(ABC):
+    """
+    Interface d'un limiteur à seaux de jetons (token bucket).
+
+    Chaque clé (ex. "login:ip:1.2.3.4") a un seau de `burst` jetons
+    qui se remplit de `rate` jetons par seconde. Un backend partagé
+    (Redis...) peut être branché via `set_rate_limiter_backend` pour
+    que la limite soit globale à tous les workers uvicorn.
+    """
+
+    @abstractmethod
+    def take(self, key: str, rate: float, burst: int) -> float:
+        """
+        Consomme un jeton. Renvoie 0 si la requête passe,
+        sinon le délai (secondes) avant le prochain jeton.
+        """
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    @abstractmethod
+    def stats(self) -> dict:
+        ...
+
+
+class InMemoryRateLimiter(RateLimitBackend):
+    """
+    Seaux locaux au processus, LRU de taille bornée.
+
+    - max_keys : nombre max de seaux suivis ; le moins récent est oublié
+      au-delà (il repartira plein, ce qui reste du côté permissif)
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+
+        self._buckets: "OrderedDict[str, tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.rejected = 0
+        self.evictions = 0
+
+    def take(self, key: str, rate: float, burst: int) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (float(burst), now))
+            tokens = min(float(burst), tokens + (now - updated_at) * rate)
+
+            if tokens >= 1:
+                wait = 0.0
+                tokens -= 1
+                self.allowed += 1
+            else:
+                wait = (1 - tokens) / rate if rate > 0 else math.inf
+                self.rejected += 1
+
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+                self.evictions += 1
+            return wait
+
+    def clear(self) -> None:
+        with self._lock:
+            self._buckets.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "keys": len(self._buckets),
+                "max_keys": self.max_keys,
+                "allowed": self.allowed,
+                "rejected": self.rejected,
+                "evictions": self.evictions,
+            }
+
+
+# Backend actif (remplaçable au démarrage ou dans les tests)
+_backend: RateLimitBackend = InMemoryRateLimiter(max_keys=settings.RATE_LIMIT_MAX_KEYS)
+
+
+def get_rate_limiter() -> RateLimitBackend:
+    return _backend
+
+
+def set_rate_limiter_backend(backend: RateLimitBackend) -> None:
+    """
+    Remplace le backend de limitation (ex. backend partagé multi-workers).
+    """
+    global _backend
+    _backend = backend
+
+
+def _check(key: str, per_minute: float, burst: int) -> None:
+    # burst = 0 : limite désactivée
+    if burst <= 0:
+        return
+    wait = _backend.take(key, per_minute / 60, burst)
+    if wait > 0:
+        raise RateLimited(max(1, math.ceil(wait)) if math.isfinite(wait) else 60)
+
+
+def check_login_rate_limit(client_ip: str, account: str) -> None:
+    """
+    Limite les tentatives de login par IP puis par compte,
+    avant toute requête en base ou tout calcul de hash.
+
+    Raises:
+        RateLimited: un des seaux est vide
+    """
+    _check(
+        f"login:ip:{client_ip}",
+        settings.LOGIN_RATE_LIMIT_IP_PER_MINUTE,
+        settings.LOGIN_RATE_LIMIT_IP_BURST
+    )
+    _check(
+        f"login:account:{account.strip().lower()}",
+        settings.LOGIN_RATE_LIMIT_ACCOUNT_PER_MINUTE,
+        settings.LOGIN_RATE_LIMIT_ACCOUNT_BURST
+    )
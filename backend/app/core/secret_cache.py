@@ -0,0 +1,135 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from app.core.config import settings
+
+
+class DecryptedSecretCache:
+    """
+    Cache local au processus des secrets déchiffrés (GET /secrets/{id}).
+
+    - clé : (utilisateur, secret) → un utilisateur ne lit que ses entrées
+    - ttl_seconds : durée de vie courte d'une entrée
+    - max_bytes : budget mémoire total (0 = cache désactivé)
+
+    Chaque entrée est stockée dans un bytearray, écrasé par des zéros
+    dès qu'elle sort du cache (expiration, éviction, invalidation).
+    Effacement au mieux : les copies temporaires créées par Python
+    (str, bytes) pendant la requête ne sont pas maîtrisées.
+
+    Avec plusieurs workers uvicorn, l'invalidation reste locale au
+    processus : le TTL borne alors la durée d'une lecture périmée.
+    """
+
+    def __init__(self, ttl_seconds: float = 30, max_bytes: int = 0):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+
+        self._entries: "OrderedDict[tuple[str, str], tuple[float, bytearray]]" = OrderedDict()
+        self._bytes = 0
+        # Incrémenté à chaque invalidation : une lecture DB commencée
+        # avant une écriture ne peut pas remettre l'ancienne valeur en cache
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _drop(self, key: tuple[str, str]) -> None:
+        # Appelé sous verrou : retire l'entrée et efface son contenu
+        _, buffer = self._entries.pop(key)
+        self._bytes -= len(buffer)
+        buffer[:] = bytes(len(buffer))
+
+    def get(self, user_id, secret_id) -> Optional[dict]:
+        key = (str(user_id), str(secret_id))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, buffer = entry
+            if expires_at <= time.monotonic():
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return json.loads(buffer)
+
+    def epoch(self) -> int:
+        """
+        Jeton à prendre AVANT la lecture en base, à repasser à set().
+        """
+        return self._epoch
+
+    def set(self, user_id, secret_id, value: dict, epoch: int) -> None:
+        if not self.enabled:
+            return
+
+        buffer = bytearray(json.dumps(value, default=str).encode())
+        if len(buffer) > self.max_bytes:
+            return
+
+        key = (str(user_id), str(secret_id))
+        with self._lock:
+            if epoch != self._epoch:
+                # Une écriture a eu lieu pendant la lecture : valeur peut-être périmée
+                buffer[:] = bytes(len(buffer))
+                return
+
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, buffer)
+            self._bytes += len(buffer)
+
+            while self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, user_id, secret_id) -> None:
+        key = (str(user_id), str(secret_id))
+        with self._lock:
+            self._epoch += 1
+            if key in self._entries:
+                self._drop(key)
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._epoch += 1
+            for key in list(self._entries):
+                self._drop(key)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+# Instance globale utilisée par le router secrets
+secret_cache = DecryptedSecretCache(
+    ttl_seconds=settings.SECRET_CACHE_TTL_SECONDS,
+    max_bytes=settings.SECRET_CACHE_MAX_BYTES
+)
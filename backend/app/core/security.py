@@ -1,14 +1,135 @@
+import math
+import time
+from typing import Optional
+
 import bcrypt
 
-def hash_password(password: str) -> str:
+try:
+    # Dépendance optionnelle : pip install "password-manager-backend[argon2]"
+    from argon2 import PasswordHasher
+    from argon2.exceptions import InvalidHashError, VerificationError
+    from argon2.low_level import Type as Argon2Type
+except ImportError:  # pragma: no cover - dépend de l'environnement
+    PasswordHasher = None
+
+
+# Bornes de la calibration automatique
+BCRYPT_MIN_ROUNDS = 10
+BCRYPT_MAX_ROUNDS = 16
+ARGON2_MIN_TIME_COST = 2
+ARGON2_MAX_TIME_COST = 20
+
+# Politique par défaut : celle de bcrypt.gensalt()
+DEFAULT_POLICY = {"scheme": "bcrypt", "rounds": 12}
+
+
+# Une politique de hash est un simple dictionnaire (picklable : elle est
+# transmise aux processus du pool de hash, qui ne partagent pas la
+# calibration faite au démarrage), par exemple :
+#   {"scheme": "bcrypt", "rounds": 12}
+#   {"scheme": "argon2id", "time_cost": 3, "memory_kib": 65536, "parallelism": 1}
+
+
+def _argon2_hasher(policy: dict) -> "PasswordHasher":
+    if PasswordHasher is None:
+        raise RuntimeError("argon2id requiert le paquet argon2-cffi")
+    return PasswordHasher(
+        time_cost=policy["time_cost"],
+        memory_cost=policy["memory_kib"],
+        parallelism=policy["parallelism"],
+        type=Argon2Type.ID
+    )
+
+
+def hash_password(password: str, policy: Optional[dict] = None) -> str:
     """
     Prend un mot de passe en clair
-    et retourne un hash sécurisé.
+    et retourne un hash sécurisé selon la politique donnée.
     """
-    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    policy = policy or DEFAULT_POLICY
+    if policy["scheme"] == "argon2id":
+        return _argon2_hasher(policy).hash(password)
+    salt = bcrypt.gensalt(rounds=policy["rounds"])
+    return bcrypt.hashpw(password.encode("utf-8"), salt).decode("utf-8")
 
 def verify_password(password: str, hashed_password: str) -> bool:
     """
-    Vérifie qu'un mot de passe correspond à son hash.
+    Vérifie qu'un mot de passe correspond à son hash
+    (bcrypt ou argon2id, d'après le préfixe du hash).
+    """
+    if hashed_password.startswith("$argon2"):
+        if PasswordHasher is None:
+            raise RuntimeError("argon2id requiert le paquet argon2-cffi")
+        try:
+            return PasswordHasher().verify(hashed_password, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    return bcrypt.checkpw(password.encode("utf-8"), hashed_password.encode("utf-8"))
+
+
+def needs_rehash(hashed_password: str, policy: dict) -> bool:
+    """
+    Indique si un hash stocké ne suit plus la politique courante
+    (autre algorithme ou autres paramètres de coût).
     """
-    return bcrypt.checkpw(password.encode("utf-8"), hashed_password.encode("utf-8"))
\ No newline at end of file
+    if policy["scheme"] == "argon2id":
+        if not hashed_password.startswith("$argon2id$"):
+            return True
+        return _argon2_hasher(policy).check_needs_rehash(hashed_password)
+
+    # Format bcrypt : $2b$<rounds>$<sel + hash>
+    parts = hashed_password.split("$")
+    if len(parts) != 4 or not parts[1].startswith("2"):
+        return True
+    return int(parts[2]) != policy["rounds"]
+
+
+def verify_and_rehash(password: str, hashed_password: str, policy: dict) -> tuple[bool, Optional[str]]:
+    """
+    Vérifie le mot de passe et, s'il est correct mais que son hash
+    est dépassé, renvoie aussi un nouveau hash à enregistrer.
+    Un seul aller-retour vers le pool de hash pour le login.
+    """
+    if not verify_password(password, hashed_password):
+        return False, None
+    if needs_rehash(hashed_password, policy):
+        return True, hash_password(password, policy)
+    return True, None
+
+
+def _measure(fn, repeat: int = 3) -> float:
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def calibrate_policy(
+    scheme: str,
+    target_ms: float,
+    memory_kib: int = 65536,
+    parallelism: int = 1
+) -> dict:
+    """
+    Choisit le coût dont la durée de hash approche `target_ms` sur cette machine.
+
+    - bcrypt : une mesure à coût bas, puis extrapolation (chaque +1 double la durée)
+    - argon2id : mémoire fixée, une mesure à time_cost=1 (durée ~ linéaire)
+    """
+    target = target_ms / 1000
+
+    if scheme == "argon2id":
+        probe = {"scheme": "argon2id", "time_cost": 1, "memory_kib": memory_kib, "parallelism": parallelism}
+        elapsed = _measure(lambda: hash_password("calibration", probe))
+        time_cost = round(target / elapsed)
+        return {
+            **probe,
+            "time_cost": min(max(time_cost, ARGON2_MIN_TIME_COST), ARGON2_MAX_TIME_COST)
+        }
+
+    probe_rounds = 8
+    elapsed = _measure(lambda: hash_password("calibration", {"scheme": "bcrypt", "rounds": probe_rounds}))
+    rounds = probe_rounds + round(math.log2(target / elapsed))
+    return {"scheme": "bcrypt", "rounds": min(max(rounds, BCRYPT_MIN_ROUNDS), BCRYPT_MAX_ROUNDS)}
@@ -0,0 +1,126 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+
+
+# Longueur max d'une requête SQL conservée dans une trace
+SQL_TEXT_MAX = 300
+
+
+class Trace:
+    """
+    Spans d'une requête HTTP : dépendances (auth, checkout du pool),
+    requêtes SQL, chiffrement, hash. Les offsets sont relatifs au début
+    de la requête, en millisecondes.
+    """
+
+    def __init__(self, max_sql: int = 50):
+        self.start = time.perf_counter()
+        self.max_sql = max_sql
+        self.spans: list[dict] = []
+        self.sql: list[dict] = []
+        self.sql_dropped = 0
+        self.breakdown: dict[str, dict] = {}
+
+    def _ms(self, instant: float) -> float:
+        return round((instant - self.start) * 1000, 3)
+
+    def _account(self, name: str, duration: float) -> None:
+        totals = self.breakdown.setdefault(name, {"count": 0, "total_ms": 0.0})
+        totals["count"] += 1
+        totals["total_ms"] = round(totals["total_ms"] + duration * 1000, 3)
+
+    def add_span(self, name: str, start: float, end: float) -> None:
+        self._account(name, end - start)
+        self.spans.append({
+            "name": name,
+            "start_ms": self._ms(start),
+            "duration_ms": round((end - start) * 1000, 3),
+        })
+
+    def add_sql(self, statement: str, start: float, end: float) -> None:
+        # Texte de la requête uniquement : les valeurs liées ne sont jamais conservées
+        self._account("db.sql", end - start)
+        if len(self.sql) >= self.max_sql:
+            self.sql_dropped += 1
+            return
+        self.sql.append({
+            "statement": " ".join(statement.split())[:SQL_TEXT_MAX],
+            "start_ms": self._ms(start),
+            "duration_ms": round((end - start) * 1000, 3),
+        })
+
+    def elapsed_ms(self) -> float:
+        return self._ms(time.perf_counter())
+
+    def to_dict(self) -> dict:
+        return {
+            "breakdown": self.breakdown,
+            "spans": sorted(self.spans, key=lambda s: s["start_ms"]),
+            "sql": self.sql,
+            "sql_dropped": self.sql_dropped,
+        }
+
+
+# Trace de la requête en cours (None = traçage inactif, spans gratuits)
+_trace_var: ContextVar[Optional[Trace]] = ContextVar("trace", default=None)
+
+
+def current_trace() -> Optional[Trace]:
+    return _trace_var.get()
+
+
+@contextmanager
+def start_trace(max_sql: int = 50):
+    """
+    Ouvre une trace pour le contexte courant (une requête HTTP).
+    """
+    trace = Trace(max_sql=max_sql)
+    token = _trace_var.set(trace)
+    try:
+        yield trace
+    finally:
+        _trace_var.reset(token)
+
+
+@contextmanager
+def span(name: str):
+    """
+    Mesure le bloc dans la trace courante, s'il y en a une
+    (y compris en cas d'exception).
+    """
+    trace = _trace_var.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add_span(name, start, time.perf_counter())
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _trace_var.get() is not None:
+        context._trace_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    trace = _trace_var.get()
+    start = getattr(context, "_trace_start", None)
+    if trace is not None and start is not None:
+        trace.add_sql(statement, start, time.perf_counter())
+
+
+def instrument_engine(engine) -> None:
+    """
+    Enregistre les requêtes SQL exécutées dans la trace courante.
+    Les événements sont posés sur l'engine synchrone sous-jacent ; le
+    greenlet de SQLAlchemy hérite du contexte, donc de la trace.
+    """
+    sync_engine = getattr(engine, "sync_engine", engine)
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
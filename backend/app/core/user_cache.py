@@ -0,0 +1,165 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.models.user import User
+
+
+class UserCacheBackend(ABC):
+    """
+    Interface d'un cache d'identité utilisateur (clé = `sub` du JWT).
+
+    Les valeurs sont des dictionnaires sérialisables en JSON
+    (voir `snapshot_user`) pour qu'un backend partagé (Redis, memcached...)
+    puisse être branché via `set_user_cache_backend` quand l'API
+    tourne sur plusieurs workers uvicorn.
+    """
+
+    @abstractmethod
+    def get(self, user_id: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    def set(self, user_id: str, value: dict) -> None:
+        ...
+
+    @abstractmethod
+    def invalidate(self, user_id: str) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    @abstractmethod
+    def stats(self) -> dict:
+        ...
+
+
+class InMemoryUserCache(UserCacheBackend):
+    """
+    Cache local au processus, TTL + LRU, de taille bornée.
+
+    - ttl_seconds : durée de vie d'une entrée
+    - max_size : nombre max d'entrées (0 = cache désactivé)
+    """
+
+    def __init__(self, ttl_seconds: float = 60, max_size: int = 10_000):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+
+        self._entries: "OrderedDict[str, tuple[float, dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, user_id: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[user_id]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return value
+
+    def set(self, user_id: str, value: dict) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, user_id: str) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# Backend actif (remplaçable au démarrage)
+_backend: UserCacheBackend = InMemoryUserCache(
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+    max_size=settings.USER_CACHE_MAX_SIZE
+)
+
+
+def get_user_cache() -> UserCacheBackend:
+    return _backend
+
+
+def set_user_cache_backend(backend: UserCacheBackend) -> None:
+    """
+    Remplace le backend de cache (ex. backend partagé multi-workers).
+    """
+    global _backend
+    _backend = backend
+
+
+def snapshot_user(user: User) -> dict:
+    """
+    Extrait l'identité publique d'un utilisateur (jamais le hash).
+    """
+    return {
+        "id": str(user.id),
+        "email": user.email,
+        "created_at": user.created_at.isoformat(),
+    }
+
+
+def user_from_snapshot(value: dict) -> User:
+    """
+    Reconstruit un User détaché (non attaché à une session) depuis le cache.
+    """
+    return User(
+        id=UUID(value["id"]),
+        email=value["email"],
+        created_at=datetime.fromisoformat(value["created_at"]),
+    )
+
+
+def invalidate_user(user_id) -> None:
+    """
+    Hook d'invalidation explicite : à appeler dès qu'un utilisateur
+    est supprimé ou que ses identifiants changent.
+    """
+    _backend.invalidate(str(user_id))
+
+
+# Invalidation automatique sur les modifications ORM de User.
+# Les UPDATE/DELETE en masse (query.update / delete()) ne déclenchent
+# pas ces événements : appeler invalidate_user explicitement dans ce cas.
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_change(mapper, connection, target: User) -> None:
+    invalidate_user(target.id)
@@ -0,0 +1,129 @@
+import csv
+import io
+import json
+from itertools import islice
+from typing import BinaryIO, Iterator, Optional
+
+
+# Colonnes reconnues par champ, selon le gestionnaire d'origine :
+# - Bitwarden : name, login_username, login_password, login_uri
+# - LastPass / Chrome : name, username, password, url
+# - 1Password : Title, Username, Password, Url
+# - export de ce coffre (GET /secrets/export) : title, username, password, url
+FIELD_ALIASES = {
+    "title": ("title", "name"),
+    "username": ("username", "login_username", "login"),
+    "password": ("password", "login_password"),
+    "url": ("url", "login_uri", "website"),
+}
+
+REQUIRED_FIELDS = ("title", "username", "password")
+
+
+class ImportFormatError(ValueError):
+    """
+    Fichier illisible avant même la première ligne (en-tête CSV inconnu...).
+    Le router la traduit en 400.
+    """
+
+
+def csv_column_map(header: list[str]) -> dict[str, int]:
+    """
+    Associe chaque champ de SecretCreate à l'index de sa colonne CSV.
+
+    Raises:
+        ImportFormatError: une colonne obligatoire est introuvable
+    """
+    columns = {name.strip().lower(): index for index, name in enumerate(header)}
+    mapping = {}
+
+    for field, aliases in FIELD_ALIASES.items():
+        for alias in aliases:
+            if alias in columns:
+                mapping[field] = columns[alias]
+                break
+
+    missing = [field for field in REQUIRED_FIELDS if field not in mapping]
+    if missing:
+        raise ImportFormatError(f"Colonnes introuvables dans l'en-tête CSV : {', '.join(missing)}")
+
+    return mapping
+
+
+def _clean(raw: dict) -> dict:
+    # Cellules vides → None (le champ est alors absent pour la validation)
+    return {
+        field: value
+        for field, value in raw.items()
+        if value is not None and value != ""
+    }
+
+
+def _iter_csv(text: io.TextIOBase) -> Iterator[tuple[int, Optional[dict], Optional[str]]]:
+    reader = csv.reader(text)
+    try:
+        header = next(reader)
+    except StopIteration:
+        raise ImportFormatError("Fichier vide")
+    except csv.Error as e:
+        raise ImportFormatError(f"CSV invalide : {e}")
+
+    mapping = csv_column_map(header)
+
+    def rows():
+        number = 0
+        while True:
+            number += 1
+            try:
+                cells = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as e:
+                yield number, None, f"CSV invalide : {e}"
+                continue
+
+            yield number, _clean({
+                field: cells[index] if index < len(cells) else None
+                for field, index in mapping.items()
+            }), None
+
+    return rows()
+
+
+def _iter_ndjson(text: io.TextIOBase) -> Iterator[tuple[int, Optional[dict], Optional[str]]]:
+    for number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            raw = json.loads(line)
+        except ValueError as e:
+            yield number, None, f"JSON invalide : {e}"
+            continue
+        if not isinstance(raw, dict):
+            yield number, None, "Objet JSON attendu"
+            continue
+        yield number, _clean({field: raw.get(field) for field in FIELD_ALIASES}), None
+
+
+def open_rows(stream: BinaryIO, format: str) -> Iterator[tuple[int, Optional[dict], Optional[str]]]:
+    """
+    Ouvre un fichier d'import (binaire) et renvoie un itérateur paresseux
+    de (numéro de ligne, champs bruts, erreur de lecture).
+
+    Le fichier est lu au fil de l'eau : la mémoire ne dépend pas de sa taille.
+    L'en-tête CSV est lu immédiatement pour échouer avant tout traitement.
+
+    Raises:
+        ImportFormatError: en-tête absent ou inconnu
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", errors="replace", newline="")
+    if format == "csv":
+        return _iter_csv(text)
+    return _iter_ndjson(text)
+
+
+def read_chunk(rows: Iterator, size: int) -> list:
+    """
+    Lit au plus `size` lignes de l'itérateur (appel bloquant : disque).
+    """
+    return list(islice(rows, size))
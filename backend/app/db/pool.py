@@ -0,0 +1,69 @@
+import threading
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.circuit_breaker import db_breaker
+from app.core.metrics import Histogram
+from app.core.tracing import span
+
+
+# Temps d'attente pour obtenir une connexion du pool (secondes).
+# Au niveau module : les stats survivent à engine.dispose(),
+# qui recrée une nouvelle instance de pool.
+checkout_wait_histogram = Histogram()
+
+_counters_lock = threading.Lock()
+_counters = {"checkouts": 0, "timeouts": 0}
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """
+    Pool de connexions qui mesure le temps d'attente de chaque checkout
+    (file d'attente + éventuelle ouverture de connexion + pre-ping)
+    et compte les QueuePool timeouts. Les échecs de connexion
+    alimentent le disjoncteur de la base.
+    """
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            with span("db.pool_checkout"):
+                connection = super().connect()
+        except exc.TimeoutError:
+            # Pool saturé : pas une panne de la base
+            with _counters_lock:
+                _counters["timeouts"] += 1
+            raise
+        except Exception:
+            # Connexion impossible (base injoignable, timeout de connexion...)
+            db_breaker.record_failure()
+            raise
+        finally:
+            checkout_wait_histogram.observe(time.perf_counter() - start)
+
+        db_breaker.record_success()
+        with _counters_lock:
+            _counters["checkouts"] += 1
+        return connection
+
+
+def pool_stats(pool) -> dict:
+    """
+    Photographie de l'état du pool et des compteurs cumulés.
+    """
+    stats = {"pool_class": type(pool).__name__}
+
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        stats.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        })
+
+    with _counters_lock:
+        stats.update(_counters)
+    stats["checkout_wait_seconds"] = checkout_wait_histogram.snapshot()
+    return stats
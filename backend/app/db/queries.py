@@ -0,0 +1,296 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import (
+    BigInteger,
+    Delete,
+    Select,
+    String,
+    Update,
+    column,
+    delete,
+    func,
+    literal_column,
+    select,
+    tuple_,
+    update,
+    values
+)
+from sqlalchemy.dialects.postgresql import UUID as PG_UUID
+
+from app.models.auth_session import AuthSession
+from app.models.secret import SEARCH_TEXT_SQL, Secret
+from app.models.secret_tombstone import SecretTombstone
+from app.models.user import User
+
+
+# Les requêtes des routers sont construites ici pour que les tests
+# de plans d'exécution (EXPLAIN) vérifient exactement les mêmes SQL.
+
+
+def _search_text():
+    # Même expression que l'index ix_secrets_search_trgm
+    return literal_column(f"({SEARCH_TEXT_SQL})")
+
+
+def list_user_secrets_query(
+    user_id: UUID,
+    search: Optional[str] = None,
+    position: Optional[tuple[datetime, UUID]] = None,
+    skip: int = 0,
+    limit: int = 100
+) -> Select:
+    """
+    Page de secrets d'un utilisateur, triée par (created_at, id) décroissant.
+
+    - position : curseur keyset (created_at, id) du dernier élément vu
+    - skip : pagination par offset (dépréciée, ignorée si position est fournie)
+    """
+    query = select(Secret).where(Secret.user_id == user_id)
+
+    # Filtre de recherche (si fourni) sur title + username (index trigram)
+    if search:
+        search_pattern = f"%{search}%"
+        query = query.where(_search_text().ilike(search_pattern))
+
+    if position is not None:
+        # Keyset : uniquement les lignes strictement après le curseur
+        query = query.where(tuple_(Secret.created_at, Secret.id) < position)
+    elif skip:
+        query = query.offset(skip)
+
+    return (
+        query
+        .order_by(Secret.created_at.desc(), Secret.id.desc())
+        .limit(limit)
+    )
+
+
+def user_secret_query(user_id: UUID, secret_id: UUID) -> Select:
+    """
+    Un secret précis, uniquement s'il appartient à l'utilisateur.
+    """
+    return select(Secret).where(
+        Secret.id == secret_id,
+        Secret.user_id == user_id
+    )
+
+
+def export_user_secrets_query(user_id: UUID) -> Select:
+    """
+    Tous les secrets d'un utilisateur pour l'export, dans l'ordre de la liste.
+
+    Sélection de colonnes (et non d'entités) : les lignes lues par le curseur
+    serveur ne passent pas par l'identity map de la session.
+    """
+    return (
+        select(
+            Secret.id,
+            Secret.title,
+            Secret.username,
+            Secret.password,
+            Secret.url,
+            Secret.created_at,
+            Secret.updated_at
+        )
+        .where(Secret.user_id == user_id)
+        .order_by(Secret.created_at.desc(), Secret.id.desc())
+    )
+
+
+def secret_updated_at_query(user_id: UUID, secret_id: UUID) -> Select:
+    """
+    Date de modification d'un secret de l'utilisateur (validation d'ETag).
+    """
+    return select(Secret.updated_at).where(
+        Secret.id == secret_id,
+        Secret.user_id == user_id
+    )
+
+
+def search_user_secrets_query(user_id: UUID, term: str, limit: int = 20) -> Select:
+    """
+    Recherche classée dans les secrets d'un utilisateur (index GIN pg_trgm).
+
+    La similarité par mot (word_similarity) couvre à la fois :
+    - les préfixes ("git" → "GitHub")
+    - les fautes de frappe ("githbu" → "GitHub")
+    Seuil : pg_trgm.word_similarity_threshold.
+
+    Sélectionne (Secret, score), du plus au moins pertinent.
+    """
+    search_text = _search_text()
+    score = func.word_similarity(term, search_text)
+
+    return (
+        select(Secret, score.label("score"))
+        # `texte %> terme` : word_similarity(terme, texte) >= seuil (indexable)
+        .where(Secret.user_id == user_id, search_text.op("%>")(term))
+        .order_by(score.desc(), Secret.created_at.desc(), Secret.id.desc())
+        .limit(limit)
+    )
+
+
+def vault_version_query(user_id: UUID) -> Select:
+    """
+    Version courante du coffre d'un utilisateur (lecture par clé primaire).
+    """
+    return select(User.vault_version).where(User.id == user_id)
+
+
+def bump_vault_version_statement(user_id: UUID, count: int = 1) -> Update:
+    """
+    Réserve `count` versions du coffre ; à exécuter dans la transaction
+    de l'écriture sur les secrets. RETURNING la nouvelle version :
+    les versions réservées vont de (nouvelle - count + 1) à nouvelle.
+
+    Le verrou de ligne sur users sérialise les écritures d'un même
+    utilisateur : les versions sont visibles dans l'ordre croissant.
+    """
+    return (
+        update(User)
+        .where(User.id == user_id)
+        .values(vault_version=User.vault_version + count)
+        .returning(User.vault_version)
+    )
+
+
+def changed_secrets_query(user_id: UUID, since: int, limit: int) -> Select:
+    """
+    Secrets créés ou modifiés après la version `since`, par version croissante.
+    """
+    return (
+        select(Secret)
+        .where(Secret.user_id == user_id, Secret.version > since)
+        .order_by(Secret.version)
+        .limit(limit)
+    )
+
+
+def deleted_secrets_query(user_id: UUID, since: int, limit: int) -> Select:
+    """
+    Secrets supprimés après la version `since`, par version croissante.
+    """
+    return (
+        select(SecretTombstone)
+        .where(SecretTombstone.user_id == user_id, SecretTombstone.version > since)
+        .order_by(SecretTombstone.version)
+        .limit(limit)
+    )
+
+
+def batch_update_user_secrets_statement(
+    user_id: UUID,
+    rows: list[tuple],
+    updated_at: datetime
+) -> Update:
+    """
+    UPDATE multi-lignes en une seule requête (UPDATE ... FROM (VALUES ...)).
+
+    rows : tuples (id, title, username, password chiffré, url, version) ;
+    une valeur None laisse le champ inchangé (sauf version).
+    Seuls les secrets de l'utilisateur sont modifiés ; RETURNING id.
+    """
+    data = values(
+        column("id", PG_UUID(as_uuid=True)),
+        column("title", String),
+        column("username", String),
+        column("password", String),
+        column("url", String),
+        column("version", BigInteger),
+        name="data"
+    ).data(rows)
+
+    return (
+        update(Secret)
+        .where(Secret.id == data.c.id, Secret.user_id == user_id)
+        .values(
+            title=func.coalesce(data.c.title, Secret.title),
+            username=func.coalesce(data.c.username, Secret.username),
+            password=func.coalesce(data.c.password, Secret.password),
+            url=func.coalesce(data.c.url, Secret.url),
+            version=data.c.version,
+            updated_at=updated_at
+        )
+        .returning(Secret.id)
+    )
+
+
+def batch_delete_user_secrets_statement(user_id: UUID, secret_ids: list[UUID]) -> Delete:
+    """
+    DELETE multi-lignes en une seule requête, limité aux secrets de l'utilisateur.
+    """
+    return (
+        delete(Secret)
+        .where(Secret.user_id == user_id, Secret.id.in_(secret_ids))
+        .returning(Secret.id)
+    )
+
+
+def reencrypt_chunk_query(after_id: Optional[UUID], limit: int) -> Select:
+    """
+    Lot suivant du job de re-chiffrement : parcours keyset par id (clé primaire).
+    """
+    query = select(Secret.id, Secret.password)
+    if after_id is not None:
+        query = query.where(Secret.id > after_id)
+    return query.order_by(Secret.id).limit(limit)
+
+
+def reencrypt_secrets_statement(rows: list[tuple]) -> Update:
+    """
+    Remplace le mot de passe chiffré de plusieurs secrets en une requête.
+
+    rows : tuples (id, ancien token, nouveau token). Compare-and-swap :
+    un secret modifié entre la lecture et l'écriture (déjà chiffré avec
+    la nouvelle clé par l'API) n'est pas écrasé. updated_at est inchangé :
+    le contenu en clair ne change pas.
+    """
+    data = values(
+        column("id", PG_UUID(as_uuid=True)),
+        column("old_password", String),
+        column("new_password", String),
+        name="data"
+    ).data(rows)
+
+    return (
+        update(Secret)
+        .where(Secret.id == data.c.id, Secret.password == data.c.old_password)
+        .values(password=data.c.new_password)
+        .returning(Secret.id)
+    )
+
+
+def session_by_token_query(token_hash: str) -> Select:
+    """
+    Session d'un refresh token, verrouillée (FOR UPDATE) : deux rotations
+    concurrentes du même token sont sérialisées, la seconde voit la
+    première et déclenche la détection de réutilisation.
+    """
+    return (
+        select(AuthSession)
+        .where(AuthSession.token_hash == token_hash)
+        .with_for_update()
+    )
+
+
+def revoke_session_family_statement(family_id: UUID, now: datetime) -> Update:
+    """
+    Révoque toutes les sessions encore actives d'une famille de refresh tokens.
+    """
+    return (
+        update(AuthSession)
+        .where(AuthSession.family_id == family_id, AuthSession.revoked_at.is_(None))
+        .values(revoked_at=now)
+    )
+
+
+def delete_expired_sessions_statement(user_id: UUID, now: datetime) -> Delete:
+    """
+    Purge les sessions expirées d'un utilisateur (appelée au login).
+    """
+    return delete(AuthSession).where(
+        AuthSession.user_id == user_id,
+        AuthSession.expires_at <= now
+    )
@@ -1,35 +1,108 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from typing import Optional
 
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.circuit_breaker import CircuitOpen, db_breaker
 from app.core.config import settings
+from app.core.metrics import db_session_duration, timed
+from app.core.tracing import instrument_engine
+from app.db.pool import InstrumentedAsyncPool
 
-# URL de connexion PostgreSQL
+# URL de connexion PostgreSQL (driver asynchrone asyncpg)
 DATABASE_URL = (
-    f"postgresql://{settings.POSTGRES_USER}:"
+    f"postgresql+asyncpg://{settings.POSTGRES_USER}:"
     f"{settings.POSTGRES_PASSWORD}@"
     f"{settings.POSTGRES_HOST}:"
     f"{settings.POSTGRES_PORT}/"
     f"{settings.POSTGRES_DB}"
 )
 
-# Création de l'engine SQLAlchemy
-engine = create_engine(DATABASE_URL)
+# Engine et fabrique de sessions construits au premier usage (ou au
+# démarrage de l'API) : l'import ne crée rien et ne se connecte à rien
+_engine: Optional[AsyncEngine] = None
+_sessionmaker: Optional[async_sessionmaker] = None
 
-# Fabrique de sessions DB
-SessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    bind=engine
-)
 
+def get_engine() -> AsyncEngine:
+    """
+    Engine SQLAlchemy asynchrone (pool configurable et instrumenté).
+    Aucune connexion n'est ouverte avant la première requête.
+    """
+    global _engine, _sessionmaker
+    if _engine is None:
+        engine = create_async_engine(
+            DATABASE_URL,
+            poolclass=InstrumentedAsyncPool,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_pre_ping=settings.DB_POOL_PRE_PING,
+            # Les valeurs liées (secrets chiffrés, hash...) n'apparaissent jamais
+            # dans les messages d'erreur SQLAlchemy, donc jamais dans les logs
+            hide_parameters=True,
+            connect_args={
+                "timeout": settings.DB_CONNECT_TIMEOUT,
+                "server_settings": {
+                    "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)
+                }
+            }
+        )
+        # Requêtes SQL enregistrées dans la trace de la requête (si traçage actif)
+        instrument_engine(engine)
+
+        # Fabrique de sessions DB
+        # expire_on_commit=False : les objets restent lisibles après commit
+        # sans déclencher de lazy-load (interdit en asynchrone)
+        _sessionmaker = async_sessionmaker(
+            bind=engine,
+            class_=AsyncSession,
+            autoflush=False,
+            expire_on_commit=False
+        )
+        _engine = engine
+    return _engine
 
-def get_db():
+
+def get_sessionmaker() -> async_sessionmaker:
+    get_engine()
+    return _sessionmaker
+
+
+async def dispose_engine() -> None:
     """
-    Dépendance FastAPI :
-    ouvre une session DB et la ferme automatiquement.
+    Ferme les connexions du pool (arrêt de l'API), si l'engine a été créé.
+    """
+    if _engine is not None:
+        await _engine.dispose()
+
+
+def ensure_database_available() -> None:
+    """
+    Échec immédiat (503) quand le disjoncteur de la base est ouvert,
+    au lieu d'attendre une connexion qui ne viendra pas.
     """
-    db = SessionLocal()
     try:
-        yield db
-    finally:
-        db.close()
+        db_breaker.before_call()
+    except CircuitOpen as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Base de données indisponible",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+
+
+async def get_db():
+    """
+    Dépendance FastAPI :
+    ouvre une session DB asynchrone et la ferme automatiquement.
+    Sa durée de vie est mesurée (pm_db_session_seconds).
+
+    Raises:
+        503: Disjoncteur de la base ouvert
+    """
+    ensure_database_available()
+    with timed(db_session_duration.labels()):
+        async with get_sessionmaker()() as db:
+            yield db
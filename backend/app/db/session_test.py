@@ -1,35 +1,39 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
 
 from app.core.config_test import test_settings
+from app.core.tracing import instrument_engine
+from app.db.session import ensure_database_available
 
-# URL de connexion PostgreSQL
+# URL de connexion PostgreSQL (driver asynchrone asyncpg)
 DATABASE_URL_TEST = (
-    f"postgresql://{test_settings.POSTGRES_USER}:"
+    f"postgresql+asyncpg://{test_settings.POSTGRES_USER}:"
     f"{test_settings.POSTGRES_PASSWORD}@"
     f"{test_settings.POSTGRES_HOST}:"
     f"{test_settings.POSTGRES_PORT}/"
     f"{test_settings.POSTGRES_DB}"
 )
 
-# Création de l'engine SQLAlchemy
-engine_test = create_engine(DATABASE_URL_TEST)
+# Création de l'engine SQLAlchemy asynchrone
+# NullPool : chaque TestClient tourne sur sa propre boucle d'événements,
+# une connexion asyncpg ne doit pas être réutilisée d'une boucle à l'autre
+engine_test = create_async_engine(DATABASE_URL_TEST, poolclass=NullPool)
+instrument_engine(engine_test)
 
 # Fabrique de sessions DB
-TestingSessionLocal = sessionmaker(
-    autocommit=False,
+TestingSessionLocal = async_sessionmaker(
+    bind=engine_test,
+    class_=AsyncSession,
     autoflush=False,
-    bind=engine_test
+    expire_on_commit=False
 )
 
 
-def get_db_test():
+async def get_db_test():
     """
     Dépendance FastAPI :
-    ouvre une session DB et la ferme automatiquement.
+    ouvre une session DB asynchrone et la ferme automatiquement.
     """
-    db = TestingSessionLocal()
-    try:
+    ensure_database_available()
+    async with TestingSessionLocal() as db:
         yield db
-    finally:
-        db.close()
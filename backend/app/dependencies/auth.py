@@ -1,26 +1,57 @@
+from uuid import UUID
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.core.jwt import verify_access_token
+from app.core.tracing import span
+from app.core.user_cache import get_user_cache, snapshot_user, user_from_snapshot
 from app.db.session import get_db
 from app.models.user import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)) -> User:
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)) -> User:
     """
     Dépendance FastAPI pour récupérer l'utilisateur connecté via JWT.
+
+    L'identité est mise en cache par `sub` : un hit évite
+    la requête sur la table users.
+    """
+    with span("auth.get_current_user"):
+        try:
+            payload = verify_access_token(token)
+            user_id = payload.get("sub")
+            if user_id is None:
+                raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
+            # Le driver asyncpg attend un vrai UUID (ValueError si mal formé)
+            user_uuid = UUID(user_id)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+
+        cache = get_user_cache()
+        cached = cache.get(user_id)
+        if cached is not None:
+            return user_from_snapshot(cached)
+
+        result = await db.execute(select(User).where(User.id == user_uuid))
+        user = result.scalar_one_or_none()
+        if user is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+
+        cache.set(user_id, snapshot_user(user))
+        return user
+
+
+async def get_current_admin(current_user: User = Depends(get_current_user)) -> User:
+    """
+    Dépendance FastAPI réservant un endpoint aux comptes listés
+    dans ADMIN_EMAILS.
     """
-    try:
-        payload = verify_access_token(token)
-        user_id = payload.get("sub")
-        if user_id is None:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
-    except ValueError:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-
-    user = db.query(User).filter(User.id == user_id).first()
-    if user is None:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    return user
+    admins = {email.strip().lower() for email in settings.ADMIN_EMAILS.split(",") if email.strip()}
+    if current_user.email.lower() not in admins:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin only")
+    return current_user
@@ -0,0 +1,149 @@
+"""
+Job de re-chiffrement des secrets après une rotation de clé.
+
+Procédure de rotation (sans interruption de service) :
+1. Générer une nouvelle clé et la placer EN PREMIER dans SECRET_ENCRYPTION_KEY
+   (ex. "nouvelle,ancienne"), puis redéployer l'API : les nouveaux secrets
+   sont chiffrés avec la nouvelle clé, les anciens restent lisibles.
+2. Lancer ce job : python -m app.jobs.reencrypt
+3. Une fois le job terminé, retirer l'ancienne clé et redéployer.
+
+Le job parcourt la table secrets par id, lot par lot, une transaction
+courte par lot (checkpoint inclus) : il peut être interrompu puis relancé,
+il reprend après le dernier lot validé. Son débit est plafonné
+(REENCRYPT_MAX_ROWS_PER_SECOND) pour ne pas dégrader la latence de l'API.
+Les secrets illisibles avec toutes les clés connues sont laissés tels quels
+et comptés (colonne unreadable du checkpoint) : ne pas retirer l'ancienne
+clé tant que ce compteur n'est pas expliqué.
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.core import crypto
+from app.core.config import settings
+from app.db.queries import reencrypt_chunk_query, reencrypt_secrets_statement
+from app.db.session import get_sessionmaker
+from app.models.key_rotation import KeyRotationCheckpoint
+from app.models.user import User  # noqa - nécessaire pour que SQLAlchemy connaisse le modèle
+from app.models.secret import Secret  # noqa - nécessaire pour que SQLAlchemy connaisse le modèle
+
+
+async def reencrypt_secrets(
+    session_factory=None,
+    batch_size: Optional[int] = None,
+    max_rows_per_second: Optional[float] = None,
+    stop: Optional[asyncio.Event] = None
+) -> KeyRotationCheckpoint:
+    """
+    Re-chiffre avec la clé primaire tous les secrets qui ne le sont pas encore.
+
+    - stop : arrêt propre entre deux lots (le checkpoint est à jour)
+
+    Renvoie le checkpoint final.
+
+    Raises:
+        ValueError: taille de lot ou débit max nul ou négatif
+    """
+    session_factory = session_factory or get_sessionmaker()
+    if batch_size is None:
+        batch_size = settings.REENCRYPT_BATCH_SIZE
+    if max_rows_per_second is None:
+        max_rows_per_second = settings.REENCRYPT_MAX_ROWS_PER_SECOND
+    if batch_size <= 0 or max_rows_per_second <= 0:
+        raise ValueError("batch_size et max_rows_per_second doivent être strictement positifs")
+    fingerprint = crypto.get_keyring().fingerprint
+
+    async with session_factory() as db:
+        checkpoint = await db.get(KeyRotationCheckpoint, fingerprint)
+        if checkpoint is None:
+            checkpoint = KeyRotationCheckpoint(key_fingerprint=fingerprint, rewritten=0, unreadable=0)
+            db.add(checkpoint)
+            await db.commit()
+
+    while checkpoint.completed_at is None:
+        if stop is not None and stop.is_set():
+            break
+
+        started = time.monotonic()
+
+        async with session_factory() as db:
+            checkpoint = await db.get(KeyRotationCheckpoint, fingerprint, with_for_update=True)
+            rows = (await db.execute(
+                reencrypt_chunk_query(checkpoint.last_secret_id, batch_size)
+            )).all()
+
+            if rows:
+                rotated = await crypto.rotate_many_async([row.password for row in rows])
+                changes = []
+                for row, token in zip(rows, rotated):
+                    if token == row.password:
+                        checkpoint.unreadable += 1
+                    elif token is not None:
+                        changes.append((row.id, row.password, token))
+                if changes:
+                    result = await db.execute(
+                        reencrypt_secrets_statement(changes)
+                        .execution_options(synchronize_session=False)
+                    )
+                    checkpoint.rewritten += len(result.scalars().all())
+                checkpoint.last_secret_id = rows[-1].id
+            else:
+                checkpoint.completed_at = datetime.now(timezone.utc)
+
+            checkpoint.updated_at = datetime.now(timezone.utc)
+            await db.commit()
+
+        # Limitation de débit : un lot de n lignes dure au moins n / débit max
+        delay = len(rows) / max_rows_per_second - (time.monotonic() - started)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    return checkpoint
+
+
+def _positive(type_):
+    # Type argparse : nombre strictement positif
+    def parse(value: str):
+        number = type_(value)
+        if number <= 0:
+            raise argparse.ArgumentTypeError(f"doit être strictement positif : {value}")
+        return number
+    return parse
+
+
+async def main(args) -> None:
+    stop = asyncio.Event()
+    task = asyncio.create_task(reencrypt_secrets(
+        batch_size=args.batch_size,
+        max_rows_per_second=args.rate,
+        stop=stop
+    ))
+
+    try:
+        while not task.done():
+            await asyncio.wait({task}, timeout=args.report_every)
+            async with get_sessionmaker()() as db:
+                checkpoint = await db.get(KeyRotationCheckpoint, crypto.get_keyring().fingerprint)
+            if checkpoint is not None:
+                print(
+                    f"clé {checkpoint.key_fingerprint} : {checkpoint.rewritten} secrets re-chiffrés, "
+                    f"{checkpoint.unreadable} illisibles, dernier id {checkpoint.last_secret_id}"
+                    + (" (terminé)" if checkpoint.completed_at else "")
+                )
+    except asyncio.CancelledError:
+        stop.set()
+        await task
+        raise
+
+    await task
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=_positive(int), default=None)
+    parser.add_argument("--rate", type=_positive(float), default=None, help="secrets/s max")
+    parser.add_argument("--report-every", type=float, default=5)
+    asyncio.run(main(parser.parse_args()))
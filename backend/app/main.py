@@ -1,15 +1,50 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import get_swagger_ui_html
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
-from app.db.session import engine
-from app.db.base import Base
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from app.core.crypto import crypto_pool, get_keyring
+from app.core.events import get_change_broker
+from app.core.jwt import public_jwks
+from app.core.hashing import hashing_pool, warm_up_hash_policy
+from app.core.health import readiness
+from app.core.instrumentation import MetricsMiddleware, RequestContextMiddleware, TracingMiddleware, count_server_errors
+from app.core.log import configure_logging, shutdown_logging
+from app.db.session import dispose_engine, get_engine
 from app.models.user import User  # noqa - nécessaire pour que SQLAlchemy connaisse le modèle
 from app.models.secret import Secret  # noqa - nécessaire pour que SQLAlchemy connaisse le modèle
-from app.routers import auth, secrets
+from app.models.key_rotation import KeyRotationCheckpoint  # noqa - nécessaire pour que SQLAlchemy connaisse le modèle
+from app.models.secret_tombstone import SecretTombstone  # noqa - nécessaire pour que SQLAlchemy connaisse le modèle
+from app.routers import auth, debug, metrics, secrets
+
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Logs JSON via une file et un thread d'écriture dédié
+    configure_logging()
+    # Ressources construites ici plutôt qu'à l'import, sans aller-retour
+    # réseau : une clé invalide fait échouer le démarrage, une base
+    # injoignable non (/health/ready le signale). Le schéma est géré à part
+    # par les migrations (python -m app.migrate).
+    get_keyring()
+    get_engine()
+    # Calibration du coût de hash en tâche de fond : le worker sert
+    # immédiatement, /health/ready attend la fin de la calibration
+    warm_up = asyncio.create_task(warm_up_hash_policy())
+    yield
+    # Arrêt propre des processus de hash, des threads de chiffrement,
+    # de l'écoute des changements, du pool de connexions et des logs
+    warm_up.cancel()
+    hashing_pool.shutdown()
+    crypto_pool.shutdown()
+    await get_change_broker().stop()
+    await dispose_engine()
+    shutdown_logging()
 
-Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
     title="PM API | C-Lilian",
@@ -17,6 +52,7 @@ app = FastAPI(
     version="1.0.0",
     docs_url=None,
     redoc_url=None,
+    lifespan=lifespan,
 )
 app.add_middleware(
     CORSMiddleware,
@@ -24,7 +60,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "X-Request-ID"],
 )
+# Instrumentation : traces des requêtes lentes (opt-in), durée et statut
+# par route, erreurs par type (GET /metrics), puis identifiant de requête
+# et log d'accès (middleware le plus externe)
+app.add_middleware(TracingMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(RequestContextMiddleware)
+app.add_exception_handler(StarletteHTTPException, count_server_errors)
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
 # ROUTES
@@ -38,7 +82,36 @@ async def custom_swagger_ui_html():
 
 app.include_router(auth.router)
 app.include_router(secrets.router)
+app.include_router(metrics.router)
+app.include_router(debug.router)
 
 @app.get("/health")
+@app.get("/health/live")
 def health_check():
-    return {"status": "ok"}
\ No newline at end of file
+    """
+    Sonde de vivacité : le processus répond, sans aucune dépendance
+    (une panne de la base ne doit pas faire redémarrer les workers).
+    """
+    return {"status": "ok"}
+
+
+@app.get("/health/ready")
+async def readiness_check():
+    """
+    Sonde de disponibilité : 503 tant que la base est injoignable,
+    pour que le load balancer retire ce worker. Résultat mis en cache
+    quelques secondes (HEALTH_CACHE_SECONDS).
+    """
+    result = await readiness()
+    if result["status"] != "ok":
+        return JSONResponse(result, status_code=503)
+    return result
+
+
+@app.get("/.well-known/jwks.json")
+def jwks():
+    """
+    Clés publiques de vérification des JWT (ES256), indexées par `kid`.
+    Vide en HS256 : la clé partagée n'est jamais publiée.
+    """
+    return public_jwks()
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""
+Applique les migrations Alembic, séparément du démarrage de l'API.
+
+À lancer une fois par déploiement (job ou conteneur one-shot), avant de
+démarrer les workers : ceux-ci ne touchent plus au schéma et démarrent
+sans aller-retour vers PostgreSQL.
+
+- attend que la base soit joignable (réessais avec backoff, --wait secondes
+  au plus) : un redémarrage de la base ne fait pas échouer le déploiement
+- prend un verrou consultatif PostgreSQL : deux exécutions simultanées
+  appliquent les migrations l'une après l'autre
+
+Usage :
+    python -m app.migrate
+    python -m app.migrate --revision 0007_sessions --wait 120
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import exc, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.db.session import DATABASE_URL
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Clé du verrou consultatif des migrations (arbitraire, propre au projet)
+MIGRATION_LOCK_KEY = 7_337_001
+
+
+def alembic_config() -> Config:
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "migrations"))
+    return config
+
+
+async def wait_for_database(engine: AsyncEngine, timeout: float) -> AsyncConnection:
+    """
+    Ouvre une connexion, en réessayant (backoff exponentiel, 5 s max
+    entre deux essais) tant que `timeout` secondes ne sont pas écoulées.
+    """
+    deadline = time.monotonic() + timeout
+    delay = 0.5
+    while True:
+        try:
+            return await engine.connect()
+        except (OSError, asyncio.TimeoutError, exc.DBAPIError) as e:
+            if time.monotonic() + delay > deadline:
+                raise
+            print(f"base injoignable ({type(e).__name__}), nouvel essai dans {delay:.1f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 5)
+
+
+async def migrate(revision: str = "head", wait: float = 60) -> None:
+    engine = create_async_engine(
+        DATABASE_URL,
+        poolclass=NullPool,
+        connect_args={"timeout": settings.DB_CONNECT_TIMEOUT}
+    )
+    try:
+        # AUTOCOMMIT : la connexion du verrou ne garde aucune transaction
+        # ouverte, sinon les CREATE INDEX CONCURRENTLY des migrations
+        # l'attendraient indéfiniment
+        conn = await wait_for_database(engine.execution_options(isolation_level="AUTOCOMMIT"), wait)
+        try:
+            # Verrou de session, tenu jusqu'au pg_advisory_unlock
+            await conn.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+            try:
+                # env.py lance sa propre boucle d'événements : Alembic tourne dans un thread
+                await asyncio.to_thread(command.upgrade, alembic_config(), revision)
+            finally:
+                await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        finally:
+            await conn.close()
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--revision", default="head")
+    parser.add_argument("--wait", type=float, default=60, help="attente max de la base (s)")
+    args = parser.parse_args()
+    asyncio.run(migrate(args.revision, args.wait))
@@ -0,0 +1,69 @@
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, DateTime, ForeignKey, String
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.base import Base
+
+
+class AuthSession(Base):
+    """
+    Session de connexion : un refresh token (jamais stocké en clair).
+
+    Chaque usage du refresh token le remplace par un nouveau
+    (rotation) dans la même famille. Présenter un token déjà
+    remplacé ou révoqué = vol probable : toute la famille est révoquée.
+    """
+
+    __tablename__ = "sessions"
+
+    id = Column(
+        UUID(as_uuid=True),
+        primary_key=True,
+        default=uuid.uuid4
+    )
+
+    # Famille = toutes les rotations issues d'un même login
+    family_id = Column(
+        UUID(as_uuid=True),
+        index=True,
+        nullable=False
+    )
+
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        index=True,
+        nullable=False
+    )
+
+    # SHA-256 hexadécimal du refresh token
+    token_hash = Column(
+        String(64),
+        unique=True,
+        nullable=False
+    )
+
+    created_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False
+    )
+
+    expires_at = Column(
+        DateTime(timezone=True),
+        nullable=False
+    )
+
+    # Renseigné quand le token a servi (rotation) ou a été révoqué
+    revoked_at = Column(
+        DateTime(timezone=True),
+        nullable=True
+    )
+
+    # Session qui a remplacé celle-ci lors de la rotation
+    replaced_by = Column(
+        UUID(as_uuid=True),
+        nullable=True
+    )
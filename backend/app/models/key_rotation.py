@@ -0,0 +1,56 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import BigInteger, Column, DateTime, String
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.base import Base
+
+
+class KeyRotationCheckpoint(Base):
+    """
+    Avancement du job de re-chiffrement des secrets.
+
+    Une ligne par clé de chiffrement primaire (empreinte) :
+    une nouvelle rotation repart de zéro, une rotation interrompue
+    reprend après le dernier secret traité.
+    """
+
+    __tablename__ = "key_rotation_checkpoints"
+
+    # Empreinte (SHA-256 tronqué) de la clé primaire visée
+    key_fingerprint = Column(
+        String(16),
+        primary_key=True
+    )
+
+    # Dernier id de secret traité (parcours keyset par id)
+    last_secret_id = Column(
+        UUID(as_uuid=True),
+        nullable=True
+    )
+
+    # Secrets re-chiffrés jusqu'ici
+    rewritten = Column(
+        BigInteger,
+        default=0,
+        nullable=False
+    )
+
+    # Secrets illisibles avec toutes les clés connues (laissés tels quels)
+    unreadable = Column(
+        BigInteger,
+        default=0,
+        nullable=False
+    )
+
+    updated_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False
+    )
+
+    # Renseigné quand tout le coffre a été parcouru
+    completed_at = Column(
+        DateTime(timezone=True),
+        nullable=True
+    )
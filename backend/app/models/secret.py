@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, ForeignKey, DateTime
+from sqlalchemy import BigInteger, Column, String, ForeignKey, DateTime, Index, DDL, event, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
@@ -7,6 +7,11 @@ import uuid
 from app.db.base import Base
 
 
+# Texte sur lequel porte la recherche (identique à l'expression de l'index GIN,
+# sinon PostgreSQL ne peut pas utiliser l'index)
+SEARCH_TEXT_SQL = "title || ' ' || username"
+
+
 class Secret(Base):
     """
     Représente un secret stocké par un utilisateur.
@@ -42,14 +47,23 @@ class Secret(Base):
 
     created_at = Column(
         DateTime(timezone=True),
-        default=datetime.now(timezone.utc),
+        default=lambda: datetime.now(timezone.utc),
         nullable=False
     )
     
     updated_at = Column(
         DateTime(timezone=True),
-        default=datetime.now(timezone.utc),
-        onupdate=datetime.now(timezone.utc)
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc)
+    )
+
+    # Numéro de la dernière modification, tiré de users.vault_version
+    # (séquence par utilisateur, sert à GET /secrets/changes)
+    version = Column(
+        BigInteger,
+        default=0,
+        server_default="0",
+        nullable=False
     )
 
     # FK vers users.id (UUID)
@@ -63,3 +77,36 @@ class Secret(Base):
         "User",
         back_populates="secrets"
     )
+
+    __table_args__ = (
+        # Pagination par curseur : WHERE user_id = ? ORDER BY created_at DESC, id DESC
+        Index(
+            "ix_secrets_user_id_created_at_id",
+            user_id,
+            created_at.desc(),
+            id.desc()
+        ),
+        # Synchronisation incrémentale : WHERE user_id = ? AND version > ? ORDER BY version
+        Index(
+            "ix_secrets_user_id_version",
+            user_id,
+            version
+        ),
+        # Recherche floue (pg_trgm + btree_gin) : un seul index GIN filtre à la fois
+        # le propriétaire et les trigrammes de title + username
+        Index(
+            "ix_secrets_search_trgm",
+            user_id,
+            text(f"({SEARCH_TEXT_SQL}) gin_trgm_ops"),
+            postgresql_using="gin"
+        ),
+    )
+
+
+# L'index de recherche nécessite pg_trgm et btree_gin (create_all des tests)
+for extension in ("pg_trgm", "btree_gin"):
+    event.listen(
+        Secret.__table__,
+        "before_create",
+        DDL(f"CREATE EXTENSION IF NOT EXISTS {extension}")
+    )
@@ -0,0 +1,47 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import BigInteger, Column, DateTime, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.db.base import Base
+
+
+class SecretTombstone(Base):
+    """
+    Trace d'un secret supprimé, pour la synchronisation incrémentale :
+    un client qui a déjà ce secret doit apprendre sa suppression.
+    """
+
+    __tablename__ = "secret_tombstones"
+
+    # Id du secret supprimé (plus de FK : la ligne n'existe plus)
+    secret_id = Column(
+        UUID(as_uuid=True),
+        primary_key=True
+    )
+
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False
+    )
+
+    # Version du coffre attribuée à la suppression
+    version = Column(
+        BigInteger,
+        nullable=False
+    )
+
+    deleted_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False
+    )
+
+    __table_args__ = (
+        Index(
+            "ix_secret_tombstones_user_id_version",
+            user_id,
+            version
+        ),
+    )
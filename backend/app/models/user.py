@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import Column, String, DateTime
+from sqlalchemy import BigInteger, Column, String, DateTime
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -41,7 +41,16 @@ class User(Base):
     # Date de création du compte
     created_at = Column(
         DateTime(timezone=True),
-        default=datetime.now(timezone.utc),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False
+    )
+
+    # Version du coffre : incrémentée dans la même transaction
+    # que chaque écriture sur ses secrets (sert aux ETag)
+    vault_version = Column(
+        BigInteger,
+        default=0,
+        server_default="0",
         nullable=False
     )
 
@@ -1,13 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+import hashlib
+import logging
+import secrets
+import uuid
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from uuid import UUID
 
+from app.db.queries import (
+    delete_expired_sessions_statement,
+    revoke_session_family_statement,
+    session_by_token_query
+)
 from app.db.session import get_db
+from app.models.auth_session import AuthSession
 from app.models.user import User
+from app.schemas.auth import RefreshRequest
 from app.schemas.user import UserCreate, UserRead
-from app.core.security import hash_password, verify_password
+from app.core.hashing import (
+    HashingPoolSaturated,
+    hash_password_async,
+    verify_and_rehash_async,
+    verify_dummy_async
+)
+from app.core.rate_limit import RateLimited, check_login_rate_limit
 from app.core.jwt import create_access_token
 from app.core.config import settings
 from app.dependencies.auth import get_current_user
@@ -17,31 +37,70 @@ router = APIRouter(
     tags=["auth"]
 )
 
+logger = logging.getLogger(__name__)
+
+
+def _hash_refresh_token(token: str) -> str:
+    # Token aléatoire de 256 bits : un SHA-256 suffit (pas besoin de bcrypt)
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def _issue_tokens(
+    db: AsyncSession,
+    user_id: UUID,
+    family_id: Optional[UUID] = None
+) -> tuple[dict, AuthSession]:
+    """
+    Crée un access token et un refresh token (nouvelle session de la
+    famille, ou nouvelle famille au login). La session est ajoutée à `db`,
+    le commit reste à l'appelant.
+    """
+    refresh_token = secrets.token_urlsafe(32)
+    session = AuthSession(
+        id=uuid.uuid4(),
+        family_id=family_id or uuid.uuid4(),
+        user_id=user_id,
+        token_hash=_hash_refresh_token(refresh_token),
+        expires_at=datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    )
+    db.add(session)
+
+    access_token = create_access_token(
+        data={"sub": str(user_id)},
+        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    tokens = {
+        "access_token": access_token,
+        "refresh_token": refresh_token,
+        "token_type": "bearer"
+    }
+    return tokens, session
+
 
 @router.post(
     "/register",
     response_model=UserRead,
     status_code=status.HTTP_201_CREATED
 )
-def register(user_data: UserCreate, db: Session = Depends(get_db)):
+async def register(user_data: UserCreate, db: AsyncSession = Depends(get_db)):
     """
     Crée un nouvel utilisateur.
     
     - Vérifie que l'email n'existe pas déjà
-    - Hash le mot de passe avec bcrypt
+    - Hash le mot de passe avec bcrypt (pool de processus dédié)
     - Stocke l'utilisateur en base
     
     Raises:
         400: Email déjà enregistré
         500: Erreur serveur
+        503: Pool de hash saturé (header Retry-After)
     """
     try:
         # Vérifie si l'utilisateur existe déjà
-        existing_user = (
-            db.query(User)
-            .filter(User.email == user_data.email)
-            .first()
+        result = await db.execute(
+            select(User).where(User.email == user_data.email)
         )
+        existing_user = result.scalar_one_or_none()
         
         if existing_user:
             raise HTTPException(
@@ -50,7 +109,7 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
             )
         
         # Hash du mot de passe avant stockage
-        hashed_password = hash_password(user_data.password)
+        hashed_password = await hash_password_async(user_data.password)
         
         # Création de l'utilisateur
         user = User(
@@ -59,8 +118,8 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
         
         db.add(user)
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        await db.refresh(user)
         
         return user
     
@@ -68,9 +127,16 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
         # Re-raise les HTTPException (400)
         raise
     
+    except HashingPoolSaturated as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Service temporairement surchargé, réessayez plus tard",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    
     except SQLAlchemyError as e:
-        db.rollback()
-        print(f"Database error in register: {str(e)}")
+        await db.rollback()
+        logger.exception("Database error in register")
         
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -78,8 +144,8 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
         )
     
     except Exception as e:
-        db.rollback()
-        print(f"Unexpected error in register: {str(e)}")
+        await db.rollback()
+        logger.exception("Unexpected error in register")
         
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -88,69 +154,202 @@ def register(user_data: UserCreate, db: Session = Depends(get_db)):
 
 
 @router.post("/login", status_code=status.HTTP_200_OK)
-def login(
+async def login(
+    request: Request,
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """
     Authentifie un utilisateur via OAuth2 password flow.
     
     - Vérifie que l'email existe
-    - Compare le mot de passe hashé
-    - Génère un JWT token
+    - Compare le mot de passe hashé (et le re-hash si ses paramètres sont dépassés)
+    - Génère un JWT token et ouvre une session (refresh token)
     
     Returns:
         access_token: JWT token valide pour ACCESS_TOKEN_EXPIRE_MINUTES
+        refresh_token: à échanger sur /auth/refresh (sans mot de passe)
         token_type: "bearer"
     
     Raises:
         401: Identifiants invalides
+        429: Trop de tentatives pour cette IP ou ce compte (header Retry-After)
         500: Erreur serveur
+        503: Pool de hash saturé (header Retry-After)
     """
     try:
+        # Limitation par IP et par compte, avant toute requête en base ou tout hash
+        client_ip = request.client.host if request.client else "unknown"
+        check_login_rate_limit(client_ip, form_data.username)
+        
         # Recherche l'utilisateur (username = email dans OAuth2)
-        user = (
-            db.query(User)
-            .filter(User.email == form_data.username)
-            .first()
+        result = await db.execute(
+            select(User).where(User.email == form_data.username)
         )
+        user = result.scalar_one_or_none()
+        
+        valid, new_hash = False, None
+        if user:
+            valid, new_hash = await verify_and_rehash_async(form_data.password, user.password_hash)
+        else:
+            # Email inconnu : même coût de hash qu'un mauvais mot de passe
+            await verify_dummy_async(form_data.password)
         
         # Même message d'erreur si user inexistant OU mot de passe incorrect
-        if not user or not verify_password(form_data.password, user.password_hash):
+        if not valid:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Email ou mot de passe incorrect",
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        # Création du token JWT
-        access_token_expires = timedelta(
-            minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
+        # Hash dépassé (coût ou algorithme) : remplacé de façon transparente,
+        # dans la même transaction que la création de session
+        if new_hash:
+            user.password_hash = new_hash
+        
+        # Création du token JWT et d'une nouvelle session (refresh token)
+        await db.execute(delete_expired_sessions_statement(user.id, datetime.now(timezone.utc)))
+        tokens, _ = _issue_tokens(db, user.id)
+        await db.commit()
+        
+        return tokens
+    
+    except HTTPException:
+        raise
+    
+    except RateLimited as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Trop de tentatives de connexion, réessayez plus tard",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    
+    except HashingPoolSaturated as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Service temporairement surchargé, réessayez plus tard",
+            headers={"Retry-After": str(e.retry_after)}
         )
+    
+    except SQLAlchemyError as e:
+        await db.rollback()
+        logger.exception("Database error in login")
         
-        access_token = create_access_token(
-            data={"sub": str(user.id)},
-            expires_delta=access_token_expires
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erreur lors de la connexion"
         )
+    
+    except Exception as e:
+        await db.rollback()
+        logger.exception("Unexpected error in login")
         
-        return {
-            "access_token": access_token,
-            "token_type": "bearer"
-        }
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Une erreur inattendue est survenue"
+        )
+
+
+@router.post("/refresh", status_code=status.HTTP_200_OK)
+async def refresh(payload: RefreshRequest, db: AsyncSession = Depends(get_db)):
+    """
+    Échange un refresh token contre un nouvel access token
+    et un nouveau refresh token (rotation), sans bcrypt.
+    
+    - Le refresh token présenté est consommé : il ne resservira plus
+    - Un token déjà consommé ou révoqué (vol probable) révoque
+      toute la famille de sessions issue du même login
+    
+    Raises:
+        401: Refresh token invalide, expiré, révoqué ou réutilisé
+        500: Erreur serveur
+    """
+    invalid = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Refresh token invalide",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    try:
+        now = datetime.now(timezone.utc)
+        result = await db.execute(session_by_token_query(_hash_refresh_token(payload.refresh_token)))
+        session = result.scalar_one_or_none()
+        
+        if session is None:
+            raise invalid
+        
+        if session.revoked_at is not None:
+            # Réutilisation : le token a déjà servi ou la famille a été révoquée
+            await db.execute(revoke_session_family_statement(session.family_id, now))
+            await db.commit()
+            raise invalid
+        
+        if session.expires_at <= now:
+            raise invalid
+        
+        tokens, new_session = _issue_tokens(db, session.user_id, family_id=session.family_id)
+        session.revoked_at = now
+        session.replaced_by = new_session.id
+        await db.commit()
+        
+        return tokens
     
     except HTTPException:
         raise
     
     except SQLAlchemyError as e:
-        print(f"Database error in login: {str(e)}")
+        await db.rollback()
+        logger.exception("Database error in refresh")
         
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Erreur lors de la connexion"
+            detail="Erreur lors du renouvellement de la session"
+        )
+    
+    except Exception as e:
+        await db.rollback()
+        logger.exception("Unexpected error in refresh")
+        
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Une erreur inattendue est survenue"
+        )
+
+
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(payload: RefreshRequest, db: AsyncSession = Depends(get_db)):
+    """
+    Ferme la session : révoque le refresh token et toute sa famille.
+    
+    Les access tokens déjà émis restent valides jusqu'à leur
+    expiration (ACCESS_TOKEN_EXPIRE_MINUTES). Un token inconnu
+    est ignoré (déconnexion idempotente).
+    
+    Raises:
+        500: Erreur serveur
+    """
+    try:
+        result = await db.execute(session_by_token_query(_hash_refresh_token(payload.refresh_token)))
+        session = result.scalar_one_or_none()
+        
+        if session is not None:
+            await db.execute(revoke_session_family_statement(session.family_id, datetime.now(timezone.utc)))
+        await db.commit()
+        
+        return None
+    
+    except SQLAlchemyError as e:
+        await db.rollback()
+        logger.exception("Database error in logout")
+        
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erreur lors de la déconnexion"
         )
     
     except Exception as e:
-        print(f"Unexpected error in login: {str(e)}")
+        await db.rollback()
+        logger.exception("Unexpected error in logout")
         
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -159,7 +358,7 @@ def login(
 
 
 @router.get("/me", response_model=UserRead, status_code=status.HTTP_200_OK)
-def read_current_user(current_user: User = Depends(get_current_user)):
+async def read_current_user(current_user: User = Depends(get_current_user)):
     """
     Retourne les informations de l'utilisateur connecté.
     
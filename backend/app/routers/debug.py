@@ -0,0 +1,61 @@
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.core.profiler import ProfilerBusy, render_collapsed, sample_stacks
+from app.dependencies.auth import get_current_admin
+from app.models.user import User
+
+router = APIRouter(
+    prefix="/debug",
+    tags=["debug"]
+)
+
+
+def profiler_enabled() -> None:
+    # Résolue avant l'authentification : désactivé = 404 pour tous
+    if not settings.PROFILER_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not Found"
+        )
+
+
+@router.get(
+    "/profile",
+    response_class=PlainTextResponse,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(profiler_enabled)]
+)
+async def profile(
+    seconds: float = Query(5, gt=0),
+    interval_ms: float = Query(5, ge=1, le=1000),
+    current_user: User = Depends(get_current_admin)
+):
+    """
+    Profil par échantillonnage de ce worker pendant `seconds` secondes
+    (piles repliées, pour flamegraph.pl ou speedscope).
+
+    L'échantillonnage tourne dans un thread : la boucle d'événements
+    continue de servir les requêtes, qui apparaissent dans le profil.
+
+    Raises:
+        404: Profileur désactivé (PROFILER_ENABLED)
+        403: Compte non administrateur
+        409: Un profil est déjà en cours sur ce worker
+    """
+    try:
+        counts = await asyncio.to_thread(
+            sample_stacks,
+            min(seconds, settings.PROFILER_MAX_SECONDS),
+            interval_ms / 1000
+        )
+    except ProfilerBusy:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Un profil est déjà en cours"
+        )
+
+    return PlainTextResponse(render_collapsed(counts))
@@ -0,0 +1,155 @@
+import secrets
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import PlainTextResponse
+
+from app.core.circuit_breaker import db_breaker
+from app.core.config import settings
+from app.core.events import get_change_broker
+from app.core.hashing import hashing_pool
+from app.core.jwt import verify_cache
+from app.core.log import logging_stats
+from app.core.metrics import render_histogram, render_prometheus
+from app.core.rate_limit import get_rate_limiter
+from app.core.secret_cache import secret_cache
+from app.core.user_cache import get_user_cache
+from app.db.pool import checkout_wait_histogram, pool_stats
+from app.db.session import get_engine
+from app.dependencies.auth import get_current_admin
+from app.models.user import User
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["metrics"]
+)
+
+
+def metrics_token(authorization: str = Header("")) -> None:
+    # Désactivé sans METRICS_TOKEN ; jeton invalide = 404 aussi,
+    # l'endpoint ne se signale pas aux clients non autorisés
+    expected = f"Bearer {settings.METRICS_TOKEN}"
+    if not settings.METRICS_TOKEN or not secrets.compare_digest(authorization.encode(), expected.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not Found"
+        )
+
+
+def _stats_lines(prefix: str, stats: dict) -> list[str]:
+    # Valeurs numériques d'un dictionnaire de stats → jauges Prometheus
+    lines = []
+    for key, value in stats.items():
+        if not isinstance(value, (int, float)):
+            continue
+        name = f"pm_{prefix}_{key}"
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {int(value) if isinstance(value, bool) else value}")
+    return lines
+
+
+@router.get(
+    "",
+    response_class=PlainTextResponse,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(metrics_token)]
+)
+async def prometheus_metrics():
+    """
+    Toutes les métriques de ce worker au format texte Prometheus,
+    pour le scraper authentifié par METRICS_TOKEN (404 sinon).
+
+    - requêtes HTTP par route (compteurs, histogrammes de durée, en cours)
+    - erreurs serveur par type d'exception
+    - durées des hash de mots de passe, du chiffrement et des sessions DB
+    - état du pool DB, des caches, du limiteur et des abonnés SSE
+    """
+    extra = []
+    extra += _stats_lines("db_pool", pool_stats(get_engine().pool))
+    extra += _stats_lines("db_breaker", db_breaker.stats())
+    extra.append("# TYPE pm_db_pool_checkout_wait_seconds histogram")
+    extra += render_histogram("pm_db_pool_checkout_wait_seconds", (), [((), checkout_wait_histogram)])
+    extra += _stats_lines("hash_pool", {
+        "in_flight": hashing_pool.in_flight,
+        "max_in_flight": hashing_pool.max_in_flight,
+    })
+    extra += _stats_lines("user_cache", get_user_cache().stats())
+    extra += _stats_lines("secret_cache", secret_cache.stats())
+    extra += _stats_lines("jwt_cache", verify_cache.stats())
+    extra += _stats_lines("rate_limit", get_rate_limiter().stats())
+    extra += _stats_lines("events", get_change_broker().stats())
+    extra += _stats_lines("logging", logging_stats())
+    return PlainTextResponse(
+        render_prometheus(extra),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@router.get("/db-pool", status_code=status.HTTP_200_OK)
+async def db_pool_metrics(current_user: User = Depends(get_current_admin)):
+    """
+    Statistiques en direct du pool de connexions PostgreSQL.
+
+    - size / checked_in / checked_out / overflow : état instantané
+    - checkouts / timeouts : compteurs cumulés depuis le démarrage
+    - checkout_wait_seconds : histogramme du temps d'attente d'une connexion
+
+    Raises:
+        403: Compte non administrateur
+    """
+    return pool_stats(get_engine().pool)
+
+
+@router.get("/secret-cache", status_code=status.HTTP_200_OK)
+async def secret_cache_metrics(current_user: User = Depends(get_current_admin)):
+    """
+    Statistiques du cache des secrets déchiffrés.
+
+    - size / bytes / max_bytes : état instantané
+    - hits / misses / evictions / expirations / invalidations : compteurs cumulés
+
+    Raises:
+        403: Compte non administrateur
+    """
+    return secret_cache.stats()
+
+
+@router.get("/jwt-cache", status_code=status.HTTP_200_OK)
+async def jwt_cache_metrics(current_user: User = Depends(get_current_admin)):
+    """
+    Statistiques du cache de vérification des JWT.
+
+    - size / max_size : état instantané
+    - hits / misses / evictions : compteurs cumulés
+
+    Raises:
+        403: Compte non administrateur
+    """
+    return verify_cache.stats()
+
+
+@router.get("/rate-limit", status_code=status.HTTP_200_OK)
+async def rate_limit_metrics(current_user: User = Depends(get_current_admin)):
+    """
+    Statistiques du limiteur de tentatives de login de ce worker.
+
+    - keys / max_keys : seaux suivis
+    - allowed / rejected / evictions : compteurs cumulés
+
+    Raises:
+        403: Compte non administrateur
+    """
+    return get_rate_limiter().stats()
+
+
+@router.get("/events", status_code=status.HTTP_200_OK)
+async def change_events_metrics(current_user: User = Depends(get_current_admin)):
+    """
+    Statistiques des abonnés SSE de ce worker.
+
+    - users / subscribers : état instantané
+    - published / delivered / overflows : compteurs cumulés
+
+    Raises:
+        403: Compte non administrateur
+    """
+    return get_change_broker().stats()
@@ -1,15 +1,56 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+import asyncio
+import json
+import logging
+
+from fastapi import APIRouter, Depends, File, Header, HTTPException, Query, Response, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import insert, text
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
-from uuid import UUID
-from typing import List, Optional
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+from typing import List, Literal, Optional
 
+from app.db.queries import (
+    batch_delete_user_secrets_statement,
+    batch_update_user_secrets_statement,
+    bump_vault_version_statement,
+    changed_secrets_query,
+    deleted_secrets_query,
+    export_user_secrets_query,
+    list_user_secrets_query,
+    search_user_secrets_query,
+    secret_updated_at_query,
+    user_secret_query,
+    vault_version_query
+)
 from app.db.session import get_db
 from app.dependencies.auth import get_current_user
-from app.core.crypto import decrypt_secret, encrypt_secret
+from app.core.config import settings
+from app.core.crypto import decrypt_many_async, decrypt_secret, encrypt_many_async, encrypt_secret
+from app.core.events import ChangeBroker, get_change_broker
+from app.core.secret_cache import secret_cache
+from app.core.etag import compute_etag, etag_matches
+from app.core.export import csv_chunk, csv_header, ndjson_chunk
+from app.core.vault_import import ImportFormatError, open_rows, read_chunk
+from app.core.cursor import decode_cursor, encode_cursor
 from app.models.user import User
 from app.models.secret import Secret
-from app.schemas.secret import SecretCreate, SecretRead, SecretList, SecretUpdate
+from app.models.secret_tombstone import SecretTombstone
+from app.schemas.secret import (
+    SecretBatchCreate,
+    SecretBatchDelete,
+    SecretBatchItemResult,
+    SecretBatchUpdate,
+    SecretChanges,
+    SecretCreate,
+    SecretRead,
+    SecretList,
+    SecretSearchResult,
+    SecretUpdate
+)
 
 
 router = APIRouter(
@@ -17,10 +58,53 @@ router = APIRouter(
     tags=["secrets"]
 )
 
+logger = logging.getLogger(__name__)
+
+
+def _secret_etag(user_id, secret_id, updated_at) -> str:
+    # updated_at : datetime (base) ou chaîne (cache des secrets déchiffrés)
+    if isinstance(updated_at, str):
+        updated_at = datetime.fromisoformat(updated_at)
+    return compute_etag(user_id, secret_id, updated_at.isoformat())
+
+
+async def _reserve_versions(db: AsyncSession, user_id: UUID, count: int) -> int:
+    # Verrou de ligne sur users, à prendre avant toute ligne de secrets :
+    # toutes les écritures verrouillent dans le même ordre (pas d'interblocage).
+    # Renvoie la dernière version réservée
+    return (await db.execute(
+        bump_vault_version_statement(user_id, count)
+    )).scalar_one()
+
+
+async def _add_tombstones(db: AsyncSession, user_id: UUID, versions: dict[UUID, int]) -> None:
+    # Une version de suppression par secret, dans la transaction du DELETE
+    await db.execute(insert(SecretTombstone), [
+        {"secret_id": secret_id, "user_id": user_id, "version": version}
+        for secret_id, version in versions.items()
+    ])
+
+
+async def _publish_change(user_id: UUID, version: int) -> None:
+    # Après le commit : un échec de notification ne fait pas échouer l'écriture
+    # (les clients rattrapent au prochain événement ou via /secrets/changes)
+    try:
+        await get_change_broker().publish(user_id, {"type": "change", "version": version})
+    except Exception as e:
+        logger.warning("Change notification error", exc_info=True)
+
+
+def _not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={
+        "ETag": etag,
+        "Cache-Control": "private, no-cache"
+    })
+
+
 @router.post("/", response_model=SecretRead, status_code=status.HTTP_201_CREATED)
-def create_secret(
+async def create_secret(
     secret_data: SecretCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -37,15 +121,20 @@ def create_secret(
             user_id=current_user.id
         )
 
+        secret.version = (await db.execute(
+            bump_vault_version_statement(current_user.id)
+        )).scalar_one()
+        
         db.add(secret)
-        db.commit()
-        db.refresh(secret)
+        await db.commit()
+        await _publish_change(current_user.id, secret.version)
+        await db.refresh(secret)
 
         return secret
     
     except SQLAlchemyError as e:
-        db.rollback()  # Important : rollback en cas d'erreur
-        print(f"Database error in create_secret: {str(e)}")
+        await db.rollback()  # Important : rollback en cas d'erreur
+        logger.exception("Database error in create_secret")
         
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -53,8 +142,8 @@ def create_secret(
         )
     
     except Exception as e:
-        db.rollback()
-        print(f"Unexpected error in create_secret: {str(e)}")
+        await db.rollback()
+        logger.exception("Unexpected error in create_secret")
         
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -63,23 +152,37 @@ def create_secret(
 
 
 @router.get("/", response_model=List[SecretList], status_code=status.HTTP_200_OK)
-def list_secrets(
-    skip: int = 0,
+async def list_secrets(
+    response: Response,
+    cursor: Optional[str] = None,
+    skip: int = Query(0, deprecated=True),
     limit: int = 100,
     search: Optional[str] = None,
-    db: Session = Depends(get_db),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Récupère tous les secrets de l'utilisateur connecté.
     
+    Pagination par curseur (keyset) sur (created_at, id) :
+    le curseur de la page suivante est renvoyé dans le header
+    X-Next-Cursor (absent sur la dernière page).
+    
+    Requête conditionnelle : ETag = version du coffre + paramètres ;
+    si If-None-Match correspond, 304 sans lire les secrets.
+    
     Args:
-        skip: Nombre de résultats à sauter (pagination)
+        cursor: Curseur opaque renvoyé par la page précédente
+        skip: Déprécié - pagination par offset (ignoré si cursor est fourni)
         limit: Nombre max de résultats (max 100)
         search: Recherche dans title/username (optionnel)
     
     Returns:
         Liste des secrets (sans les mots de passe déchiffrés)
+    
+    Raises:
+        400: Curseur invalide
     """
     
     # Validation du limit
@@ -90,29 +193,48 @@ def list_secrets(
     if skip < 0:
         skip = 0
     
-    try:
-        query = db.query(Secret).filter(Secret.user_id == current_user.id)
-        
-        # Filtre de recherche (si fourni)
-        if search:
-            search_pattern = f"%{search}%"
-            query = query.filter(
-                (Secret.title.ilike(search_pattern)) | 
-                (Secret.username.ilike(search_pattern))
+    position = None
+    if cursor:
+        try:
+            position = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Curseur de pagination invalide"
             )
+    
+    try:
+        # Version lue AVANT les lignes : au pire l'ETag est plus ancien
+        # que le contenu, jamais l'inverse (pas de 304 périmé)
+        version = (await db.execute(vault_version_query(current_user.id))).scalar_one()
+        etag = compute_etag(current_user.id, version, cursor, skip, limit, search)
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "private, no-cache"
         
-        secrets = (
-            query
-            .order_by(Secret.created_at.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
+        if etag_matches(if_none_match, etag):
+            return _not_modified(etag)
+        
+        # Une ligne de plus pour savoir s'il existe une page suivante
+        result = await db.execute(
+            list_user_secrets_query(
+                current_user.id,
+                search=search,
+                position=position,
+                skip=skip,
+                limit=limit + 1
+            )
         )
+        secrets = result.scalars().all()
+        
+        if len(secrets) > limit:
+            secrets = secrets[:limit]
+            last = secrets[-1]
+            response.headers["X-Next-Cursor"] = encode_cursor(last.created_at, last.id)
         
         return secrets
     
     except SQLAlchemyError as e:
-        print(f"Database error in list_secrets: {str(e)}")
+        logger.exception("Database error in list_secrets")
         
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -120,7 +242,604 @@ def list_secrets(
         )
     
     except Exception as e:
-        print(f"Unexpected error in list_secrets: {str(e)}")
+        logger.exception("Unexpected error in list_secrets")
+        
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Une erreur inattendue est survenue"
+        )
+
+
+@router.get("/changes", response_model=SecretChanges, status_code=status.HTTP_200_OK)
+async def list_secret_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Synchronisation incrémentale : changements du coffre après la version `since`.
+    
+    - changes : secrets créés ou modifiés (sans mot de passe déchiffré)
+    - deleted : secrets supprimés
+    
+    Chaque écriture reçoit une version distincte et croissante par utilisateur :
+    un client stocke `version` et la repasse en `since`, le coût est
+    proportionnel au nombre de changements, pas à la taille du coffre.
+    since=0 renvoie tout le coffre (synchronisation initiale, par pages).
+    """
+    try:
+        # Version lue AVANT les lignes : les écritures commitées ensuite
+        # auront une version plus grande et seront vues au prochain appel
+        version = (await db.execute(vault_version_query(current_user.id))).scalar_one()
+        
+        # limit + 1 de chaque côté puis fusion par version croissante
+        secrets = (await db.execute(
+            changed_secrets_query(current_user.id, since, limit + 1)
+        )).scalars().all()
+        tombstones = (await db.execute(
+            deleted_secrets_query(current_user.id, since, limit + 1)
+        )).scalars().all()
+        
+        events = sorted(
+            [(secret.version, secret) for secret in secrets if secret.version <= version]
+            + [(tombstone.version, tombstone) for tombstone in tombstones if tombstone.version <= version],
+            key=lambda event: event[0]
+        )
+        has_more = len(events) > limit
+        events = events[:limit]
+        
+        return {
+            "changes": [item for _, item in events if isinstance(item, Secret)],
+            "deleted": [
+                {"id": item.secret_id, "version": item.version, "deleted_at": item.deleted_at}
+                for _, item in events
+                if isinstance(item, SecretTombstone)
+            ],
+            "version": events[-1][0] if has_more else max(version, since),
+            "has_more": has_more
+        }
+    
+    except SQLAlchemyError as e:
+        logger.exception("Database error in list_secret_changes")
+        
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erreur lors de la récupération des changements"
+        )
+    
+    except Exception as e:
+        logger.exception("Unexpected error in list_secret_changes")
+        
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Une erreur inattendue est survenue"
+        )
+
+
+async def event_stream(broker: ChangeBroker, user_id: UUID):
+    """
+    Générateur SSE d'un abonné : l'abonnement vit exactement aussi
+    longtemps que la connexion (désabonnement à la déconnexion).
+    """
+    subscription = broker.subscribe(user_id)
+    try:
+        yield f"retry: {settings.SSE_RETRY_MS}\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), timeout=settings.SSE_PING_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+    finally:
+        broker.unsubscribe(subscription)
+
+
+@router.get("/events", status_code=status.HTTP_200_OK)
+async def secret_events(
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Flux Server-Sent Events des changements du coffre de l'utilisateur.
+    
+    Événements :
+        change : {"version": N} → appeler GET /secrets/changes?since=<dernière version connue>
+        resync : notifications perdues (client trop lent, reconnexion du broker)
+                 → même appel, depuis la dernière version connue
+    Un commentaire `: ping` est envoyé toutes les SSE_PING_SECONDS
+    pour garder la connexion ouverte à travers les proxies.
+    """
+    # La connexion DB éventuellement prise par get_current_user est rendue
+    # au pool : un abonné inactif ne doit pas bloquer une connexion
+    await db.close()
+    
+    return StreamingResponse(
+        event_stream(get_change_broker(), current_user.id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/search", response_model=List[SecretSearchResult], status_code=status.HTTP_200_OK)
+async def search_secrets(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Recherche classée dans les secrets de l'utilisateur connecté.
+    
+    - Correspondance par préfixe sur title / username (classée en premier)
+    - Correspondance floue tolérante aux fautes de frappe (pg_trgm)
+    
+    Args:
+        q: Terme recherché
+        limit: Nombre max de résultats (max 100)
+    
+    Returns:
+        Secrets triés par pertinence, avec leur score de similarité
+    """
+    try:
+        # Seuil de similarité limité à la transaction courante
+        await db.execute(
+            text("SELECT set_config('pg_trgm.word_similarity_threshold', :threshold, true)"),
+            {"threshold": str(settings.SEARCH_SIMILARITY_THRESHOLD)}
+        )
+        result = await db.execute(
+            search_user_secrets_query(current_user.id, q, limit=limit)
+        )
+        
+        return [
+            {
+                "id": secret.id,
+                "title": secret.title,
+                "username": secret.username,
+                "url": secret.url,
+                "created_at": secret.created_at,
+                "score": score
+            }
+            for secret, score in result.all()
+        ]
+    
+    except SQLAlchemyError as e:
+        logger.exception("Database error in search_secrets")
+        
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erreur lors de la recherche des secrets"
+        )
+    
+    except Exception as e:
+        logger.exception("Unexpected error in search_secrets")
+        
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Une erreur inattendue est survenue"
+        )
+
+
+@router.get("/export", status_code=status.HTTP_200_OK)
+async def export_secrets(
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Exporte tout le coffre de l'utilisateur connecté, en clair.
+    
+    - format : ndjson (un objet JSON par ligne) ou csv
+    
+    Les lignes sont lues par un curseur serveur (yield_per),
+    déchiffrées et envoyées lot par lot : la mémoire reste constante
+    quelle que soit la taille du coffre.
+    """
+    
+    async def generate():
+        if format == "csv":
+            yield csv_header()
+        
+        try:
+            result = await db.stream(
+                export_user_secrets_query(current_user.id)
+                .execution_options(yield_per=settings.EXPORT_YIELD_PER)
+            )
+            
+            async for partition in result.partitions():
+                passwords = await decrypt_many_async([row.password for row in partition])
+                rows = [
+                    {**row._asdict(), "password": password}
+                    for row, password in zip(partition, passwords)
+                ]
+                yield csv_chunk(rows) if format == "csv" else ndjson_chunk(rows)
+        
+        except Exception as e:
+            # Les en-têtes sont déjà partis : on coupe le flux,
+            # le client voit une réponse tronquée
+            logger.exception("Error in export_secrets")
+            raise
+    
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    
+    return StreamingResponse(
+        generate(),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="secrets.{format}"'}
+    )
+
+
+@router.post("/import", status_code=status.HTTP_200_OK)
+async def import_secrets(
+    file: UploadFile = File(...),
+    format: Literal["csv", "ndjson"] = Query("csv"),
+    resume_from: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Importe un export d'un autre gestionnaire de mots de passe.
+    
+    - format : csv (Bitwarden, LastPass, 1Password, Chrome, export de ce coffre)
+      ou ndjson (export de ce coffre)
+    - resume_from : reprise après une interruption, numéro de la dernière
+      ligne déjà importée (champ `rows` du dernier événement reçu)
+    
+    Le fichier est lu par lots de IMPORT_CHUNK_SIZE lignes : chaque lot est
+    validé (SecretCreate), chiffré puis inséré et validé (commit) en une
+    transaction. La réponse est un flux NDJSON d'événements :
+        invalid : ligne rejetée (row, detail)
+        progress : après chaque lot validé (rows, imported, invalid)
+        error : import interrompu, reprendre avec resume_from=rows
+        done : fin de l'import
+    
+    Raises:
+        400: Fichier illisible (en-tête CSV inconnu, fichier vide)
+    """
+    try:
+        rows = await run_in_threadpool(open_rows, file.file, format)
+    except ImportFormatError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    def event(**data) -> str:
+        return json.dumps(data, ensure_ascii=False) + "\n"
+    
+    async def generate():
+        processed = resume_from
+        imported = 0
+        invalid = 0
+        
+        while True:
+            chunk = await run_in_threadpool(read_chunk, rows, settings.IMPORT_CHUNK_SIZE)
+            if not chunk:
+                break
+            
+            lines = []
+            items = []
+            
+            for number, raw, error in chunk:
+                if number <= resume_from:
+                    continue
+                
+                if error is None:
+                    try:
+                        items.append(SecretCreate.model_validate(raw))
+                    except ValidationError as e:
+                        error = "; ".join(
+                            f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}"
+                            for err in e.errors()
+                        )
+                
+                if error is not None:
+                    invalid += 1
+                    lines.append(event(event="invalid", row=number, detail=error))
+            
+            try:
+                if items:
+                    now = datetime.now(timezone.utc)
+                    encrypted_passwords = await encrypt_many_async([item.password for item in items])
+                    last_version = (await db.execute(
+                        bump_vault_version_statement(current_user.id, len(items))
+                    )).scalar_one()
+                    first_version = last_version - len(items) + 1
+                    await db.execute(insert(Secret), [
+                        {
+                            "id": uuid4(),
+                            "title": item.title,
+                            "username": item.username,
+                            "password": password,
+                            "url": item.url,
+                            "version": first_version + offset,
+                            "created_at": now,
+                            "updated_at": now,
+                            "user_id": current_user.id
+                        }
+                        for offset, (item, password) in enumerate(zip(items, encrypted_passwords))
+                    ])
+                    await db.commit()
+                    await _publish_change(current_user.id, last_version)
+            
+            except SQLAlchemyError as e:
+                await db.rollback()
+                logger.exception("Database error in import_secrets")
+                
+                yield "".join(lines) + event(
+                    event="error",
+                    rows=processed,
+                    detail="Erreur lors de l'import des secrets"
+                )
+                return
+            
+            except Exception as e:
+                await db.rollback()
+                logger.exception("Unexpected error in import_secrets")
+                
+                yield "".join(lines) + event(
+                    event="error",
+                    rows=processed,
+                    detail="Une erreur inattendue est survenue"
+                )
+                return
+            
+            processed = max(processed, chunk[-1][0])
+            imported += len(items)
+            yield "".join(lines) + event(event="progress", rows=processed, imported=imported, invalid=invalid)
+        
+        yield event(event="done", rows=processed, imported=imported, invalid=invalid)
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
+
+
+def _check_batch_size(size: int) -> None:
+    """
+    Refuse les batchs au-delà de SECRETS_BATCH_MAX_SIZE éléments.
+    """
+    if size > settings.SECRETS_BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_413_CONTENT_TOO_LARGE,
+            detail=f"Batch trop volumineux (max {settings.SECRETS_BATCH_MAX_SIZE} éléments)"
+        )
+
+
+@router.post("/batch", response_model=List[SecretBatchItemResult], status_code=status.HTTP_201_CREATED)
+async def create_secrets_batch(
+    batch: SecretBatchCreate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Crée plusieurs secrets en une seule transaction.
+    
+    Les mots de passe sont chiffrés en lot (pool crypto) puis insérés
+    via un INSERT multi-lignes. Tout ou rien.
+    
+    Raises:
+        413: Batch trop volumineux
+    """
+    _check_batch_size(len(batch.items))
+    
+    try:
+        now = datetime.now(timezone.utc)
+        encrypted_passwords = await encrypt_many_async([item.password for item in batch.items])
+        rows = [
+            {
+                "id": uuid4(),
+                "title": item.title,
+                "username": item.username,
+                "password": password,
+                "url": item.url,
+                "created_at": now,
+                "updated_at": now,
+                "user_id": current_user.id
+            }
+            for item, password in zip(batch.items, encrypted_passwords)
+        ]
+        
+        if rows:
+            # Une version distincte par secret créé
+            last_version = (await db.execute(
+                bump_vault_version_statement(current_user.id, len(rows))
+            )).scalar_one()
+            for offset, row in enumerate(rows):
+                row["version"] = last_version - len(rows) + 1 + offset
+            
+            await db.execute(insert(Secret), rows)
+            await db.commit()
+            await _publish_change(current_user.id, last_version)
+        
+        return [
+            {"index": index, "id": row["id"], "status": "created"}
+            for index, row in enumerate(rows)
+        ]
+    
+    except SQLAlchemyError as e:
+        await db.rollback()
+        logger.exception("Database error in create_secrets_batch")
+        
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erreur lors de la création des secrets"
+        )
+    
+    except Exception as e:
+        await db.rollback()
+        logger.exception("Unexpected error in create_secrets_batch")
+        
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Une erreur inattendue est survenue"
+        )
+
+
+@router.patch("/batch", response_model=List[SecretBatchItemResult], status_code=status.HTTP_200_OK)
+async def update_secrets_batch(
+    batch: SecretBatchUpdate,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Met à jour plusieurs secrets en une seule transaction
+    (un seul UPDATE ... FROM (VALUES ...)).
+    
+    Résultat par élément :
+        updated, not_found (absent ou appartenant à un autre utilisateur),
+        invalid (aucun champ à mettre à jour), duplicate (id déjà présent)
+    
+    Raises:
+        413: Batch trop volumineux
+    """
+    _check_batch_size(len(batch.items))
+    
+    results = [None] * len(batch.items)
+    rows = []
+    indexes = {}
+    
+    for index, item in enumerate(batch.items):
+        if item.id in indexes:
+            results[index] = {"index": index, "id": item.id, "status": "duplicate"}
+            continue
+        
+        if not any([item.title, item.username, item.password, item.url]):
+            results[index] = {
+                "index": index,
+                "id": item.id,
+                "status": "invalid",
+                "detail": "Aucun champ à mettre à jour"
+            }
+            continue
+        
+        indexes[item.id] = index
+        rows.append(item)
+    
+    try:
+        updated_ids = set()
+        
+        if rows:
+            encrypted_passwords = await encrypt_many_async([item.password for item in rows])
+            # Une version réservée par élément (les not_found laissent un trou)
+            last_version = (await db.execute(
+                bump_vault_version_statement(current_user.id, len(rows))
+            )).scalar_one()
+            first_version = last_version - len(rows) + 1
+            result = await db.execute(
+                batch_update_user_secrets_statement(
+                    current_user.id,
+                    [
+                        (item.id, item.title, item.username, password, item.url, first_version + offset)
+                        for offset, (item, password) in enumerate(zip(rows, encrypted_passwords))
+                    ],
+                    updated_at=datetime.now(timezone.utc)
+                ).execution_options(synchronize_session=False)
+            )
+            updated_ids = set(result.scalars().all())
+            await db.commit()
+            for secret_id in updated_ids:
+                secret_cache.invalidate(current_user.id, secret_id)
+            if updated_ids:
+                await _publish_change(current_user.id, last_version)
+        
+        for secret_id, index in indexes.items():
+            results[index] = {
+                "index": index,
+                "id": secret_id,
+                "status": "updated" if secret_id in updated_ids else "not_found"
+            }
+        
+        return results
+    
+    except SQLAlchemyError as e:
+        await db.rollback()
+        logger.exception("Database error in update_secrets_batch")
+        
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erreur lors de la mise à jour des secrets"
+        )
+    
+    except Exception as e:
+        await db.rollback()
+        logger.exception("Unexpected error in update_secrets_batch")
+        
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Une erreur inattendue est survenue"
+        )
+
+
+@router.post("/batch/delete", response_model=List[SecretBatchItemResult], status_code=status.HTTP_200_OK)
+async def delete_secrets_batch(
+    batch: SecretBatchDelete,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Supprime plusieurs secrets en une seule transaction (un seul DELETE).
+    
+    Résultat par élément : deleted, not_found, duplicate
+    
+    Raises:
+        413: Batch trop volumineux
+    """
+    _check_batch_size(len(batch.ids))
+    
+    results = [None] * len(batch.ids)
+    indexes = {}
+    
+    for index, secret_id in enumerate(batch.ids):
+        if secret_id in indexes:
+            results[index] = {"index": index, "id": secret_id, "status": "duplicate"}
+        else:
+            indexes[secret_id] = index
+    
+    try:
+        deleted_ids = set()
+        
+        if indexes:
+            # Une version réservée par élément (les not_found laissent un trou)
+            last_version = await _reserve_versions(db, current_user.id, len(indexes))
+            first_version = last_version - len(indexes) + 1
+            result = await db.execute(
+                batch_delete_user_secrets_statement(current_user.id, list(indexes))
+                .execution_options(synchronize_session=False)
+            )
+            deleted_ids = set(result.scalars().all())
+            if deleted_ids:
+                await _add_tombstones(db, current_user.id, {
+                    secret_id: first_version + offset
+                    for offset, secret_id in enumerate(indexes)
+                    if secret_id in deleted_ids
+                })
+            await db.commit()
+            for secret_id in deleted_ids:
+                secret_cache.invalidate(current_user.id, secret_id)
+            if deleted_ids:
+                await _publish_change(current_user.id, last_version)
+        
+        for secret_id, index in indexes.items():
+            results[index] = {
+                "index": index,
+                "id": secret_id,
+                "status": "deleted" if secret_id in deleted_ids else "not_found"
+            }
+        
+        return results
+    
+    except SQLAlchemyError as e:
+        await db.rollback()
+        logger.exception("Database error in delete_secrets_batch")
+        
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Erreur lors de la suppression des secrets"
+        )
+    
+    except Exception as e:
+        await db.rollback()
+        logger.exception("Unexpected error in delete_secrets_batch")
         
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -129,25 +848,52 @@ def list_secrets(
 
 
 @router.get("/{secret_id}", response_model=SecretRead, status_code=status.HTTP_200_OK)
-def get_secret(
+async def get_secret(
     secret_id: UUID,
-    db: Session = Depends(get_db),
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
     Récupère un secret spécifique avec son mot de passe déchiffré.
     
     Le secret doit appartenir à l'utilisateur connecté.
+    Servi depuis le cache des secrets déchiffrés s'il est activé.
+    
+    Requête conditionnelle : ETag = utilisateur + id + updated_at ;
+    si If-None-Match correspond, 304 sans lire ni déchiffrer le secret.
     
     Raises:
         404: Secret non trouvé ou n'appartient pas à l'utilisateur
     """
+    response.headers["Cache-Control"] = "private, no-cache"
+    
+    if secret_cache.enabled:
+        cached = secret_cache.get(current_user.id, secret_id)
+        if cached is not None:
+            etag = _secret_etag(current_user.id, secret_id, cached["updated_at"])
+            if etag_matches(if_none_match, etag):
+                return _not_modified(etag)
+            response.headers["ETag"] = etag
+            return cached
+        epoch = secret_cache.epoch()
     
     try:
-        secret = db.query(Secret).filter(
-            Secret.id == secret_id,
-            Secret.user_id == current_user.id
-        ).first()
+        if if_none_match:
+            # Validation seule : une colonne, ni matérialisation ni déchiffrement
+            updated_at = (await db.execute(
+                secret_updated_at_query(current_user.id, secret_id)
+            )).scalar_one_or_none()
+            if updated_at is not None:
+                etag = _secret_etag(current_user.id, secret_id, updated_at)
+                if etag_matches(if_none_match, etag):
+                    return _not_modified(etag)
+        
+        result = await db.execute(
+            user_secret_query(current_user.id, secret_id)
+        )
+        secret = result.scalar_one_or_none()
         
         # Vérification explicite si le secret existe
         if not secret:
@@ -160,14 +906,14 @@ def get_secret(
         try:
             decrypted_password = decrypt_secret(secret.password)
         except Exception as decrypt_error:
-            print(f"Decryption error: {str(decrypt_error)}")
+            logger.exception("Decryption error in get_secret")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Erreur lors du déchiffrement du mot de passe"
             )
         
         # Construction manuelle pour inclure le mot de passe déchiffré
-        return {
+        payload = {
             "id": secret.id,
             "title": secret.title,
             "username": secret.username,
@@ -176,13 +922,19 @@ def get_secret(
             "created_at": secret.created_at,
             "updated_at": secret.updated_at
         }
+        
+        if secret_cache.enabled:
+            secret_cache.set(current_user.id, secret_id, payload, epoch)
+        
+        response.headers["ETag"] = _secret_etag(current_user.id, secret_id, secret.updated_at)
+        return payload
     
     except HTTPException:
         # Re-raise les HTTPException (404, 500 de déchiffrement)
         raise
     
     except SQLAlchemyError as e:
-        print(f"Database error in get_secret: {str(e)}")
+        logger.exception("Database error in get_secret")
         
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -190,7 +942,7 @@ def get_secret(
         )
     
     except Exception as e:
-        print(f"Unexpected error in get_secret: {str(e)}")
+        logger.exception("Unexpected error in get_secret")
         
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -199,10 +951,10 @@ def get_secret(
 
 
 @router.patch("/{secret_id}", response_model=SecretRead, status_code=status.HTTP_200_OK)
-def update_secret(
+async def update_secret(
     secret_id: UUID,
     secret_data: SecretUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -211,10 +963,10 @@ def update_secret(
     Si le mot de passe est fourni, il sera re-chiffré.
     """
     try:
-        secret = db.query(Secret).filter(
-            Secret.id == secret_id,
-            Secret.user_id == current_user.id
-        ).first()
+        result = await db.execute(
+            user_secret_query(current_user.id, secret_id)
+        )
+        secret = result.scalar_one_or_none()
         
         if not secret:
             raise HTTPException(
@@ -243,8 +995,14 @@ def update_secret(
             detail="Aucun champ à mettre à jour"
           )
         
-        db.commit()
-        db.refresh(secret)
+        secret.version = (await db.execute(
+            bump_vault_version_statement(current_user.id)
+        )).scalar_one()
+        
+        await db.commit()
+        secret_cache.invalidate(current_user.id, secret_id)
+        await _publish_change(current_user.id, secret.version)
+        await db.refresh(secret)
         
         return secret
     
@@ -252,8 +1010,8 @@ def update_secret(
         raise
     
     except SQLAlchemyError as e:
-        db.rollback()
-        print(f"Database error in update_secret: {str(e)}")
+        await db.rollback()
+        logger.exception("Database error in update_secret")
         
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -261,8 +1019,8 @@ def update_secret(
         )
     
     except Exception as e:
-        db.rollback()
-        print(f"Unexpected error in update_secret: {str(e)}")
+        await db.rollback()
+        logger.exception("Unexpected error in update_secret")
         
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -271,9 +1029,9 @@ def update_secret(
 
 
 @router.delete("/{secret_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_secret(
+async def delete_secret(
     secret_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -283,10 +1041,10 @@ def delete_secret(
         404: Secret non trouvé
     """
     try:
-        secret = db.query(Secret).filter(
-            Secret.id == secret_id,
-            Secret.user_id == current_user.id
-        ).first()
+        result = await db.execute(
+            user_secret_query(current_user.id, secret_id)
+        )
+        secret = result.scalar_one_or_none()
         
         if not secret:
             raise HTTPException(
@@ -294,8 +1052,12 @@ def delete_secret(
                 detail="Secret non trouvé"
             )
         
-        db.delete(secret)
-        db.commit()
+        version = await _reserve_versions(db, current_user.id, 1)
+        await db.delete(secret)
+        await _add_tombstones(db, current_user.id, {secret.id: version})
+        await db.commit()
+        secret_cache.invalidate(current_user.id, secret_id)
+        await _publish_change(current_user.id, version)
         
         # 204 No Content ne retourne rien
         return None
@@ -304,8 +1066,8 @@ def delete_secret(
         raise
     
     except SQLAlchemyError as e:
-        db.rollback()
-        print(f"Database error in delete_secret: {str(e)}")
+        await db.rollback()
+        logger.exception("Database error in delete_secret")
         
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -313,8 +1075,8 @@ def delete_secret(
         )
     
     except Exception as e:
-        db.rollback()
-        print(f"Unexpected error in delete_secret: {str(e)}")
+        await db.rollback()
+        logger.exception("Unexpected error in delete_secret")
         
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -0,0 +1,8 @@
+from pydantic import BaseModel
+
+
+class RefreshRequest(BaseModel):
+    """
+    Refresh token présenté à /auth/refresh ou /auth/logout.
+    """
+    refresh_token: str
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
 
@@ -30,6 +30,34 @@ class SecretList(SecretBase):
         from_attributes = True
 
 
+class SecretSearchResult(SecretList):
+    score: float
+
+
+class SecretChange(SecretList):
+    updated_at: datetime
+    version: int
+
+
+class SecretDeletion(BaseModel):
+    id: UUID
+    version: int
+    deleted_at: datetime
+
+
+class SecretChanges(BaseModel):
+    """
+    Page de GET /secrets/changes.
+
+    version : à repasser en `since` à l'appel suivant
+    has_more : d'autres changements suivent (rappeler immédiatement)
+    """
+    changes: List[SecretChange]
+    deleted: List[SecretDeletion]
+    version: int
+    has_more: bool
+
+
 class SecretRead(SecretBase):
     id: UUID
     password: str
@@ -37,4 +65,32 @@ class SecretRead(SecretBase):
     updated_at: datetime
     
     class ConfigDict:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class SecretBatchCreate(BaseModel):
+    items: List[SecretCreate]
+
+
+class SecretBatchUpdateItem(SecretUpdate):
+    id: UUID
+
+
+class SecretBatchUpdate(BaseModel):
+    items: List[SecretBatchUpdateItem]
+
+
+class SecretBatchDelete(BaseModel):
+    ids: List[UUID]
+
+
+class SecretBatchItemResult(BaseModel):
+    """
+    Résultat d'un élément d'une opération batch (même ordre que la requête).
+
+    status : created / updated / deleted / not_found / invalid / duplicate
+    """
+    index: int
+    id: Optional[UUID] = None
+    status: str
+    detail: Optional[str] = None
@@ -0,0 +1,98 @@
+"""
+Benchmark batch : N créations/mises à jour/suppressions unitaires
+contre les mêmes opérations via /secrets/batch.
+
+Usage (API démarrée) :
+    python benchmarks/batch.py --base-url http://localhost:8000 --items 500
+
+Affiche, pour chaque opération, la durée totale et le débit
+en secrets/s dans les deux modes.
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from common import setup_account
+
+
+def show(name, count, elapsed):
+    print(f"{name:<22} n={count:<6} durée={elapsed * 1000:9.1f}ms débit={count / elapsed:9.1f} secrets/s")
+
+
+async def per_item(client, headers, items, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send(method, url, **kwargs):
+        async with semaphore:
+            response = await client.request(method, url, headers=headers, **kwargs)
+            response.raise_for_status()
+            return response
+
+    start = time.perf_counter()
+    created = await asyncio.gather(*[send("POST", "/secrets/", json=item) for item in items])
+    show("unitaire create", len(items), time.perf_counter() - start)
+    ids = [response.json()["id"] for response in created]
+
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        send("PATCH", f"/secrets/{secret_id}", json={"title": "updated"}) for secret_id in ids
+    ])
+    show("unitaire update", len(ids), time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[send("DELETE", f"/secrets/{secret_id}") for secret_id in ids])
+    show("unitaire delete", len(ids), time.perf_counter() - start)
+
+
+async def batched(client, headers, items, batch_size):
+    chunks = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+
+    start = time.perf_counter()
+    ids = []
+    for chunk in chunks:
+        response = await client.post("/secrets/batch", json={"items": chunk}, headers=headers)
+        response.raise_for_status()
+        ids.extend(result["id"] for result in response.json())
+    show("batch create", len(items), time.perf_counter() - start)
+
+    id_chunks = [ids[i:i + batch_size] for i in range(0, len(ids), batch_size)]
+
+    start = time.perf_counter()
+    for chunk in id_chunks:
+        response = await client.patch(
+            "/secrets/batch",
+            json={"items": [{"id": secret_id, "title": "updated"} for secret_id in chunk]},
+            headers=headers
+        )
+        response.raise_for_status()
+    show("batch update", len(ids), time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for chunk in id_chunks:
+        response = await client.post("/secrets/batch/delete", json={"ids": chunk}, headers=headers)
+        response.raise_for_status()
+    show("batch delete", len(ids), time.perf_counter() - start)
+
+
+async def main(args):
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=120) as client:
+        _, _, token = await setup_account(client, secrets_count=0)
+        headers = {"Authorization": f"Bearer {token}"}
+        items = [
+            {"title": f"secret {i}", "username": "bench", "password": f"s3cret-{i}"}
+            for i in range(args.items)
+        ]
+
+        await per_item(client, headers, items, args.concurrency)
+        await batched(client, headers, items, args.batch_size)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=10)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,66 @@
+"""
+Outils partagés par les scripts de benchmark (percentiles, compte de test).
+"""
+import time
+import uuid
+
+import httpx
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+def report(name, latencies, statuses=None, elapsed=None):
+    line = (
+        f"{name:<12} n={len(latencies):<7} "
+        f"p50={percentile(latencies, 50) * 1000:8.1f}ms "
+        f"p99={percentile(latencies, 99) * 1000:8.1f}ms"
+    )
+    if elapsed:
+        line += f" débit={len(latencies) / elapsed:8.1f} req/s"
+    if statuses:
+        line += " [" + ", ".join(f"{code}={count}" for code, count in sorted(statuses.items(), key=str)) + "]"
+    print(line)
+
+
+async def setup_account(client, secrets_count=20):
+    """
+    Crée un compte de test et quelques secrets, renvoie (email, password, token).
+    """
+    email = f"bench-{uuid.uuid4().hex[:8]}@example.com"
+    password = "bench-password"
+
+    await client.post("/auth/register", json={"email": email, "password": password})
+    response = await client.post("/auth/login", data={"username": email, "password": password})
+    response.raise_for_status()
+    token = response.json()["access_token"]
+
+    headers = {"Authorization": f"Bearer {token}"}
+    for i in range(secrets_count):
+        await client.post(
+            "/secrets/",
+            json={"title": f"secret {i}", "username": "bench", "password": "s3cret"},
+            headers=headers
+        )
+
+    return email, password, token
+
+
+async def worker(client, deadline, send, latencies, statuses):
+    """
+    Envoie des requêtes en boucle jusqu'à `deadline` et collecte les latences.
+    """
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            response = await send(client)
+            status = response.status_code
+        except httpx.HTTPError:
+            status = "error"
+        latencies.append(time.perf_counter() - start)
+        statuses[status] = statuses.get(status, 0) + 1
@@ -0,0 +1,69 @@
+"""
+Benchmark de concurrence : lectures de coffre (liste + détail) en parallèle.
+
+Mesure débit et latences quand N clients lisent leurs secrets en même temps.
+Pour comparer avant/après le passage à AsyncSession, lancer le script
+contre les deux versions de l'API (même machine, même base) :
+
+    git checkout <commit-avant> && uvicorn app.main:app --port 8000
+    python benchmarks/concurrent_reads.py --concurrency 1000 --duration 30
+
+    git checkout <commit-après> && uvicorn app.main:app --port 8000
+    python benchmarks/concurrent_reads.py --concurrency 1000 --duration 30
+
+Avec le stack synchrone, chaque requête en vol occupe un thread
+du threadpool AnyIO (40 par défaut) pendant toute l'attente DB :
+au-delà, les requêtes font la queue et la latence explose.
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from common import report, setup_account, worker
+
+
+async def main(args):
+    limits = httpx.Limits(max_connections=args.concurrency + 10)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60, limits=limits) as client:
+        _, _, token = await setup_account(client, secrets_count=args.secrets)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        listing = await client.get("/secrets/", headers=headers)
+        secret_ids = [secret["id"] for secret in listing.json()]
+
+        async def do_list(c):
+            return await c.get("/secrets/", headers=headers)
+
+        async def do_detail(c, _counter=[0]):
+            _counter[0] += 1
+            secret_id = secret_ids[_counter[0] % len(secret_ids)]
+            return await c.get(f"/secrets/{secret_id}", headers=headers)
+
+        list_latencies, list_statuses = [], {}
+        detail_latencies, detail_statuses = [], {}
+        deadline = time.perf_counter() + args.duration
+
+        half = args.concurrency // 2
+        tasks = [
+            worker(client, deadline, do_list, list_latencies, list_statuses)
+            for _ in range(half)
+        ] + [
+            worker(client, deadline, do_detail, detail_latencies, detail_statuses)
+            for _ in range(args.concurrency - half)
+        ]
+        await asyncio.gather(*tasks)
+
+    print(f"Concurrence : {args.concurrency} clients, durée : {args.duration}s")
+    report("GET /secrets", list_latencies, list_statuses, args.duration)
+    report("GET /{id}", detail_latencies, detail_statuses, args.duration)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--secrets", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,65 @@
+"""
+Benchmark GET conditionnel : polling de la liste et du détail
+avec et sans If-None-Match (comme un tableau de bord inactif).
+
+Mesure débit, latences et octets reçus par requête dans les deux modes.
+
+Usage (API démarrée) :
+    python benchmarks/conditional_get.py --base-url http://localhost:8000 \\
+        --secrets 100 --concurrency 20 --duration 15
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from common import report, setup_account, worker
+
+
+async def run(client, send, args):
+    latencies, statuses = [], {}
+    deadline = time.perf_counter() + args.duration
+    await asyncio.gather(*[
+        worker(client, deadline, send, latencies, statuses)
+        for _ in range(args.concurrency)
+    ])
+    return latencies, statuses
+
+
+async def main(args):
+    limits = httpx.Limits(max_connections=args.concurrency + 10)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60, limits=limits) as client:
+        _, _, token = await setup_account(client, secrets_count=args.secrets)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        listing = await client.get("/secrets/", headers=headers)
+        secret_id = listing.json()[0]["id"]
+        detail = await client.get(f"/secrets/{secret_id}", headers=headers)
+
+        for name, url, etag in [
+            ("liste", "/secrets/", listing.headers["ETag"]),
+            ("détail", f"/secrets/{secret_id}", detail.headers["ETag"])
+        ]:
+            for conditional in (False, True):
+                request_headers = {**headers, "If-None-Match": etag} if conditional else headers
+                received = []
+
+                async def send(c):
+                    response = await c.get(url, headers=request_headers)
+                    received.append(len(response.content))
+                    return response
+
+                latencies, statuses = await run(client, send, args)
+                label = f"{name} {'304' if conditional else 'plein'}"
+                report(label, latencies, statuses, args.duration)
+                print(f"{'':<12} {sum(received) / max(len(received), 1):.0f} octets/réponse")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--secrets", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=15)
+    asyncio.run(main(parser.parse_args()))
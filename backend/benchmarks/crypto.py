@@ -0,0 +1,68 @@
+"""
+Microbenchmark du chiffrement Fernet : appels unitaires vs API en lot.
+
+Mesure, pour chaque opération, le débit (ops/s) et le débit par cœur :
+- unitaire : boucle sur encrypt_secret / decrypt_secret
+- lot      : encrypt_many / decrypt_many avec 1, 2, 4... workers
+
+Aucune base ni API nécessaire, seulement SECRET_ENCRYPTION_KEY.
+
+Usage :
+    python benchmarks/crypto.py --items 100000 --size 32 --workers 1 2 4 8
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.core.crypto import (  # noqa: E402
+    CryptoPool,
+    _decrypt_chunk,
+    _encrypt_chunk,
+    decrypt_secret,
+    encrypt_secret
+)
+
+
+def show(name, count, elapsed, cores):
+    rate = count / elapsed
+    print(f"{name:<22} {rate:>12.0f} ops/s {rate / cores:>12.0f} ops/s/cœur")
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main(args):
+    values = [os.urandom(args.size // 2).hex() for _ in range(args.items)]
+    print(f"{args.items} éléments de {args.size} caractères, {os.cpu_count()} cœur(s)")
+
+    tokens, elapsed = timed(lambda: [encrypt_secret(value) for value in values])
+    show("unitaire encrypt", len(values), elapsed, 1)
+    _, elapsed = timed(lambda: [decrypt_secret(token) for token in tokens])
+    show("unitaire decrypt", len(tokens), elapsed, 1)
+
+    for workers in args.workers:
+        pool = CryptoPool(max_workers=workers, min_chunk=args.min_chunk)
+        try:
+            cores = min(workers, os.cpu_count() or 1)
+            _, elapsed = timed(lambda: pool.map(_encrypt_chunk, values))
+            show(f"lot encrypt x{workers}", len(values), elapsed, cores)
+            decrypted, elapsed = timed(lambda: pool.map(_decrypt_chunk, tokens))
+            show(f"lot decrypt x{workers}", len(tokens), elapsed, cores)
+            assert decrypted == values
+        finally:
+            pool.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--size", type=int, default=32)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--min-chunk", type=int, default=64)
+    main(parser.parse_args())
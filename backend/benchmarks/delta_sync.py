@@ -0,0 +1,79 @@
+"""
+Benchmark synchronisation : relire tout le coffre (GET /secrets paginé)
+vs ne lire que les changements (GET /secrets/changes?since=).
+
+Remplit un coffre de N secrets, modifie K secrets, puis mesure
+la durée et les octets reçus pour remettre un client à jour.
+
+Usage (API démarrée) :
+    python benchmarks/delta_sync.py --base-url http://localhost:8000 \\
+        --secrets 10000 --changes 10
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from common import setup_account
+
+
+async def full_sync(client, headers):
+    size, count, cursor = 0, 0, None
+    while True:
+        params = {"limit": 100, **({"cursor": cursor} if cursor else {})}
+        response = await client.get("/secrets/", params=params, headers=headers)
+        size += len(response.content)
+        count += len(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return count, size
+
+
+async def delta_sync(client, headers, since):
+    size, count = 0, 0
+    while True:
+        response = await client.get("/secrets/changes", params={"since": since}, headers=headers)
+        page = response.json()
+        size += len(response.content)
+        count += len(page["changes"]) + len(page["deleted"])
+        since = page["version"]
+        if not page["has_more"]:
+            return count, size, since
+
+
+async def main(args):
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=120) as client:
+        _, _, token = await setup_account(client, secrets_count=0)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        ids = []
+        for start in range(0, args.secrets, 1000):
+            items = [
+                {"title": f"secret {i}", "username": "bench", "password": "s3cret"}
+                for i in range(start, min(start + 1000, args.secrets))
+            ]
+            response = await client.post("/secrets/batch", json={"items": items}, headers=headers)
+            ids.extend(result["id"] for result in response.json())
+
+        _, _, since = await delta_sync(client, headers, 0)
+
+        await client.patch("/secrets/batch", json={"items": [
+            {"id": secret_id, "title": "modifié"} for secret_id in ids[:args.changes]
+        ]}, headers=headers)
+
+        start = time.perf_counter()
+        count, size = await full_sync(client, headers)
+        print(f"liste complète : {count} secrets, {size / 1024:.1f} Ko, {(time.perf_counter() - start) * 1000:.1f}ms")
+
+        start = time.perf_counter()
+        count, size, _ = await delta_sync(client, headers, since)
+        print(f"changements    : {count} secrets, {size / 1024:.1f} Ko, {(time.perf_counter() - start) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--secrets", type=int, default=10_000)
+    parser.add_argument("--changes", type=int, default=10)
+    asyncio.run(main(parser.parse_args()))
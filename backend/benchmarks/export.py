@@ -0,0 +1,82 @@
+"""
+Benchmark export : stream de tout le coffre via GET /secrets/export.
+
+Remplit un compte de test via /secrets/batch puis mesure le temps
+jusqu'au premier octet, la durée totale et le débit. Avec --server-pid,
+échantillonne la RSS du serveur pendant l'export (Linux, /proc) pour
+vérifier que la mémoire reste constante quelle que soit la taille du coffre.
+
+Usage (API démarrée) :
+    python benchmarks/export.py --base-url http://localhost:8000 \\
+        --secrets 100000 --format ndjson --server-pid $(pgrep -f uvicorn)
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from common import setup_account
+
+
+def rss_mb(pid):
+    with open(f"/proc/{pid}/status") as status:
+        for line in status:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+async def fill(client, headers, count, batch_size=1000):
+    for start in range(0, count, batch_size):
+        items = [
+            {"title": f"secret {i}", "username": "bench", "password": f"s3cret-{i}", "url": "https://example.com"}
+            for i in range(start, min(start + batch_size, count))
+        ]
+        response = await client.post("/secrets/batch", json={"items": items}, headers=headers)
+        response.raise_for_status()
+
+
+async def main(args):
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=600) as client:
+        _, _, token = await setup_account(client, secrets_count=0)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        start = time.perf_counter()
+        await fill(client, headers, args.secrets)
+        print(f"Remplissage : {args.secrets} secrets en {time.perf_counter() - start:.1f}s")
+
+        rss_before = rss_mb(args.server_pid) if args.server_pid else None
+        rss_peak = rss_before
+        first_byte = None
+        size = 0
+        lines = 0
+
+        start = time.perf_counter()
+        async with client.stream("GET", "/secrets/export", params={"format": args.format}, headers=headers) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_bytes():
+                if first_byte is None:
+                    first_byte = time.perf_counter() - start
+                size += len(chunk)
+                lines += chunk.count(b"\n")
+                if args.server_pid:
+                    rss_peak = max(rss_peak, rss_mb(args.server_pid))
+        elapsed = time.perf_counter() - start
+
+    print(
+        f"Export {args.format} : {lines} lignes, {size / 1024 / 1024:.1f} Mo, "
+        f"premier octet={first_byte * 1000:.1f}ms durée={elapsed:.2f}s "
+        f"débit={lines / elapsed:.0f} lignes/s"
+    )
+    if args.server_pid:
+        print(f"RSS serveur : avant={rss_before:.1f} Mo pic={rss_peak:.1f} Mo")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--secrets", type=int, default=100_000)
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--server-pid", type=int)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,74 @@
+"""
+Benchmark import : upload d'un gros CSV (format LastPass) sur /secrets/import.
+
+Génère le fichier sur disque, l'envoie en multipart puis lit le flux
+d'événements de progression. Avec --server-pid, échantillonne la RSS
+du serveur (Linux, /proc) : elle doit rester stable quelle que soit
+la taille du fichier.
+
+Usage (API démarrée) :
+    python benchmarks/import_csv.py --base-url http://localhost:8000 \\
+        --rows 100000 --server-pid $(pgrep -f uvicorn)
+"""
+import argparse
+import asyncio
+import csv
+import json
+import os
+import tempfile
+import time
+
+import httpx
+
+from common import setup_account
+from export import rss_mb
+
+
+def write_csv(path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["url", "username", "password", "totp", "extra", "name", "grouping", "fav"])
+        for i in range(rows):
+            writer.writerow([f"https://site-{i}.example.com", f"user{i}", f"s3cret-{i}", "", "", f"Site {i}", "", "0"])
+
+
+async def main(args):
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    os.close(fd)
+    try:
+        write_csv(path, args.rows)
+        print(f"Fichier : {args.rows} lignes, {os.path.getsize(path) / 1024 / 1024:.1f} Mo")
+
+        async with httpx.AsyncClient(base_url=args.base_url, timeout=600) as client:
+            _, _, token = await setup_account(client, secrets_count=0)
+            headers = {"Authorization": f"Bearer {token}"}
+
+            rss_before = rss_mb(args.server_pid) if args.server_pid else None
+            rss_peak = rss_before
+            last = None
+
+            start = time.perf_counter()
+            with open(path, "rb") as f:
+                files = {"file": ("lastpass.csv", f, "text/csv")}
+                async with client.stream("POST", "/secrets/import", files=files, headers=headers) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if line:
+                            last = json.loads(line)
+                        if args.server_pid:
+                            rss_peak = max(rss_peak, rss_mb(args.server_pid))
+            elapsed = time.perf_counter() - start
+
+        print(f"Import : {last} en {elapsed:.2f}s, débit={last['imported'] / elapsed:.0f} lignes/s")
+        if args.server_pid:
+            print(f"RSS serveur : avant={rss_before:.1f} Mo pic={rss_peak:.1f} Mo")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--server-pid", type=int)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,88 @@
+"""
+Microbenchmark des logs pendant une avalanche d'erreurs.
+
+Simule un stdout lent (pipe consommé au compte-gouttes) et mesure,
+par appel, la latence vue par le code appelant et le volume écrit :
+- print    : ancien comportement des routers (écriture synchrone)
+- logging  : logger.exception via la file (configure_logging)
+
+Aucune base ni API nécessaire.
+
+Usage :
+    python benchmarks/log_storm.py --errors 20000 --reader-delay 0.001
+"""
+import argparse
+import io
+import logging
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.core.log import configure_logging, logging_stats, shutdown_logging  # noqa: E402
+from common import percentile  # noqa: E402
+
+
+def slow_pipe(delay):
+    """
+    Pipe dont le lecteur lit 4 Ko puis dort `delay` secondes :
+    une fois le tampon du noyau plein, les écritures bloquent.
+    """
+    read_fd, write_fd = os.pipe()
+    written = {"bytes": 0}
+
+    def reader():
+        while True:
+            chunk = os.read(read_fd, 4096)
+            if not chunk:
+                return
+            written["bytes"] += len(chunk)
+            time.sleep(delay)
+
+    thread = threading.Thread(target=reader, daemon=True)
+    thread.start()
+    return io.TextIOWrapper(os.fdopen(write_fd, "wb", buffering=0), write_through=True), thread, written
+
+
+def storm(name, count, emit):
+    latencies = []
+    for i in range(count):
+        try:
+            raise ConnectionError("connection lost")
+        except ConnectionError as e:
+            start = time.perf_counter()
+            emit(e)
+            latencies.append(time.perf_counter() - start)
+    print(
+        f"{name:<8} n={count:<7} "
+        f"p50={percentile(latencies, 50) * 1e6:8.1f}µs "
+        f"p99={percentile(latencies, 99) * 1e6:8.1f}µs "
+        f"max={max(latencies) * 1000:8.1f}ms"
+    )
+
+
+def main(args):
+    stream, thread, written = slow_pipe(args.reader_delay)
+    storm("print", args.errors, lambda e: print(f"Database error in list_secrets: {str(e)}", file=stream))
+    stream.close()
+    thread.join()
+    print(f"{'':<8} écrit={written['bytes'] / 1024:.0f} Ko")
+
+    stream, thread, written = slow_pipe(args.reader_delay)
+    configure_logging(stream=stream)
+    logger = logging.getLogger("app.routers.secrets")
+    storm("logging", args.errors, lambda e: logger.exception("Database error in list_secrets"))
+    stats = logging_stats()
+    shutdown_logging()
+    stream.close()
+    thread.join()
+    print(f"{'':<8} écrit={written['bytes'] / 1024:.0f} Ko supprimés={stats['suppressed']} abandonnés={stats['dropped']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--errors", type=int, default=20_000)
+    parser.add_argument("--reader-delay", type=float, default=0.001, help="pause du lecteur par bloc de 4 Ko (s)")
+    main(parser.parse_args())
@@ -0,0 +1,99 @@
+"""
+Benchmark : latence des logins légitimes pendant une attaque
+par credential stuffing sur POST /auth/login.
+
+- légitimes : quelques utilisateurs, chacun depuis sa propre IP,
+  se connectent à intervalle régulier avec le bon mot de passe
+- attaque : N workers en boucle depuis quelques IP, avec de mauvais
+  mots de passe, sur des emails inconnus ou (--target-ratio) sur les
+  comptes légitimes eux-mêmes
+
+Les IP sont simulées via X-Forwarded-For : démarrer l'API avec
+    uvicorn app.main:app --proxy-headers --forwarded-allow-ips "*"
+et comparer avec les limites désactivées (LOGIN_RATE_LIMIT_*_BURST=0).
+
+Usage :
+    python benchmarks/login_attack.py --base-url http://localhost:8000 \\
+        --duration 20 --users 3 --attackers 30 --attacker-ips 4
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+
+import httpx
+
+from common import report, worker
+
+
+async def legit_user(client, deadline, email, password, ip, interval, latencies, statuses):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        response = await client.post(
+            "/auth/login",
+            data={"username": email, "password": password},
+            headers={"X-Forwarded-For": ip}
+        )
+        latencies.append(time.perf_counter() - start)
+        statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        await asyncio.sleep(max(0.0, interval - (time.perf_counter() - start)))
+
+
+async def phase(client, args, accounts, attack):
+    deadline = time.perf_counter() + args.duration
+    legit_latencies, legit_statuses = [], {}
+    attack_latencies, attack_statuses = [], {}
+
+    async def do_attack(c):
+        targeted = random.random() < args.target_ratio
+        email = random.choice(accounts)[0] if targeted else f"{uuid.uuid4().hex[:8]}@example.com"
+        return await c.post(
+            "/auth/login",
+            data={"username": email, "password": "hunter2"},
+            headers={"X-Forwarded-For": f"198.51.100.{random.randrange(args.attacker_ips)}"}
+        )
+
+    tasks = [
+        legit_user(client, deadline, email, password, f"203.0.113.{i}", args.interval, legit_latencies, legit_statuses)
+        for i, (email, password) in enumerate(accounts)
+    ]
+    if attack:
+        tasks += [
+            worker(client, deadline, do_attack, attack_latencies, attack_statuses)
+            for _ in range(args.attackers)
+        ]
+    await asyncio.gather(*tasks)
+
+    print(f"--- {'avec attaque' if attack else 'sans attaque'} ({args.duration}s)")
+    report("légitimes", legit_latencies, legit_statuses, args.duration)
+    if attack:
+        report("attaque", attack_latencies, attack_statuses, args.duration)
+
+
+async def main(args):
+    limits = httpx.Limits(max_connections=args.users + args.attackers + 10)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60, limits=limits) as client:
+        accounts = []
+        for _ in range(args.users):
+            email, password = f"bench-{uuid.uuid4().hex[:8]}@example.com", "bench-password"
+            await client.post("/auth/register", json={"email": email, "password": password})
+            accounts.append((email, password))
+
+        await phase(client, args, accounts, attack=False)
+        await phase(client, args, accounts, attack=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--users", type=int, default=3)
+    parser.add_argument("--interval", type=float, default=15, help="secondes entre deux logins d'un utilisateur")
+    parser.add_argument("--attackers", type=int, default=30)
+    parser.add_argument("--attacker-ips", type=int, default=4)
+    parser.add_argument(
+        "--target-ratio", type=float, default=0.0,
+        help="part des tentatives visant les comptes légitimes (0 = stuffing sur une liste tierce)"
+    )
+    asyncio.run(main(parser.parse_args()))
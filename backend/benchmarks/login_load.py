@@ -0,0 +1,57 @@
+"""
+Benchmark de charge : logins (bcrypt) et lectures /secrets en parallèle.
+
+Simule un "pic de logins" et mesure en même temps la latence
+des lectures de secrets, pour vérifier que le hash bcrypt
+ne bloque plus le reste de l'API.
+
+Usage (API démarrée, ex. docker compose up) :
+    python benchmarks/login_load.py --base-url http://localhost:8000 \\
+        --duration 30 --login-concurrency 50 --read-concurrency 20
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from common import report, setup_account, worker
+
+
+async def main(args):
+    limits = httpx.Limits(max_connections=args.login_concurrency + args.read_concurrency + 10)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=30, limits=limits) as client:
+        email, password, token = await setup_account(client)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        async def do_login(c):
+            return await c.post("/auth/login", data={"username": email, "password": password})
+
+        async def do_read(c):
+            return await c.get("/secrets/", headers=headers)
+
+        login_latencies, login_statuses = [], {}
+        read_latencies, read_statuses = [], {}
+        deadline = time.perf_counter() + args.duration
+
+        tasks = [
+            worker(client, deadline, do_login, login_latencies, login_statuses)
+            for _ in range(args.login_concurrency)
+        ] + [
+            worker(client, deadline, do_read, read_latencies, read_statuses)
+            for _ in range(args.read_concurrency)
+        ]
+        await asyncio.gather(*tasks)
+
+    print(f"Durée : {args.duration}s")
+    report("login", login_latencies, login_statuses, args.duration)
+    report("/secrets", read_latencies, read_statuses, args.duration)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--duration", type=float, default=30)
+    parser.add_argument("--login-concurrency", type=int, default=50)
+    parser.add_argument("--read-concurrency", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
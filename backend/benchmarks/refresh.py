@@ -0,0 +1,64 @@
+"""
+Benchmark : renouvellement de session par mot de passe (POST /auth/login,
+bcrypt) vs par refresh token (POST /auth/refresh, sans bcrypt).
+
+Chaque worker "refresh" garde sa propre chaîne de refresh tokens
+(rotation à chaque appel), comme un client d'automatisation.
+
+Usage (API démarrée) :
+    python benchmarks/refresh.py --base-url http://localhost:8000 \\
+        --duration 20 --concurrency 20
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from common import report, worker
+
+
+async def main(args):
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=30) as client:
+        email = f"bench-refresh-{int(time.time())}@example.com"
+        password = "bench-password"
+        await client.post("/auth/register", json={"email": email, "password": password})
+
+        async def do_login(c):
+            return await c.post("/auth/login", data={"username": email, "password": password})
+
+        latencies, statuses = [], {}
+        deadline = time.perf_counter() + args.duration
+        await asyncio.gather(*(
+            worker(client, deadline, do_login, latencies, statuses)
+            for _ in range(args.concurrency)
+        ))
+        report("login", latencies, statuses, args.duration)
+
+        def refresher(refresh_token):
+            state = {"token": refresh_token}
+
+            async def do_refresh(c):
+                response = await c.post("/auth/refresh", json={"refresh_token": state["token"]})
+                if response.status_code == 200:
+                    state["token"] = response.json()["refresh_token"]
+                return response
+
+            return do_refresh
+
+        chains = [(await do_login(client)).json()["refresh_token"] for _ in range(args.concurrency)]
+        latencies, statuses = [], {}
+        deadline = time.perf_counter() + args.duration
+        await asyncio.gather(*(
+            worker(client, deadline, refresher(token), latencies, statuses)
+            for token in chains
+        ))
+        report("refresh", latencies, statuses, args.duration)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--duration", type=float, default=20)
+    parser.add_argument("--concurrency", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,132 @@
+"""
+Benchmark de la recherche : ILIKE '%terme%' vs /secrets/search (pg_trgm).
+
+Peuple un coffre de N secrets pour un utilisateur dédié (10k, 100k, 1M)
+directement en SQL, puis chronomètre les requêtes des routers :
+
+- ilike sans index : filtre `search` historique, index trigram retirés
+  (DROP INDEX dans une transaction annulée ensuite → base inchangée,
+  mais verrou exclusif sur secrets pendant la mesure : base de bench uniquement)
+- ilike + trgm     : même filtre, servi par les index GIN
+- search           : /secrets/search (préfixe + similarité, classé)
+
+Usage (variables d'environnement de la base de bench) :
+    python benchmarks/search.py --sizes 10000 100000 1000000 --runs 20
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+
+from sqlalchemy import text
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from app.core.config import settings  # noqa: E402
+from app.db.queries import list_user_secrets_query, search_user_secrets_query  # noqa: E402
+from app.db.session import dispose_engine, get_engine  # noqa: E402
+from app.models.user import User  # noqa: E402,F401 - nécessaire pour le mapper Secret
+
+from common import percentile  # noqa: E402
+
+
+# Vrais noms de services, présents dans ~0,1 % des secrets ;
+# les autres titres sont des noms générés à partir de syllabes (~64k distincts)
+WORDS = [
+    "github", "gitlab", "amazon", "google", "slack", "jira", "confluence", "postgres",
+    "stripe", "paypal", "netflix", "spotify", "dropbox", "notion", "figma", "vercel",
+]
+SYLLABLES = [
+    "ka", "lo", "mi", "ne", "ra", "to", "vu", "zi", "bel", "cor", "dan", "fex", "gol", "hip",
+    "jun", "kel", "lum", "mor", "nix", "pol", "qua", "rin", "sol", "tek", "ux", "vor", "wex",
+    "yal", "zen", "bri", "cla", "dro", "fli", "gra", "plo", "sta", "tri", "vel", "xan", "yor",
+]
+TERMS = ["git", "githbu", "amazn", "post", "notion", "korvel"]
+
+
+async def seed(conn, size):
+    user_id = uuid.uuid4()
+    await conn.execute(text(
+        "INSERT INTO users (id, email, password_hash, created_at) "
+        "VALUES (:id, :email, 'x', now())"
+    ), {"id": user_id, "email": f"bench-search-{user_id}@example.com"})
+    await conn.execute(text(
+        """
+        INSERT INTO secrets (id, title, username, password, created_at, updated_at, user_id)
+        SELECT gen_random_uuid(),
+               CASE WHEN g % 1000 = 0
+                    THEN (CAST(:words AS text[]))[1 + (g / 1000) % array_length(CAST(:words AS text[]), 1)]
+                    ELSE (CAST(:syl AS text[]))[1 + g % 40]
+                      || (CAST(:syl AS text[]))[1 + (g / 40) % 40]
+                      || (CAST(:syl AS text[]))[1 + (g / 1600) % 40]
+               END || ' ' || g,
+               'user' || (g % 997),
+               'x', now() - g * interval '1 second', now(), :user_id
+        FROM generate_series(1, :size) AS g
+        """
+    ), {"words": WORDS, "syl": SYLLABLES, "size": size, "user_id": user_id})
+    await conn.execute(text("ANALYZE secrets"))
+    return user_id
+
+
+async def timed(conn, statement, runs):
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await conn.execute(statement)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+async def bench_size(size, runs):
+    async with get_engine().connect() as conn:
+        user_id = await seed(conn, size)
+        await conn.commit()
+
+        await conn.execute(
+            text("SELECT set_config('pg_trgm.word_similarity_threshold', :t, false)"),
+            {"t": str(settings.SEARCH_SIMILARITY_THRESHOLD)}
+        )
+
+        results = {"ilike sans index": [], "ilike + trgm": [], "search": []}
+        for term in TERMS:
+            results["ilike + trgm"] += await timed(
+                conn, list_user_secrets_query(user_id, search=term, limit=100), runs
+            )
+            results["search"] += await timed(
+                conn, search_user_secrets_query(user_id, term, limit=20), runs
+            )
+        await conn.commit()
+
+        # Index trigram retirés le temps de la mesure (annulé par rollback)
+        await conn.execute(text("DROP INDEX ix_secrets_search_trgm"))
+        for term in TERMS:
+            results["ilike sans index"] += await timed(
+                conn, list_user_secrets_query(user_id, search=term, limit=100), runs
+            )
+        await conn.rollback()
+
+        await conn.execute(text("DELETE FROM users WHERE id = :id"), {"id": user_id})
+        await conn.commit()
+
+    print(f"\n{size:>9} secrets")
+    for name, latencies in results.items():
+        print(
+            f"  {name:<18} p50={percentile(latencies, 50) * 1000:8.2f}ms "
+            f"p99={percentile(latencies, 99) * 1000:8.2f}ms"
+        )
+
+
+async def main(args):
+    for size in args.sizes:
+        await bench_size(size, args.runs)
+    await dispose_engine()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--runs", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
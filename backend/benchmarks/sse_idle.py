@@ -0,0 +1,84 @@
+"""
+Benchmark SSE : N connexions GET /secrets/events inactives sur un worker.
+
+Ouvre N flux SSE (connexions TCP brutes, sans client HTTP par flux),
+mesure le RSS du serveur avant / après, puis le délai entre une écriture
+(POST /secrets/) et la réception de l'événement par tous les abonnés.
+
+Usage (API démarrée, --pid pour mesurer la mémoire du worker) :
+    python benchmarks/sse_idle.py --host 127.0.0.1 --port 8000 \\
+        --connections 2000 --pid 12345
+"""
+import argparse
+import asyncio
+import time
+
+import httpx
+
+from common import percentile, setup_account
+from export import rss_mb
+
+
+async def open_stream(host, port, token):
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(
+        f"GET /secrets/events HTTP/1.1\r\nHost: {host}\r\n"
+        f"Authorization: Bearer {token}\r\nAccept: text/event-stream\r\n\r\n".encode()
+    )
+    await writer.drain()
+    # En-têtes + premier bloc "retry:"
+    await reader.readuntil(b"\r\n\r\n")
+    await reader.readuntil(b"\n\n")
+    return reader, writer
+
+
+async def wait_event(reader):
+    while True:
+        chunk = await reader.readuntil(b"\n\n")
+        if b"event: change" in chunk:
+            return time.perf_counter()
+
+
+async def main(args):
+    base_url = f"http://{args.host}:{args.port}"
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+        _, _, token = await setup_account(client, secrets_count=0)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        before = rss_mb(args.pid) if args.pid else 0.0
+        streams = []
+        for start in range(0, args.connections, 200):
+            batch = range(start, min(start + 200, args.connections))
+            streams += await asyncio.gather(*(open_stream(args.host, args.port, token) for _ in batch))
+        await asyncio.sleep(1)
+        after = rss_mb(args.pid) if args.pid else 0.0
+
+        print(f"Connexions SSE ouvertes : {len(streams)}")
+        if args.pid:
+            print(f"RSS serveur : {before:.1f} MB -> {after:.1f} MB "
+                  f"({(after - before) * 1024 / len(streams):.1f} KB / connexion)")
+
+        waiters = [asyncio.create_task(wait_event(reader)) for reader, _ in streams]
+        start = time.perf_counter()
+        response = await client.post(
+            "/secrets/",
+            json={"title": "sse", "username": "bench", "password": "s3cret"},
+            headers=headers
+        )
+        response.raise_for_status()
+        received = [t - start for t in await asyncio.gather(*waiters)]
+
+        print(f"Diffusion d'une écriture : p50={percentile(received, 50) * 1000:.1f}ms "
+              f"p99={percentile(received, 99) * 1000:.1f}ms max={max(received) * 1000:.1f}ms")
+
+        for _, writer in streams:
+            writer.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--connections", type=int, default=2000)
+    parser.add_argument("--pid", type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,94 @@
+"""
+Benchmark du démarrage à froid d'un worker (autoscaling, redémarrages).
+
+Pour chaque essai, dans un processus neuf :
+- import : durée de `import app.main` seul
+- vivant : lancement d'uvicorn → première réponse 200 de /health/live
+- prêt   : lancement d'uvicorn → première réponse 200 de /health/ready
+           (base joignable, préchauffage terminé : le worker peut recevoir
+           du trafic)
+
+La base doit être joignable (mêmes variables d'environnement que l'API).
+
+Usage :
+    python benchmarks/startup.py --runs 10
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+IMPORT_SNIPPET = (
+    "import time; start = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def measure_import() -> float:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+    return float(output.stdout.strip().splitlines()[-1])
+
+
+def _wait_for(client, path, start, timeout):
+    while True:
+        if time.perf_counter() - start > timeout:
+            raise RuntimeError(f"{path} toujours indisponible après {timeout}s")
+        try:
+            if client.get(path).status_code == 200:
+                return time.perf_counter() - start
+        except httpx.TransportError:
+            pass
+        time.sleep(0.005)
+
+
+def measure_boot(port: int, timeout: float = 30) -> tuple[float, float]:
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}") as client:
+            live = _wait_for(client, "/health/live", start, timeout)
+            ready = _wait_for(client, "/health/ready", start, timeout)
+            return live, ready
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def show(name, values):
+    print(
+        f"{name:<10} n={len(values):<3} "
+        f"p50={statistics.median(values) * 1000:8.1f}ms "
+        f"max={max(values) * 1000:8.1f}ms"
+    )
+
+
+def main(args):
+    imports, lives, readies = [], [], []
+    for _ in range(args.runs):
+        imports.append(measure_import())
+        live, ready = measure_boot(args.port)
+        lives.append(live)
+        readies.append(ready)
+
+    show("import", imports)
+    show("vivant", lives)
+    show("prêt", readies)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--port", type=int, default=8031)
+    main(parser.parse_args())
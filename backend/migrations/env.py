@@ -0,0 +1,65 @@
+import asyncio
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.db.base import Base
+from app.db.session import DATABASE_URL
+from app.models.user import User  # noqa - nécessaire pour l'autogenerate
+from app.models.secret import Secret  # noqa - nécessaire pour l'autogenerate
+from app.models.key_rotation import KeyRotationCheckpoint  # noqa - nécessaire pour l'autogenerate
+from app.models.secret_tombstone import SecretTombstone  # noqa - nécessaire pour l'autogenerate
+from app.models.auth_session import AuthSession  # noqa - nécessaire pour l'autogenerate
+
+
+config = context.config
+
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+
+def run_migrations_offline() -> None:
+    """
+    Génère le SQL sans se connecter (alembic upgrade head --sql).
+    """
+    context.configure(
+        url=DATABASE_URL,
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def do_run_migrations(connection) -> None:
+    context.configure(connection=connection, target_metadata=target_metadata)
+
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+async def run_migrations_online() -> None:
+    # Pas de statement_timeout pour les migrations :
+    # un CREATE INDEX CONCURRENTLY sur une grosse table peut durer longtemps
+    connectable = create_async_engine(
+        DATABASE_URL,
+        poolclass=NullPool,
+        connect_args={"server_settings": {"statement_timeout": "0"}}
+    )
+
+    async with connectable.connect() as connection:
+        await connection.run_sync(do_run_migrations)
+
+    await connectable.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    asyncio.run(run_migrations_online())
@@ -0,0 +1,57 @@
+"""Index composite (user_id, created_at DESC, id DESC) sur secrets
+
+Sert toutes les requêtes par utilisateur du router secrets
+(liste paginée par curseur, lecture, mise à jour, suppression).
+Créé en CONCURRENTLY : pas de verrou bloquant les écritures sur une base en production.
+
+Revision ID: 0002_secrets_user_created_index
+Revises: 0001_initial_schema
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0002_secrets_user_created_index"
+down_revision = "0001_initial_schema"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "ix_secrets_user_id_created_at_id"
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY est interdit dans une transaction
+    with op.get_context().autocommit_block():
+        # Un build CONCURRENTLY interrompu laisse un index INVALID : on le supprime
+        op.execute(
+            f"""
+            DO $$
+            BEGIN
+                IF EXISTS (
+                    SELECT 1 FROM pg_index i
+                    JOIN pg_class c ON c.oid = i.indexrelid
+                    WHERE c.relname = '{INDEX_NAME}' AND NOT i.indisvalid
+                ) THEN
+                    EXECUTE 'DROP INDEX {INDEX_NAME}';
+                END IF;
+            END $$;
+            """
+        )
+        op.create_index(
+            INDEX_NAME,
+            "secrets",
+            ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            INDEX_NAME,
+            table_name="secrets",
+            postgresql_concurrently=True,
+            if_exists=True
+        )
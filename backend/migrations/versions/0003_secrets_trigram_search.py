@@ -0,0 +1,59 @@
+"""Recherche floue : extensions pg_trgm / btree_gin et index GIN de recherche
+
+Un seul index GIN (user_id, title || ' ' || username) sert à la fois
+/secrets/search (similarité par mot) et le filtre ILIKE '%terme%'
+de la liste des secrets, limité aux secrets de l'utilisateur.
+
+Revision ID: 0003_secrets_trigram_search
+Revises: 0002_secrets_user_created_index
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+
+revision = "0003_secrets_trigram_search"
+down_revision = "0002_secrets_user_created_index"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "ix_secrets_search_trgm"
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gin")
+
+    # CREATE INDEX CONCURRENTLY est interdit dans une transaction
+    with op.get_context().autocommit_block():
+        # Un build CONCURRENTLY interrompu laisse un index INVALID : on le supprime
+        op.execute(
+            f"""
+            DO $$
+            BEGIN
+                IF EXISTS (
+                    SELECT 1 FROM pg_index i
+                    JOIN pg_class c ON c.oid = i.indexrelid
+                    WHERE c.relname = '{INDEX_NAME}' AND NOT i.indisvalid
+                ) THEN
+                    EXECUTE 'DROP INDEX {INDEX_NAME}';
+                END IF;
+            END $$;
+            """
+        )
+        op.execute(
+            f"""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS {INDEX_NAME}
+            ON secrets USING gin (user_id, (title || ' ' || username) gin_trgm_ops)
+            """
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            INDEX_NAME,
+            table_name="secrets",
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+    # Les extensions sont laissées en place (peuvent servir ailleurs)
@@ -0,0 +1,32 @@
+"""Rotation des clés de chiffrement : table de checkpoints du re-chiffrement
+
+Revision ID: 0004_key_rotation_checkpoints
+Revises: 0003_secrets_trigram_search
+Create Date: 2026-10-17
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0004_key_rotation_checkpoints"
+down_revision = "0003_secrets_trigram_search"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "key_rotation_checkpoints",
+        sa.Column("key_fingerprint", sa.String(length=16), nullable=False),
+        sa.Column("last_secret_id", postgresql.UUID(as_uuid=True), nullable=True),
+        sa.Column("rewritten", sa.BigInteger(), nullable=False),
+        sa.Column("unreadable", sa.BigInteger(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("key_fingerprint"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("key_rotation_checkpoints")
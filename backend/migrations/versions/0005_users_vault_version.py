@@ -0,0 +1,26 @@
+"""ETag : version du coffre par utilisateur
+
+Revision ID: 0005_users_vault_version
+Revises: 0004_key_rotation_checkpoints
+Create Date: 2026-10-17
+"""
+import sqlalchemy as sa
+from alembic import op
+
+
+revision = "0005_users_vault_version"
+down_revision = "0004_key_rotation_checkpoints"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Valeur par défaut constante : pas de réécriture de la table (PostgreSQL 11+)
+    op.add_column(
+        "users",
+        sa.Column("vault_version", sa.BigInteger(), server_default="0", nullable=False)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("users", "vault_version")
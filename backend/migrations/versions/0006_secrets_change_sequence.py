@@ -0,0 +1,161 @@
+"""Synchronisation incrémentale : version par secret et table des suppressions
+
+- secrets.version : numéro de la dernière modification, tiré de users.vault_version
+- secret_tombstones : secrets supprimés (id, version de la suppression)
+
+Les secrets existants reçoivent des versions distinctes par utilisateur,
+à la suite de la version courante de leur coffre. Le backfill tourne hors
+de la transaction de migration, par lots de BACKFILL_BATCH_USERS
+utilisateurs (une transaction courte par lot) : les verrous sur users et
+secrets ne sont tenus que le temps d'un lot. Il est rejouable (seuls les
+secrets encore à la version 0 sont traités), comme le reste de la
+migration : une exécution interrompue se relance telle quelle.
+
+Revision ID: 0006_secrets_change_sequence
+Revises: 0005_users_vault_version
+Create Date: 2026-10-17
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+
+revision = "0006_secrets_change_sequence"
+down_revision = "0005_users_vault_version"
+branch_labels = None
+depends_on = None
+
+INDEX_NAME = "ix_secrets_user_id_version"
+
+# Utilisateurs traités par transaction du backfill
+BACKFILL_BATCH_USERS = 500
+
+NIL_UUID = "00000000-0000-0000-0000-000000000000"
+
+
+def backfill_versions() -> None:
+    """
+    Versions vault_version + 1..n pour les secrets d'un lot d'utilisateurs,
+    puis avance du compteur. Chaque lot est un bloc DO (une transaction) qui
+    verrouille les lignes users avant celles de secrets, dans le même ordre
+    que les écritures de l'API.
+    """
+    if op.get_context().as_sql:
+        # alembic upgrade --sql : les bornes des lots sont lues en base
+        op.execute("-- backfill de secrets.version : lancer la migration en ligne")
+        return
+
+    bind = op.get_bind()
+    last_id = NIL_UUID
+    while True:
+        upper_id = bind.execute(
+            sa.text(
+                """
+                SELECT id::text FROM (
+                    SELECT id FROM users WHERE id > CAST(:last_id AS uuid)
+                    ORDER BY id LIMIT :batch
+                ) AS b
+                ORDER BY id DESC LIMIT 1
+                """
+            ),
+            {"last_id": last_id, "batch": BACKFILL_BATCH_USERS}
+        ).scalar()
+        if upper_id is None:
+            return
+
+        # Bornes lues en base (UUID) : pas de paramètre possible dans un DO
+        users_in_batch = f"u.id > '{last_id}'::uuid AND u.id <= '{upper_id}'::uuid"
+        op.execute(
+            f"""
+            DO $$
+            BEGIN
+                PERFORM 1 FROM users u WHERE {users_in_batch} ORDER BY u.id FOR UPDATE;
+
+                UPDATE secrets s
+                SET version = u.vault_version + n.rank
+                FROM (
+                    SELECT s2.id, row_number() OVER (PARTITION BY s2.user_id ORDER BY s2.created_at, s2.id) AS rank
+                    FROM secrets s2 JOIN users u ON u.id = s2.user_id
+                    WHERE {users_in_batch} AND s2.version = 0
+                ) AS n, users u
+                WHERE n.id = s.id AND u.id = s.user_id;
+
+                UPDATE users u
+                SET vault_version = m.version
+                FROM (
+                    SELECT s3.user_id, max(s3.version) AS version
+                    FROM secrets s3 JOIN users u ON u.id = s3.user_id
+                    WHERE {users_in_batch}
+                    GROUP BY s3.user_id
+                ) AS m
+                WHERE m.user_id = u.id AND m.version > u.vault_version;
+            END $$;
+            """
+        )
+        last_id = upper_id
+
+
+def upgrade() -> None:
+    op.add_column(
+        "secrets",
+        sa.Column("version", sa.BigInteger(), server_default="0", nullable=False),
+        if_not_exists=True
+    )
+
+    op.create_table(
+        "secret_tombstones",
+        sa.Column("secret_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("user_id", postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("secret_id"),
+        if_not_exists=True
+    )
+    op.create_index(
+        "ix_secret_tombstones_user_id_version",
+        "secret_tombstones",
+        ["user_id", "version"],
+        if_not_exists=True
+    )
+
+    # CREATE INDEX CONCURRENTLY est interdit dans une transaction ;
+    # le backfill, lui, valide chaque lot séparément
+    with op.get_context().autocommit_block():
+        backfill_versions()
+
+        # Un build CONCURRENTLY interrompu laisse un index INVALID : on le supprime
+        op.execute(
+            f"""
+            DO $$
+            BEGIN
+                IF EXISTS (
+                    SELECT 1 FROM pg_index i
+                    JOIN pg_class c ON c.oid = i.indexrelid
+                    WHERE c.relname = '{INDEX_NAME}' AND NOT i.indisvalid
+                ) THEN
+                    EXECUTE 'DROP INDEX {INDEX_NAME}';
+                END IF;
+            END $$;
+            """
+        )
+        op.create_index(
+            INDEX_NAME,
+            "secrets",
+            ["user_id", "version"],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            INDEX_NAME,
+            table_name="secrets",
+            postgresql_concurrently=True,
+            if_exists=True
+        )
+    op.drop_index("ix_secret_tombstones_user_id_version", table_name="secret_tombstones")
+    op.drop_table("secret_tombstones")
+    op.drop_column("secrets", "version")
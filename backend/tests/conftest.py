@@ -1,24 +1,75 @@
+import asyncio
+import uuid
+
 import pytest
 from fastapi.testclient import TestClient
 
 from app.main import app
+from app.core.circuit_breaker import db_breaker
+from app.core.events import InMemoryChangeBroker, set_change_broker
+from app.core.health import database_probe
+from app.core.rate_limit import InMemoryRateLimiter, set_rate_limiter_backend
 from app.db.session import get_db
 from app.db.session_test import get_db_test, engine_test
 from app.db.base import Base
 
 
+async def _create_schema():
+    async with engine_test.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def _drop_schema():
+    async with engine_test.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+
+
 @pytest.fixture(scope="session", autouse=True)
 def setup_test_db():
-    Base.metadata.create_all(bind=engine_test)
+    asyncio.run(_create_schema())
     yield
-    Base.metadata.drop_all(bind=engine_test)
+    asyncio.run(_drop_schema())
 
 
 @pytest.fixture()
 def client():
     app.dependency_overrides[get_db] = get_db_test
+    # Notifications de changements locales au processus de test
+    set_change_broker(InMemoryChangeBroker())
+    # Seaux de limitation neufs pour chaque test
+    set_rate_limiter_backend(InMemoryRateLimiter())
+    # Disjoncteur de la base fermé et sonde de disponibilité sans cache
+    db_breaker.reset()
+    database_probe.clear()
 
     with TestClient(app) as client:
         yield client
 
     app.dependency_overrides.clear()
+
+
+@pytest.fixture()
+def auth_headers(client):
+    """
+    Crée un utilisateur unique et renvoie le header Authorization associé.
+    """
+    email = f"user-{uuid.uuid4().hex[:8]}@example.com"
+    client.post("/auth/register", json={"email": email, "password": "password123"})
+    response = client.post("/auth/login", data={"username": email, "password": "password123"})
+
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture()
+def admin_headers(client, monkeypatch):
+    """
+    Crée un utilisateur listé dans ADMIN_EMAILS et renvoie son header Authorization.
+    """
+    from app.core.config import settings
+
+    email = f"admin-{uuid.uuid4().hex[:8]}@example.com"
+    monkeypatch.setattr(settings, "ADMIN_EMAILS", email)
+    client.post("/auth/register", json={"email": email, "password": "password123"})
+    response = client.post("/auth/login", data={"username": email, "password": "password123"})
+
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
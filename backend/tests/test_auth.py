@@ -107,4 +107,79 @@ def test_get_current_user_without_token(client):
     """Test que /auth/me échoue sans token"""
     response = client.get("/auth/me")
     
-    assert response.status_code == 401  # Forbidden (pas de token)
\ No newline at end of file
+    assert response.status_code == 401  # Forbidden (pas de token)
+
+def test_login_hashing_pool_saturated(client, monkeypatch):
+    """Test que le login est délesté (503 + Retry-After) si le pool de hash est plein"""
+    from app.core.hashing import hashing_pool
+
+    monkeypatch.setattr(hashing_pool, "max_workers", 0)
+    monkeypatch.setattr(hashing_pool, "max_queue", 0)
+
+    response = client.post(
+        "/auth/login",
+        data={"username": "test@example.com", "password": "password123"}
+    )
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(hashing_pool.retry_after)
+
+
+def _login_tokens(client, email):
+    client.post("/auth/register", json={"email": email, "password": "password123"})
+    response = client.post("/auth/login", data={"username": email, "password": "password123"})
+    return response.json()
+
+
+def test_refresh_rotates_without_bcrypt(client, monkeypatch):
+    """Test que /auth/refresh renvoie une nouvelle paire de tokens sans bcrypt"""
+    from app.routers import auth
+
+    tokens = _login_tokens(client, "refresh@example.com")
+    assert tokens["refresh_token"]
+
+    async def no_bcrypt(*args, **kwargs):
+        raise AssertionError("bcrypt appelé pendant le refresh")
+
+    monkeypatch.setattr(auth, "verify_and_rehash_async", no_bcrypt)
+    monkeypatch.setattr(auth, "hash_password_async", no_bcrypt)
+
+    response = client.post("/auth/refresh", json={"refresh_token": tokens["refresh_token"]})
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["refresh_token"] != tokens["refresh_token"]
+    me = client.get("/auth/me", headers={"Authorization": f"Bearer {data['access_token']}"})
+    assert me.json()["email"] == "refresh@example.com"
+
+
+def test_refresh_reuse_revokes_family(client):
+    """Test qu'un refresh token réutilisé révoque toute la famille"""
+    first = _login_tokens(client, "reuse@example.com")["refresh_token"]
+    second = client.post("/auth/refresh", json={"refresh_token": first}).json()["refresh_token"]
+
+    # Rejeu de l'ancien token (vol probable)
+    reused = client.post("/auth/refresh", json={"refresh_token": first})
+    assert reused.status_code == 401
+
+    # Le token légitime le plus récent est révoqué lui aussi
+    response = client.post("/auth/refresh", json={"refresh_token": second})
+    assert response.status_code == 401
+
+
+def test_logout_revokes_refresh_token(client):
+    """Test que /auth/logout rend le refresh token inutilisable"""
+    refresh_token = _login_tokens(client, "logout@example.com")["refresh_token"]
+
+    response = client.post("/auth/logout", json={"refresh_token": refresh_token})
+    assert response.status_code == 204
+
+    response = client.post("/auth/refresh", json={"refresh_token": refresh_token})
+    assert response.status_code == 401
+
+
+def test_refresh_unknown_token(client):
+    """Test qu'un refresh token inconnu est refusé"""
+    response = client.post("/auth/refresh", json={"refresh_token": "not-a-token"})
+
+    assert response.status_code == 401
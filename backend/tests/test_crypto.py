@@ -0,0 +1,34 @@
+import asyncio
+
+from app.core.crypto import (
+    CryptoPool,
+    _decrypt_chunk,
+    _encrypt_chunk,
+    decrypt_secret,
+    encrypt_secret
+)
+
+
+def test_crypto_pool_keeps_order():
+    """Test que le chiffrement en lot, réparti sur plusieurs workers, conserve l'ordre"""
+    pool = CryptoPool(max_workers=4, min_chunk=3)
+    values = [f"secret-{i}" for i in range(20)] + [None]
+
+    try:
+        tokens = pool.map(_encrypt_chunk, values)
+        assert tokens[-1] is None
+        assert [decrypt_secret(token) for token in tokens[:-1]] == values[:-1]
+
+        assert asyncio.run(pool.map_async(_decrypt_chunk, tokens)) == values
+    finally:
+        pool.shutdown()
+
+
+def test_decrypt_many_matches_decrypt_secret():
+    """Test la compatibilité entre les API unitaire et en lot"""
+    from app.core.crypto import decrypt_many, encrypt_many
+
+    tokens = [encrypt_secret(f"pw-{i}") for i in range(100)]
+
+    assert decrypt_many(tokens) == [f"pw-{i}" for i in range(100)]
+    assert decrypt_many(encrypt_many(["a", "b"])) == ["a", "b"]
@@ -0,0 +1,102 @@
+import asyncio
+
+import bcrypt
+import pytest
+from sqlalchemy import select
+
+from app.core import security
+from app.core.hashing import HashingPool, HashingPoolSaturated, get_hash_policy, set_hash_policy
+from app.db.session_test import TestingSessionLocal
+from app.models.user import User
+
+
+def test_needs_rehash_bcrypt_rounds():
+    """Test la détection d'un hash bcrypt au coût dépassé"""
+    hashed = security.hash_password("pw", {"scheme": "bcrypt", "rounds": 4})
+
+    assert security.needs_rehash(hashed, {"scheme": "bcrypt", "rounds": 5})
+    assert not security.needs_rehash(hashed, {"scheme": "bcrypt", "rounds": 4})
+
+
+def test_verify_and_rehash():
+    """Test qu'un hash n'est remplacé qu'avec le bon mot de passe"""
+    policy = {"scheme": "bcrypt", "rounds": 5}
+    hashed = security.hash_password("pw", {"scheme": "bcrypt", "rounds": 4})
+
+    assert security.verify_and_rehash("wrong", hashed, policy) == (False, None)
+
+    valid, new_hash = security.verify_and_rehash("pw", hashed, policy)
+    assert valid
+    assert new_hash.startswith("$2b$05$")
+    assert security.verify_password("pw", new_hash)
+
+
+def test_calibrate_policy_bounds():
+    """Test que la calibration reste dans les bornes de sécurité"""
+    assert security.calibrate_policy("bcrypt", 0.001)["rounds"] == security.BCRYPT_MIN_ROUNDS
+    assert security.calibrate_policy("bcrypt", 10**9)["rounds"] == security.BCRYPT_MAX_ROUNDS
+
+
+def test_argon2id_round_trip():
+    """Test le schéma argon2id (dépendance optionnelle)"""
+    pytest.importorskip("argon2")
+    policy = {"scheme": "argon2id", "time_cost": 2, "memory_kib": 1024, "parallelism": 1}
+    hashed = security.hash_password("pw", policy)
+
+    assert security.verify_password("pw", hashed)
+    assert not security.verify_password("wrong", hashed)
+    assert security.needs_rehash(hashed, {**policy, "time_cost": 3})
+    assert security.needs_rehash(bcrypt.hashpw(b"pw", bcrypt.gensalt(4)).decode(), policy)
+
+
+async def _password_hash(email: str) -> str:
+    async with TestingSessionLocal() as session:
+        result = await session.execute(select(User.password_hash).where(User.email == email))
+        return result.scalar_one()
+
+
+def test_login_rehashes_outdated_hash(client):
+    """Test que le login remplace un hash au coût dépassé"""
+    policy = get_hash_policy()
+    set_hash_policy({"scheme": "bcrypt", "rounds": 4})
+    try:
+        client.post("/auth/register", json={"email": "rehash@example.com", "password": "password123"})
+    finally:
+        set_hash_policy(policy)
+    assert asyncio.run(_password_hash("rehash@example.com")).startswith("$2b$04$")
+
+    response = client.post("/auth/login", data={"username": "rehash@example.com", "password": "password123"})
+
+    assert response.status_code == 200
+    stored = asyncio.run(_password_hash("rehash@example.com"))
+    assert not security.needs_rehash(stored, policy)
+    assert security.verify_password("password123", stored)
+
+
+def test_cancelled_hash_stays_in_flight_until_done():
+    """Test qu'un appel annulé compte jusqu'à la fin réelle du job dans le pool"""
+    import time
+
+    pool = HashingPool(max_workers=1, max_queue=0)
+
+    async def scenario():
+        # Démarre le processus du pool
+        await pool.run(time.sleep, 0)
+        task = asyncio.create_task(pool.run(time.sleep, 1))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+        # Le job tourne toujours : le pool reste saturé
+        assert pool.in_flight == 1
+        with pytest.raises(HashingPoolSaturated):
+            await pool.run(time.sleep, 0)
+
+        await asyncio.sleep(1.2)
+        assert pool.in_flight == 0
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        pool.shutdown()
@@ -0,0 +1,206 @@
+import asyncio
+
+import pytest
+
+from app.core.circuit_breaker import CircuitBreaker, CircuitOpen, db_breaker
+from app.core.hashing import get_hash_policy
+from app.core.health import ReadinessProbe
+
+
+def test_liveness_has_no_dependencies(client):
+    """Test que la sonde de vivacité répond sans toucher à la base"""
+    assert client.get("/health/live").json() == {"status": "ok"}
+    assert client.get("/health").json() == {"status": "ok"}
+
+
+def test_readiness_checks_database(client):
+    """Test que la sonde de disponibilité vérifie la base"""
+    get_hash_policy()
+    response = client.get("/health/ready")
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["checks"]["database"]["status"] == "ok"
+    assert data["checks"]["db_breaker"]["state"] == "closed"
+    assert data["checks"]["hash_policy"]["status"] == "ok"
+
+
+def test_readiness_waits_for_hash_calibration(client, monkeypatch):
+    """Test que le worker n'est pas prêt tant que la calibration du hash tourne"""
+    from app.core import hashing
+
+    monkeypatch.setattr(hashing, "_hash_policy", None)
+
+    response = client.get("/health/ready")
+
+    assert response.status_code == 503
+    assert response.json()["checks"]["hash_policy"]["status"] == "pending"
+    assert client.get("/health/live").status_code == 200
+
+
+def test_readiness_probe_timeout_and_cache():
+    """Test le délai max de la vérification et le cache de son résultat"""
+    calls = 0
+
+    async def slow_check():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(5)
+
+    async def scenario():
+        probe = ReadinessProbe(slow_check, timeout=0.05, cache_seconds=60)
+        results = await asyncio.gather(*(probe.result() for _ in range(10)))
+        return results, await probe.result()
+
+    results, cached = asyncio.run(scenario())
+
+    assert all(r["status"] == "error" and r["error"] == "timeout" for r in results)
+    assert cached["error"] == "timeout"
+    # Une seule vérification pour tous les appels concurrents et le suivant
+    assert calls == 1
+
+
+def test_readiness_returns_503_when_database_is_down(client, monkeypatch):
+    """Test que la sonde renvoie 503 si la base est injoignable"""
+    from app.core import health
+
+    async def unreachable():
+        raise ConnectionRefusedError()
+
+    monkeypatch.setattr(health, "database_probe", ReadinessProbe(unreachable, timeout=1, cache_seconds=0))
+
+    response = client.get("/health/ready")
+
+    assert response.status_code == 503
+    assert response.json()["checks"]["database"]["error"] == "ConnectionRefusedError"
+
+
+def test_circuit_breaker_states(monkeypatch):
+    """Test ouverture après N échecs, essai unique en semi-ouvert, fermeture sur succès"""
+    from app.core import circuit_breaker
+
+    now = [1000.0]
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=10)
+
+    for _ in range(2):
+        breaker.record_failure()
+        breaker.before_call()
+    breaker.record_failure()
+
+    with pytest.raises(CircuitOpen) as excinfo:
+        breaker.before_call()
+    assert excinfo.value.retry_after == 10
+
+    now[0] += 10
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # Un seul essai par intervalle
+    with pytest.raises(CircuitOpen):
+        breaker.before_call()
+
+    # Essai raté : rouvert
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    now[0] += 10
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.before_call()
+
+
+def test_requests_fail_fast_when_breaker_is_open(client, auth_headers):
+    """Test que les requêtes échouent immédiatement en 503 pendant une panne"""
+    for _ in range(db_breaker.failure_threshold):
+        db_breaker.record_failure()
+
+    response = client.get("/secrets/", headers=auth_headers)
+
+    assert response.status_code == 503
+    assert int(response.headers["Retry-After"]) >= 1
+    assert client.get("/health/live").status_code == 200
+
+
+def test_import_has_no_side_effects():
+    """Test que l'import de l'API ne construit ni engine, ni clés, ni broker"""
+    import subprocess
+    import sys
+
+    code = (
+        "import app.main\n"
+        "from app.core import crypto, events\n"
+        "from app.db import session\n"
+        "assert session._engine is None\n"
+        "assert crypto._keyring is None\n"
+        "assert events._broker is None\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_migrate_gives_up_when_database_is_unreachable():
+    """Test que python -m app.migrate réessaie puis abandonne après --wait"""
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    from app.migrate import wait_for_database
+
+    engine = create_async_engine("postgresql+asyncpg://u:p@127.0.0.1:1/db")
+
+    with pytest.raises(OSError):
+        asyncio.run(wait_for_database(engine, timeout=1))
+
+
+def test_migrate_applies_all_migrations_on_fresh_database():
+    """Test que python -m app.migrate applique toutes les migrations jusqu'à head"""
+    import os
+    import subprocess
+    import sys
+
+    import asyncpg
+    from alembic.script import ScriptDirectory
+
+    from app.core.config_test import test_settings
+    from app.migrate import alembic_config
+
+    database = f"{test_settings.POSTGRES_DB}_migrate"
+    dsn = (
+        f"postgresql://{test_settings.POSTGRES_USER}:{test_settings.POSTGRES_PASSWORD}@"
+        f"{test_settings.POSTGRES_HOST}:{test_settings.POSTGRES_PORT}"
+    )
+
+    async def admin(*statements):
+        conn = await asyncpg.connect(f"{dsn}/postgres")
+        try:
+            for statement in statements:
+                await conn.execute(statement)
+        finally:
+            await conn.close()
+
+    async def inspect():
+        conn = await asyncpg.connect(f"{dsn}/{database}")
+        try:
+            return (
+                await conn.fetchval("SELECT version_num FROM alembic_version"),
+                await conn.fetchval("SELECT count(*) FROM pg_index WHERE NOT indisvalid"),
+            )
+        finally:
+            await conn.close()
+
+    asyncio.run(admin(f'DROP DATABASE IF EXISTS "{database}"', f'CREATE DATABASE "{database}"'))
+    try:
+        # Dans un processus séparé : un interblocage fait échouer le test au lieu de le bloquer
+        env = {**os.environ, "POSTGRES_DB": database}
+        code = (
+            "import asyncio\n"
+            "from app.migrate import migrate\n"
+            "asyncio.run(migrate(wait=5))\n"
+        )
+        for _ in range(2):
+            # Deuxième exécution : verrou libéré, rien à appliquer
+            subprocess.run([sys.executable, "-c", code], env=env, check=True, timeout=120)
+
+        head = ScriptDirectory.from_config(alembic_config()).get_current_head()
+        # Index CONCURRENTLY tous valides
+        assert asyncio.run(inspect()) == (head, 0)
+    finally:
+        asyncio.run(admin(f'DROP DATABASE IF EXISTS "{database}" WITH (FORCE)'))
@@ -0,0 +1,113 @@
+import time
+from datetime import timedelta
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from jose import jwt
+
+from app.core import jwt as jwt_module
+from app.core.jwt import (
+    JWTKeys,
+    VerifiedTokenCache,
+    create_access_token,
+    load_jwt_keys,
+    set_jwt_keys,
+    verify_access_token,
+    verify_cache
+)
+
+
+def _ec_private_key() -> str:
+    key = ec.generate_private_key(ec.SECP256R1())
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    ).decode("ascii")
+
+
+@pytest.fixture()
+def es256_keys():
+    keys = JWTKeys("ES256", private_key=_ec_private_key())
+    set_jwt_keys(keys)
+    yield keys
+    set_jwt_keys(load_jwt_keys())
+
+
+def test_verify_cache_hit_skips_decode(monkeypatch):
+    """Test qu'un token déjà vérifié est servi par le cache"""
+    token = create_access_token({"sub": "cache-hit"})
+    assert verify_access_token(token)["sub"] == "cache-hit"
+
+    def fail(*args, **kwargs):
+        raise AssertionError("jwt.decode appelé malgré le cache")
+
+    monkeypatch.setattr(jwt_module.jwt, "decode", fail)
+    hits = verify_cache.stats()["hits"]
+
+    assert verify_access_token(token)["sub"] == "cache-hit"
+    assert verify_cache.stats()["hits"] == hits + 1
+
+
+def test_verify_cache_rechecks_expiry(monkeypatch):
+    """Test qu'une entrée expirée n'est plus servie par le cache"""
+    cache = VerifiedTokenCache(max_size=10)
+    now = time.time()
+    cache.set(b"token", {"sub": "expiry", "exp": now + 60})
+    assert cache.get(b"token") == {"sub": "expiry", "exp": now + 60}
+
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+
+    assert cache.get(b"token") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_verify_cache_lru_eviction():
+    """Test que le cache reste borné"""
+    cache = VerifiedTokenCache(max_size=2)
+    exp = time.time() + 60
+    for name in (b"a", b"b", b"c"):
+        cache.set(name, {"exp": exp})
+
+    assert cache.get(b"a") is None
+    assert cache.stats()["evictions"] == 1
+
+
+def test_tampered_token_rejected():
+    """Test qu'un token modifié n'est jamais servi par le cache"""
+    token = create_access_token({"sub": "tampered"})
+    verify_access_token(token)
+    header, payload, signature = token.split(".")
+    forged = ".".join([header, payload, signature[::-1]])
+
+    with pytest.raises(ValueError, match="Invalid token"):
+        verify_access_token(forged)
+
+
+def test_es256_tokens_carry_kid_and_jwks(client, es256_keys):
+    """Test la signature ES256 avec kid et la publication du JWKS"""
+    token = create_access_token({"sub": "edge"})
+
+    assert jwt.get_unverified_header(token)["kid"] == es256_keys.key_id
+    assert verify_access_token(token)["sub"] == "edge"
+
+    jwks = client.get("/.well-known/jwks.json").json()
+    assert [key["kid"] for key in jwks["keys"]] == [es256_keys.key_id]
+    assert "d" not in jwks["keys"][0]
+
+    # Un service tiers vérifie avec la seule clé publique
+    assert jwt.decode(token, jwks, algorithms=["ES256"])["sub"] == "edge"
+
+
+def test_es256_rotation_accepts_previous_key(es256_keys):
+    """Test qu'une ancienne clé listée dans JWT_PUBLIC_KEYS reste acceptée"""
+    old_token = create_access_token({"sub": "rotated"})
+    previous = '{"keys": [%s]}' % jwt_module.json.dumps(es256_keys.public_jwks[0])
+
+    set_jwt_keys(JWTKeys("ES256", private_key=_ec_private_key(), public_keys=previous))
+    assert verify_access_token(old_token)["sub"] == "rotated"
+
+    set_jwt_keys(JWTKeys("ES256", private_key=_ec_private_key()))
+    with pytest.raises(ValueError, match="Invalid token"):
+        verify_access_token(old_token)
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+from cryptography.fernet import Fernet
+
+from app.core import crypto
+from app.core.config import settings
+from app.db.session_test import TestingSessionLocal
+from app.jobs.reencrypt import reencrypt_secrets
+
+
+@pytest.fixture()
+def rotated_keys():
+    """
+    Nouvelle clé primaire devant la clé de test ; restaure la clé d'origine.
+    """
+    new_key = Fernet.generate_key().decode()
+    crypto.set_encryption_keys(f"{new_key},{settings.SECRET_ENCRYPTION_KEY}")
+    yield new_key
+    crypto.set_encryption_keys(settings.SECRET_ENCRYPTION_KEY)
+
+
+def test_multi_key_decrypts_with_any_key(rotated_keys):
+    """Test que l'ancienne clé déchiffre toujours et que la nouvelle chiffre"""
+    old_token = Fernet(settings.SECRET_ENCRYPTION_KEY).encrypt(b"old").decode()
+
+    assert crypto.decrypt_secret(old_token) == "old"
+    assert Fernet(rotated_keys).decrypt(crypto.encrypt_secret("new").encode()) == b"new"
+
+
+def test_reencrypt_job_rewrites_old_secrets(client, auth_headers):
+    """Test que le job re-chiffre avec la nouvelle clé, par lots, avec checkpoint"""
+    ids = [
+        client.post(
+            "/secrets/",
+            json={"title": f"Rotation {i}", "username": "bot", "password": f"pw-{i}"},
+            headers=auth_headers
+        ).json()["id"]
+        for i in range(5)
+    ]
+
+    new_key = Fernet.generate_key().decode()
+    crypto.set_encryption_keys(f"{new_key},{settings.SECRET_ENCRYPTION_KEY}")
+    try:
+        checkpoint = asyncio.run(reencrypt_secrets(
+            session_factory=TestingSessionLocal,
+            batch_size=2,
+            max_rows_per_second=1_000_000
+        ))
+
+        assert checkpoint.completed_at is not None
+        assert checkpoint.rewritten >= 5
+
+        # Ancienne clé retirée : les secrets restent lisibles
+        crypto.set_encryption_keys(new_key)
+        passwords = [
+            client.get(f"/secrets/{secret_id}", headers=auth_headers).json()["password"]
+            for secret_id in ids
+        ]
+        assert passwords == [f"pw-{i}" for i in range(5)]
+
+        # Relance : rien à faire, checkpoint déjà terminé
+        again = asyncio.run(reencrypt_secrets(session_factory=TestingSessionLocal))
+        assert again.rewritten == checkpoint.rewritten
+    finally:
+        crypto.set_encryption_keys(settings.SECRET_ENCRYPTION_KEY)
+
+
+def test_reencrypt_job_rejects_non_positive_rate(monkeypatch):
+    """Test qu'un débit nul est refusé, qu'il vienne de l'appelant ou des settings"""
+    from pydantic import ValidationError
+
+    from app.core.config import Settings
+
+    with pytest.raises(ValueError):
+        asyncio.run(reencrypt_secrets(session_factory=TestingSessionLocal, max_rows_per_second=0))
+
+    monkeypatch.setattr(settings, "REENCRYPT_MAX_ROWS_PER_SECOND", 0)
+    with pytest.raises(ValueError):
+        asyncio.run(reencrypt_secrets(session_factory=TestingSessionLocal))
+
+    monkeypatch.setenv("REENCRYPT_MAX_ROWS_PER_SECOND", "0")
+    with pytest.raises(ValidationError):
+        Settings()
@@ -0,0 +1,81 @@
+def test_db_pool_metrics(client, auth_headers, admin_headers):
+    """Test que les statistiques du pool de connexions sont exposées"""
+    client.get("/secrets/", headers=auth_headers)
+
+    response = client.get("/metrics/db-pool", headers=admin_headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    for key in ("size", "checked_out", "overflow", "checkouts", "timeouts"):
+        assert key in data
+    assert data["checkout_wait_seconds"]["count"] >= 0
+
+
+def test_secret_cache_metrics(client, admin_headers):
+    """Test l'exposition des compteurs du cache des secrets déchiffrés"""
+    response = client.get("/metrics/secret-cache", headers=admin_headers)
+
+    assert response.status_code == 200
+    assert {"enabled", "hits", "misses", "bytes", "max_bytes"} <= response.json().keys()
+
+
+def test_prometheus_metrics_use_route_templates(client, auth_headers, monkeypatch):
+    """Test que /metrics agrège les requêtes par modèle de route"""
+    from uuid import uuid4
+
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-token")
+    client.get(f"/secrets/{uuid4()}", headers=auth_headers)
+    client.get(f"/secrets/{uuid4()}", headers=auth_headers)
+
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-token"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    text = response.text
+    assert 'pm_http_requests_total{method="GET",route="/secrets/{secret_id}",status="404"}' in text
+    assert 'pm_http_request_duration_seconds_bucket{method="GET",route="/secrets/{secret_id}",le="+Inf"}' in text
+    assert 'pm_password_hash_seconds_count{operation="verify"}' in text
+    assert "pm_db_pool_checkout_wait_seconds_count" in text
+
+
+def test_prometheus_metrics_count_errors_by_type(client, auth_headers, monkeypatch):
+    """Test que les 500 des routers sont comptées par type d'exception d'origine"""
+    from sqlalchemy.exc import OperationalError
+
+    from app.core.metrics import errors_total
+    from app.routers import secrets
+
+    def fail(value):
+        raise OperationalError("INSERT", {}, Exception("connection lost"))
+
+    monkeypatch.setattr(secrets, "encrypt_secret", fail)
+    before = errors_total.value("OperationalError", "/secrets/")
+
+    response = client.post(
+        "/secrets/",
+        json={"title": "t", "username": "u", "password": "p"},
+        headers=auth_headers
+    )
+
+    assert response.status_code == 500
+    assert errors_total.value("OperationalError", "/secrets/") == before + 1
+
+
+def test_metrics_endpoints_require_token_or_admin(client, auth_headers, monkeypatch):
+    """Test que /metrics exige METRICS_TOKEN et /metrics/* un compte admin"""
+    from app.core.config import settings
+
+    # Sans METRICS_TOKEN : désactivé, même avec un jeton quelconque
+    assert client.get("/metrics").status_code == 404
+    assert client.get("/metrics", headers={"Authorization": "Bearer "}).status_code == 404
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-token")
+    assert client.get("/metrics", headers={"Authorization": "Bearer wrong"}).status_code == 404
+    assert client.get("/metrics", headers=auth_headers).status_code == 404
+
+    for path in ("/metrics/db-pool", "/metrics/secret-cache", "/metrics/jwt-cache",
+                 "/metrics/rate-limit", "/metrics/events"):
+        assert client.get(path).status_code == 401
+        assert client.get(path, headers=auth_headers).status_code == 403
@@ -0,0 +1,209 @@
+"""
+Tests de non-régression des plans d'exécution (EXPLAIN).
+
+On peuple la table secrets, répartie sur plusieurs utilisateurs, puis on
+vérifie que les requêtes du router secrets passent par un index et jamais
+par un parcours séquentiel.
+
+- par défaut : 10 000 lignes (statistiques à jour via ANALYZE) et
+  enable_seqscan = off pendant l'EXPLAIN ; sur une table aussi petite le
+  planificateur préfère souvent un parcours séquentiel, le test vérifie
+  donc qu'un index utilisable existe pour chaque requête
+- EXPLAIN_SEED_ROWS=1000000 : volume réaliste, plans choisis librement
+  par le planificateur (lent : dizaines de secondes)
+"""
+import asyncio
+import json
+import os
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import text
+
+from app.db.queries import (
+    batch_delete_user_secrets_statement,
+    batch_update_user_secrets_statement,
+    changed_secrets_query,
+    deleted_secrets_query,
+    export_user_secrets_query,
+    list_user_secrets_query,
+    reencrypt_chunk_query,
+    search_user_secrets_query,
+    secret_updated_at_query,
+    user_secret_query
+)
+from app.db.session_test import engine_test
+
+
+SEED_ROWS = int(os.getenv("EXPLAIN_SEED_ROWS", "10000"))
+SEED_USERS = min(1000, SEED_ROWS)
+# Volume réaliste demandé explicitement : le planificateur choisit seul
+FORCE_INDEX = "EXPLAIN_SEED_ROWS" not in os.environ
+
+
+async def _seed():
+    async with engine_test.begin() as conn:
+        await conn.execute(text(
+            """
+            INSERT INTO users (id, email, password_hash, created_at)
+            SELECT gen_random_uuid(), 'explain-' || g || '@example.com', 'x', now()
+            FROM generate_series(1, :users) AS g
+            """
+        ), {"users": SEED_USERS})
+        await conn.execute(text(
+            """
+            INSERT INTO secrets (id, title, username, password, url, created_at, updated_at, user_id)
+            SELECT gen_random_uuid(), 'title ' || g, 'user ' || g, 'x', NULL,
+                   now() - g * interval '1 second', now(), u.id
+            FROM generate_series(1, :rows) AS g
+            JOIN (
+                SELECT id, row_number() OVER () - 1 AS n
+                FROM users WHERE email LIKE 'explain-%'
+            ) AS u ON u.n = g % :users
+            """
+        ), {"rows": SEED_ROWS, "users": SEED_USERS})
+        await conn.execute(text("ANALYZE users"))
+        await conn.execute(text("ANALYZE secrets"))
+
+        row = (await conn.execute(text(
+            "SELECT user_id, id, created_at FROM secrets "
+            "WHERE user_id = (SELECT id FROM users WHERE email = 'explain-1@example.com') "
+            "ORDER BY created_at DESC, id DESC LIMIT 1"
+        ))).one()
+        return row.user_id, row.id, row.created_at
+
+
+async def _cleanup():
+    async with engine_test.begin() as conn:
+        await conn.execute(text("DELETE FROM users WHERE email LIKE 'explain-%'"))
+
+
+async def _explain(statement) -> dict:
+    # Paramètres liés et typés, comme à l'exécution par l'application
+    compiled = statement.compile(
+        dialect=engine_test.dialect,
+        compile_kwargs={"render_postcompile": True}
+    )
+    params = compiled.construct_params()
+    async with engine_test.begin() as conn:
+        if FORCE_INDEX:
+            await conn.execute(text("SET LOCAL enable_seqscan = off"))
+        result = await conn.exec_driver_sql(
+            "EXPLAIN (FORMAT JSON) " + str(compiled),
+            tuple(params[name] for name in compiled.positiontup)
+        )
+        plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+def _node_types(plan: dict) -> list[str]:
+    nodes = [plan["Node Type"]]
+    for child in plan.get("Plans", []):
+        nodes.extend(_node_types(child))
+    return nodes
+
+
+def _assert_index_scan(plan: dict):
+    nodes = _node_types(plan)
+    assert "Seq Scan" not in nodes, nodes
+    assert any(node in ("Index Scan", "Index Only Scan", "Bitmap Index Scan") for node in nodes), nodes
+
+
+@pytest.fixture(scope="module")
+def seeded():
+    data = asyncio.run(_seed())
+    yield data
+    asyncio.run(_cleanup())
+
+
+def test_list_first_page_uses_index(seeded):
+    user_id, _, _ = seeded
+    plan = asyncio.run(_explain(list_user_secrets_query(user_id, limit=101)))
+
+    _assert_index_scan(plan)
+
+
+def test_list_cursor_page_uses_index(seeded):
+    user_id, secret_id, created_at = seeded
+    plan = asyncio.run(_explain(
+        list_user_secrets_query(user_id, position=(created_at, secret_id), limit=101)
+    ))
+
+    _assert_index_scan(plan)
+
+
+def test_get_secret_uses_index(seeded):
+    user_id, secret_id, _ = seeded
+    plan = asyncio.run(_explain(user_secret_query(user_id, secret_id)))
+
+    _assert_index_scan(plan)
+
+
+def test_batch_update_uses_index(seeded):
+    user_id, secret_id, _ = seeded
+    statement = batch_update_user_secrets_statement(
+        user_id,
+        [(secret_id, "new", None, None, None, 1)],
+        updated_at=datetime.now(timezone.utc)
+    )
+    plan = asyncio.run(_explain(statement))
+
+    _assert_index_scan(plan)
+
+
+def test_batch_delete_uses_index(seeded):
+    user_id, secret_id, _ = seeded
+    plan = asyncio.run(_explain(batch_delete_user_secrets_statement(user_id, [secret_id])))
+
+    _assert_index_scan(plan)
+
+
+def test_search_secrets_uses_index(seeded):
+    user_id, _, _ = seeded
+    plan = asyncio.run(_explain(search_user_secrets_query(user_id, "title 42", limit=20)))
+
+    _assert_index_scan(plan)
+
+
+def test_list_search_filter_uses_index(seeded):
+    user_id, _, _ = seeded
+    plan = asyncio.run(_explain(list_user_secrets_query(user_id, search="title 42", limit=101)))
+
+    _assert_index_scan(plan)
+
+
+def test_export_secrets_uses_index(seeded):
+    user_id, _, _ = seeded
+    plan = asyncio.run(_explain(export_user_secrets_query(user_id)))
+
+    _assert_index_scan(plan)
+
+
+def test_reencrypt_chunk_uses_index(seeded):
+    _, secret_id, _ = seeded
+    plan = asyncio.run(_explain(reencrypt_chunk_query(secret_id, limit=500)))
+
+    _assert_index_scan(plan)
+
+
+def test_secret_etag_validation_uses_index(seeded):
+    user_id, secret_id, _ = seeded
+    plan = asyncio.run(_explain(secret_updated_at_query(user_id, secret_id)))
+
+    _assert_index_scan(plan)
+
+
+def test_secret_changes_uses_index(seeded):
+    user_id, _, _ = seeded
+    plan = asyncio.run(_explain(changed_secrets_query(user_id, since=0, limit=501)))
+
+    _assert_index_scan(plan)
+
+
+def test_deleted_secrets_uses_index(seeded):
+    user_id, _, _ = seeded
+    plan = asyncio.run(_explain(deleted_secrets_query(user_id, since=0, limit=501)))
+
+    _assert_index_scan(plan)
@@ -0,0 +1,104 @@
+import time
+
+import pytest
+
+from app.core import security
+from app.core.config import settings
+from app.core.hashing import hashing_pool
+from app.core.rate_limit import InMemoryRateLimiter, RateLimitBackend
+
+
+def test_token_bucket_burst_and_refill(monkeypatch):
+    """Test la rafale max puis le remplissage progressif du seau"""
+    limiter = InMemoryRateLimiter()
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now)
+
+    assert [limiter.take("k", rate=1, burst=3) for _ in range(3)] == [0, 0, 0]
+    assert limiter.take("k", rate=1, burst=3) == 1
+
+    monkeypatch.setattr(time, "monotonic", lambda: now + 1)
+    assert limiter.take("k", rate=1, burst=3) == 0
+    assert limiter.stats()["rejected"] == 1
+
+
+def test_token_bucket_bounded_keys():
+    """Test que le nombre de seaux suivis reste borné"""
+    limiter = InMemoryRateLimiter(max_keys=2)
+    for key in ("a", "b", "c"):
+        limiter.take(key, rate=1, burst=1)
+
+    assert limiter.stats()["keys"] == 2
+    assert limiter.stats()["evictions"] == 1
+
+
+def test_login_rate_limited_before_db_and_bcrypt(client, monkeypatch):
+    """Test que le 429 est renvoyé sans requête en base ni hash"""
+    from app.routers import auth
+
+    monkeypatch.setattr(settings, "LOGIN_RATE_LIMIT_ACCOUNT_BURST", 2)
+    calls = []
+
+    async def counted(*args, **kwargs):
+        calls.append(args)
+        return False, None
+
+    monkeypatch.setattr(auth, "verify_and_rehash_async", counted)
+    monkeypatch.setattr(auth, "verify_dummy_async", counted)
+
+    statuses = [
+        client.post("/auth/login", data={"username": "Target@example.com", "password": "x"}).status_code
+        for _ in range(3)
+    ]
+
+    assert statuses == [401, 401, 429]
+    assert len(calls) == 2
+
+    # La casse de l'email ne contourne pas la limite par compte
+    response = client.post("/auth/login", data={"username": "target@example.com", "password": "x"})
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+def test_login_rate_limited_per_ip(client, monkeypatch):
+    """Test la limite par IP quel que soit le compte visé"""
+    monkeypatch.setattr(settings, "LOGIN_RATE_LIMIT_IP_BURST", 2)
+
+    statuses = [
+        client.post("/auth/login", data={"username": f"spray-{i}@example.com", "password": "x"}).status_code
+        for i in range(3)
+    ]
+
+    assert statuses == [401, 401, 429]
+
+
+def test_unknown_email_runs_dummy_verify(client, monkeypatch):
+    """Test qu'un email inconnu paie quand même une vérification de hash"""
+    verified = []
+    real = security.verify_password
+
+    def spy(password, hashed_password):
+        verified.append(hashed_password)
+        return real(password, hashed_password)
+
+    # Le pool de hash est un pool de processus : on exécute dans ce processus
+    async def inline(fn, *args):
+        return fn(*args)
+
+    monkeypatch.setattr(security, "verify_password", spy)
+    monkeypatch.setattr(hashing_pool, "run", inline)
+
+    response = client.post("/auth/login", data={"username": "ghost@example.com", "password": "x"})
+
+    assert response.status_code == 401
+    assert len(verified) == 1
+
+
+def test_incomplete_rate_limit_backend_is_rejected():
+    """Test qu'un backend incomplet échoue dès sa construction"""
+    class PartialLimiter(RateLimitBackend):
+        def take(self, key, rate, burst):
+            return 0
+
+    with pytest.raises(TypeError):
+        PartialLimiter()
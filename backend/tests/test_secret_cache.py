@@ -0,0 +1,30 @@
+from app.core.secret_cache import DecryptedSecretCache
+
+
+def test_secret_cache_byte_budget_zeroes_evicted_entries():
+    """Test que le budget mémoire est respecté et que l'entrée évincée est effacée"""
+    cache = DecryptedSecretCache(ttl_seconds=60, max_bytes=60)
+    cache.set("u", "a", {"password": "a" * 20}, cache.epoch())
+    evicted_buffer = cache._entries[("u", "a")][1]
+    cache.set("u", "b", {"password": "b" * 20}, cache.epoch())
+
+    assert cache.get("u", "a") is None
+    assert cache.get("u", "b") == {"password": "b" * 20}
+    assert set(evicted_buffer) == {0}
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] <= 60
+
+
+def test_secret_cache_scoped_per_user_and_rejects_stale_writes():
+    """Test l'isolation par utilisateur et le rejet d'une valeur lue avant une invalidation"""
+    cache = DecryptedSecretCache(ttl_seconds=60, max_bytes=1024)
+    epoch = cache.epoch()
+    cache.invalidate("u", "a")
+    cache.set("u", "a", {"password": "old"}, epoch)
+
+    assert cache.get("u", "a") is None
+
+    cache.set("u", "a", {"password": "new"}, cache.epoch())
+
+    assert cache.get("other", "a") is None
+    assert cache.get("u", "a") == {"password": "new"}
@@ -0,0 +1,415 @@
+import csv
+import io
+import json
+
+
+def create_secret(client, headers, **overrides):
+    payload = {
+        "title": "GitHub",
+        "username": "octocat",
+        "password": "s3cret",
+        "url": "https://github.com"
+    }
+    payload.update(overrides)
+    response = client.post("/secrets/", json=payload, headers=headers)
+    assert response.status_code == 201
+    return response.json()
+
+
+def test_create_and_get_secret(client, auth_headers):
+    """Test la création puis la lecture (déchiffrée) d'un secret"""
+    created = create_secret(client, auth_headers)
+    assert created["password"] != "s3cret"  # stocké chiffré
+
+    response = client.get(f"/secrets/{created['id']}", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json()["password"] == "s3cret"
+
+
+def test_list_secrets_with_search(client, auth_headers):
+    """Test la liste des secrets et le filtre de recherche"""
+    create_secret(client, auth_headers, title="GitLab")
+    create_secret(client, auth_headers, title="Jira")
+
+    response = client.get("/secrets/", params={"search": "git"}, headers=auth_headers)
+
+    assert response.status_code == 200
+    assert [s["title"] for s in response.json()] == ["GitLab"]
+
+
+def test_update_secret(client, auth_headers):
+    """Test la mise à jour partielle d'un secret"""
+    created = create_secret(client, auth_headers)
+
+    response = client.patch(
+        f"/secrets/{created['id']}",
+        json={"password": "n3w"},
+        headers=auth_headers
+    )
+    assert response.status_code == 200
+
+    detail = client.get(f"/secrets/{created['id']}", headers=auth_headers).json()
+    assert detail["password"] == "n3w"
+    assert detail["title"] == "GitHub"
+
+
+def test_delete_secret(client, auth_headers):
+    """Test la suppression d'un secret"""
+    created = create_secret(client, auth_headers)
+
+    response = client.delete(f"/secrets/{created['id']}", headers=auth_headers)
+    assert response.status_code == 204
+
+    response = client.get(f"/secrets/{created['id']}", headers=auth_headers)
+    assert response.status_code == 404
+
+
+def test_secret_of_other_user_not_found(client, auth_headers):
+    """Test qu'un utilisateur ne peut pas lire le secret d'un autre"""
+    created = create_secret(client, auth_headers)
+
+    client.post("/auth/register", json={"email": "intruder@example.com", "password": "password123"})
+    token = client.post(
+        "/auth/login",
+        data={"username": "intruder@example.com", "password": "password123"}
+    ).json()["access_token"]
+
+    response = client.get(
+        f"/secrets/{created['id']}",
+        headers={"Authorization": f"Bearer {token}"}
+    )
+    assert response.status_code == 404
+
+
+def test_list_secrets_cursor_pagination(client, auth_headers):
+    """Test la pagination par curseur (header X-Next-Cursor)"""
+    for title in ("A", "B", "C"):
+        create_secret(client, auth_headers, title=title)
+
+    first = client.get("/secrets/", params={"limit": 2}, headers=auth_headers)
+    assert [s["title"] for s in first.json()] == ["C", "B"]
+    cursor = first.headers["X-Next-Cursor"]
+
+    second = client.get("/secrets/", params={"limit": 2, "cursor": cursor}, headers=auth_headers)
+    assert [s["title"] for s in second.json()] == ["A"]
+    assert "X-Next-Cursor" not in second.headers
+
+
+def test_list_secrets_invalid_cursor(client, auth_headers):
+    """Test qu'un curseur invalide renvoie 400"""
+    response = client.get("/secrets/", params={"cursor": "not-a-cursor"}, headers=auth_headers)
+
+    assert response.status_code == 400
+
+
+def test_search_secrets_prefix_and_typo(client, auth_headers):
+    """Test la recherche classée : préfixe puis tolérance aux fautes de frappe"""
+    create_secret(client, auth_headers, title="GitHub")
+    create_secret(client, auth_headers, title="GitLab")
+    create_secret(client, auth_headers, title="Amazon Web Services", username="admin")
+
+    prefix = client.get("/secrets/search", params={"q": "git"}, headers=auth_headers)
+    assert prefix.status_code == 200
+    assert {s["title"] for s in prefix.json()} == {"GitHub", "GitLab"}
+
+    typo = client.get("/secrets/search", params={"q": "githbu"}, headers=auth_headers)
+    assert [s["title"] for s in typo.json()] == ["GitHub"]
+
+    typo = client.get("/secrets/search", params={"q": "amazn"}, headers=auth_headers)
+    assert [s["title"] for s in typo.json()] == ["Amazon Web Services"]
+    assert typo.json()[0]["score"] > 0
+
+
+def test_search_secrets_escapes_wildcards(client, auth_headers):
+    """Test que % et _ sont traités comme des caractères littéraux"""
+    create_secret(client, auth_headers, title="Jira")
+
+    response = client.get("/secrets/search", params={"q": "%"}, headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_batch_create_update_delete(client, auth_headers):
+    """Test le cycle complet des endpoints batch avec résultats par élément"""
+    created = client.post(
+        "/secrets/batch",
+        json={"items": [
+            {"title": f"Batch {i}", "username": "bot", "password": f"pw{i}"}
+            for i in range(3)
+        ]},
+        headers=auth_headers
+    )
+    assert created.status_code == 201
+    ids = [item["id"] for item in created.json()]
+    assert [item["status"] for item in created.json()] == ["created"] * 3
+
+    missing_id = "00000000-0000-0000-0000-000000000000"
+    updated = client.patch(
+        "/secrets/batch",
+        json={"items": [
+            {"id": ids[0], "password": "new-pw"},
+            {"id": missing_id, "title": "Ghost"},
+            {"id": ids[1]},
+            {"id": ids[0], "title": "Again"}
+        ]},
+        headers=auth_headers
+    )
+    assert updated.status_code == 200
+    assert [item["status"] for item in updated.json()] == ["updated", "not_found", "invalid", "duplicate"]
+
+    detail = client.get(f"/secrets/{ids[0]}", headers=auth_headers).json()
+    assert detail["password"] == "new-pw"
+    assert detail["title"] == "Batch 0"
+
+    deleted = client.post(
+        "/secrets/batch/delete",
+        json={"ids": [ids[0], ids[2], missing_id]},
+        headers=auth_headers
+    )
+    assert [item["status"] for item in deleted.json()] == ["deleted", "deleted", "not_found"]
+    assert client.get(f"/secrets/{ids[1]}", headers=auth_headers).status_code == 200
+    assert client.get(f"/secrets/{ids[2]}", headers=auth_headers).status_code == 404
+
+
+def test_batch_size_limit(client, auth_headers, monkeypatch):
+    """Test que les batchs trop volumineux sont refusés (413)"""
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "SECRETS_BATCH_MAX_SIZE", 2)
+
+    response = client.post(
+        "/secrets/batch",
+        json={"items": [{"title": "x", "username": "y", "password": "z"}] * 3},
+        headers=auth_headers
+    )
+
+    assert response.status_code == 413
+
+
+def test_export_ndjson(client, auth_headers):
+    """Test l'export NDJSON : secrets déchiffrés, un objet par ligne"""
+    for i in range(3):
+        create_secret(client, auth_headers, title=f"Export {i}", password=f"pw-{i}")
+
+    response = client.get("/secrets/export", headers=auth_headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["title"] for row in rows] == ["Export 2", "Export 1", "Export 0"]
+    assert [row["password"] for row in rows] == ["pw-2", "pw-1", "pw-0"]
+
+
+def test_export_csv(client, auth_headers):
+    """Test l'export CSV avec en-tête"""
+    create_secret(client, auth_headers, title="Export, CSV", password="p\"w", url=None)
+
+    response = client.get("/secrets/export?format=csv", headers=auth_headers)
+
+    assert response.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == 1
+    assert rows[0]["title"] == "Export, CSV"
+    assert rows[0]["password"] == "p\"w"
+    assert rows[0]["url"] == ""
+
+
+def test_import_bitwarden_csv(client, auth_headers):
+    """Test l'import d'un export CSV Bitwarden, lignes invalides signalées"""
+    content = (
+        "folder,favorite,type,name,notes,fields,reprompt,login_uri,login_username,login_password,login_totp\n"
+        ",,login,GitHub,,,0,https://github.com,octocat,gh-pw,\n"
+        ",,note,Notes,texte,,0,,,,\n"
+        ",,login,GitLab,,,0,,tanuki,gl-pw,\n"
+    )
+
+    response = client.post(
+        "/secrets/import",
+        files={"file": ("bitwarden.csv", content, "text/csv")},
+        headers=auth_headers
+    )
+
+    assert response.status_code == 200
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [e["row"] for e in events if e["event"] == "invalid"] == [2]
+    assert events[-1] == {"event": "done", "rows": 3, "imported": 2, "invalid": 1}
+
+    exported = client.get("/secrets/export", headers=auth_headers).text.splitlines()
+    secrets = sorted((s["title"], s["username"], s["password"], s["url"]) for s in map(json.loads, exported))
+    assert secrets == [
+        ("GitHub", "octocat", "gh-pw", "https://github.com"),
+        ("GitLab", "tanuki", "gl-pw", None)
+    ]
+
+
+def test_import_resume_from(client, auth_headers, monkeypatch):
+    """Test la reprise d'un import NDJSON (lots validés un par un)"""
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "IMPORT_CHUNK_SIZE", 2)
+    content = "".join(
+        json.dumps({"title": f"Import {i}", "username": "bot", "password": "pw"}) + "\n"
+        for i in range(5)
+    )
+
+    response = client.post(
+        "/secrets/import?format=ndjson&resume_from=3",
+        files={"file": ("vault.ndjson", content, "application/x-ndjson")},
+        headers=auth_headers
+    )
+
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [e["event"] for e in events] == ["progress", "progress", "progress", "done"]
+    assert events[-1]["rows"] == 5
+    assert events[-1]["imported"] == 2
+
+    titles = {secret["title"] for secret in client.get("/secrets/", headers=auth_headers).json()}
+    assert titles == {"Import 3", "Import 4"}
+
+
+def test_import_unknown_csv_header(client, auth_headers):
+    """Test qu'un CSV sans colonnes reconnues est refusé avant tout import"""
+    response = client.post(
+        "/secrets/import",
+        files={"file": ("other.csv", "foo,bar\n1,2\n", "text/csv")},
+        headers=auth_headers
+    )
+
+    assert response.status_code == 400
+
+
+def test_get_secret_cache_invalidated_on_update(client, auth_headers, monkeypatch):
+    """Test le cache des secrets déchiffrés : hit, puis invalidation immédiate"""
+    from app.core.secret_cache import secret_cache
+
+    monkeypatch.setattr(secret_cache, "max_bytes", 1024 * 1024)
+    created = create_secret(client, auth_headers, password="v1")
+    hits = secret_cache.hits
+
+    assert client.get(f"/secrets/{created['id']}", headers=auth_headers).json()["password"] == "v1"
+    assert client.get(f"/secrets/{created['id']}", headers=auth_headers).json()["password"] == "v1"
+    assert secret_cache.hits == hits + 1
+
+    client.patch(f"/secrets/{created['id']}", json={"password": "v2"}, headers=auth_headers)
+    assert client.get(f"/secrets/{created['id']}", headers=auth_headers).json()["password"] == "v2"
+
+    client.delete(f"/secrets/{created['id']}", headers=auth_headers)
+    assert client.get(f"/secrets/{created['id']}", headers=auth_headers).status_code == 404
+    secret_cache.clear()
+
+
+def test_list_secrets_etag(client, auth_headers):
+    """Test le GET conditionnel de la liste : 304 tant que le coffre ne change pas"""
+    create_secret(client, auth_headers, title="ETag")
+
+    first = client.get("/secrets/", headers=auth_headers)
+    etag = first.headers["ETag"]
+    not_modified = client.get("/secrets/", headers={**auth_headers, "If-None-Match": etag})
+
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert client.get("/secrets/?limit=5", headers={**auth_headers, "If-None-Match": etag}).status_code == 200
+
+    create_secret(client, auth_headers, title="ETag 2")
+    changed = client.get("/secrets/", headers={**auth_headers, "If-None-Match": etag})
+
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert len(changed.json()) == 2
+
+
+def test_get_secret_etag(client, auth_headers):
+    """Test le GET conditionnel du détail : 304 jusqu'à la modification du secret"""
+    created = create_secret(client, auth_headers)
+    other = create_secret(client, auth_headers, title="Other")
+
+    etag = client.get(f"/secrets/{created['id']}", headers=auth_headers).headers["ETag"]
+    conditional = {**auth_headers, "If-None-Match": etag}
+
+    assert client.get(f"/secrets/{created['id']}", headers=conditional).status_code == 304
+
+    client.patch(f"/secrets/{other['id']}", json={"title": "Other 2"}, headers=auth_headers)
+    assert client.get(f"/secrets/{created['id']}", headers=conditional).status_code == 304
+
+    client.patch(f"/secrets/{created['id']}", json={"password": "changed"}, headers=auth_headers)
+    response = client.get(f"/secrets/{created['id']}", headers=conditional)
+
+    assert response.status_code == 200
+    assert response.json()["password"] == "changed"
+
+
+def test_secret_changes_since_version(client, auth_headers):
+    """Test la synchronisation incrémentale : créations, modifications et suppressions"""
+    first = create_secret(client, auth_headers, title="Sync 1")
+    second = create_secret(client, auth_headers, title="Sync 2")
+
+    initial = client.get("/secrets/changes", headers=auth_headers).json()
+    assert [secret["title"] for secret in initial["changes"]] == ["Sync 1", "Sync 2"]
+    assert initial["has_more"] is False
+
+    since = initial["version"]
+    assert client.get(f"/secrets/changes?since={since}", headers=auth_headers).json()["changes"] == []
+
+    client.patch(f"/secrets/{first['id']}", json={"title": "Sync 1 bis"}, headers=auth_headers)
+    client.delete(f"/secrets/{second['id']}", headers=auth_headers)
+    client.post("/secrets/batch", json={"items": [
+        {"title": f"Sync batch {i}", "username": "bot", "password": "pw"} for i in range(3)
+    ]}, headers=auth_headers)
+
+    delta = client.get(f"/secrets/changes?since={since}", headers=auth_headers).json()
+
+    assert [secret["title"] for secret in delta["changes"]] == [
+        "Sync 1 bis", "Sync batch 0", "Sync batch 1", "Sync batch 2"
+    ]
+    assert [deleted["id"] for deleted in delta["deleted"]] == [second["id"]]
+    versions = [secret["version"] for secret in delta["changes"]] + [delta["deleted"][0]["version"]]
+    assert len(set(versions)) == 5
+    assert delta["version"] == since + 5
+
+
+def test_secret_changes_pagination(client, auth_headers):
+    """Test la pagination des changements par version"""
+    client.post("/secrets/batch", json={"items": [
+        {"title": f"Page {i}", "username": "bot", "password": "pw"} for i in range(5)
+    ]}, headers=auth_headers)
+
+    titles = []
+    since = 0
+    while True:
+        page = client.get(f"/secrets/changes?since={since}&limit=2", headers=auth_headers).json()
+        titles.extend(secret["title"] for secret in page["changes"])
+        since = page["version"]
+        if not page["has_more"]:
+            break
+
+    assert titles == [f"Page {i}" for i in range(5)]
+
+
+def test_concurrent_batch_delete_and_update(client, auth_headers):
+    """Test qu'un batch delete et un batch update simultanés ne s'interbloquent pas"""
+    import asyncio
+
+    import httpx
+
+    from app.main import app
+
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", headers=auth_headers) as http:
+            statuses = []
+            for _ in range(10):
+                created = await http.post("/secrets/batch", json={"items": [
+                    {"title": f"Race {i}", "username": "bot", "password": "pw"} for i in range(4)
+                ]})
+                ids = [item["id"] for item in created.json()]
+                responses = await asyncio.gather(
+                    http.post("/secrets/batch/delete", json={"ids": ids}),
+                    http.patch("/secrets/batch", json={"items": [{"id": i, "title": "x"} for i in reversed(ids)]}),
+                    http.post("/secrets/batch/delete", json={"ids": list(reversed(ids))})
+                )
+                statuses += [response.status_code for response in responses]
+            return statuses
+
+    assert set(asyncio.run(scenario())) == {200}
@@ -0,0 +1,96 @@
+import io
+import json
+import uuid
+
+from app.core.config import settings
+from app.core.log import configure_logging, shutdown_logging
+from app.core.tracing import current_trace, span, start_trace
+
+
+def _slow_request_logs(buffer):
+    entries = [json.loads(line) for line in buffer.getvalue().splitlines()]
+    return [e for e in entries if e["logger"] == "app.trace"]
+
+
+def test_span_is_noop_without_trace():
+    """Test qu'un span hors trace ne coûte rien et n'enregistre rien"""
+    with span("crypto.decrypt"):
+        pass
+    assert current_trace() is None
+
+    with start_trace() as trace:
+        with span("auth.get_current_user"):
+            with span("db.pool_checkout"):
+                pass
+
+    assert [s["name"] for s in trace.to_dict()["spans"]] == ["auth.get_current_user", "db.pool_checkout"]
+    assert trace.breakdown["db.pool_checkout"]["count"] == 1
+
+
+def test_slow_request_dumps_spans_and_sql(client, auth_headers, monkeypatch):
+    """Test que la trace d'une requête lente détaille dépendances, SQL et déchiffrement"""
+    create = client.post(
+        "/secrets/",
+        json={"title": "traced", "username": "u", "password": "super-secret"},
+        headers=auth_headers
+    )
+    secret_id = create.json()["id"]
+
+    monkeypatch.setattr(settings, "TRACING_ENABLED", True)
+    monkeypatch.setattr(settings, "TRACE_SLOW_REQUEST_MS", 0)
+    buffer = io.StringIO()
+    shutdown_logging()
+    configure_logging(stream=buffer)
+
+    response = client.get(f"/secrets/{secret_id}", headers={**auth_headers, "X-Request-ID": "slow-1"})
+    shutdown_logging()
+
+    assert response.status_code == 200
+    [entry] = _slow_request_logs(buffer)
+    assert entry["request_id"] == "slow-1"
+    assert entry["route"] == "/secrets/{secret_id}"
+    assert entry["status"] == 200
+    assert {"auth.get_current_user", "db.sql", "crypto.decrypt"} <= entry["breakdown"].keys()
+    assert any("FROM secrets" in q["statement"] for q in entry["sql"])
+    # Texte des requêtes uniquement, jamais les valeurs liées
+    assert secret_id not in buffer.getvalue()
+    assert "super-secret" not in buffer.getvalue()
+
+
+def test_fast_requests_are_not_dumped(client, auth_headers, monkeypatch):
+    """Test qu'en dessous du seuil aucune trace n'est journalisée"""
+    monkeypatch.setattr(settings, "TRACING_ENABLED", True)
+    monkeypatch.setattr(settings, "TRACE_SLOW_REQUEST_MS", 60_000)
+    buffer = io.StringIO()
+    shutdown_logging()
+    configure_logging(stream=buffer)
+
+    client.get("/secrets/", headers=auth_headers)
+    shutdown_logging()
+
+    assert _slow_request_logs(buffer) == []
+
+
+def test_profiler_is_admin_only(client, auth_headers, monkeypatch):
+    """Test que le profileur est désactivé par défaut et réservé aux admins"""
+    assert client.get("/debug/profile", headers=auth_headers).status_code == 404
+
+    monkeypatch.setattr(settings, "PROFILER_ENABLED", True)
+    assert client.get("/debug/profile", headers=auth_headers).status_code == 403
+
+    email = f"admin-{uuid.uuid4().hex[:8]}@example.com"
+    client.post("/auth/register", json={"email": email, "password": "password123"})
+    token = client.post("/auth/login", data={"username": email, "password": "password123"}).json()["access_token"]
+    monkeypatch.setattr(settings, "ADMIN_EMAILS", f"other@example.com, {email.upper()}")
+
+    response = client.get(
+        "/debug/profile",
+        params={"seconds": 0.2, "interval_ms": 10},
+        headers={"Authorization": f"Bearer {token}"}
+    )
+
+    assert response.status_code == 200
+    lines = response.text.splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) >= 1 and ";" in stack
@@ -0,0 +1,61 @@
+import time
+
+import pytest
+
+from app.core.user_cache import InMemoryUserCache, UserCacheBackend, get_user_cache
+
+
+def test_user_cache_lru_eviction():
+    """Test que le cache reste borné et évince l'entrée la moins récente"""
+    cache = InMemoryUserCache(ttl_seconds=60, max_size=2)
+    cache.set("a", {"id": "a"})
+    cache.set("b", {"id": "b"})
+    cache.get("a")
+    cache.set("c", {"id": "c"})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"id": "a"}
+    assert cache.stats()["evictions"] == 1
+
+
+def test_user_cache_ttl_expiry(monkeypatch):
+    """Test qu'une entrée expirée compte comme un miss"""
+    cache = InMemoryUserCache(ttl_seconds=10, max_size=10)
+    cache.set("a", {"id": "a"})
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+
+    assert cache.get("a") is None
+    assert cache.stats()["misses"] == 1
+
+
+def test_get_current_user_uses_cache(client):
+    """Test que /auth/me ne relit pas l'utilisateur en base à chaque requête"""
+    client.post(
+        "/auth/register",
+        json={"email": "cached@example.com", "password": "password123"}
+    )
+    token = client.post(
+        "/auth/login",
+        data={"username": "cached@example.com", "password": "password123"}
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    client.get("/auth/me", headers=headers)
+    hits_before = get_user_cache().stats()["hits"]
+    response = client.get("/auth/me", headers=headers)
+
+    assert response.status_code == 200
+    assert response.json()["email"] == "cached@example.com"
+    assert get_user_cache().stats()["hits"] == hits_before + 1
+
+
+def test_incomplete_user_cache_backend_is_rejected():
+    """Test qu'un backend incomplet échoue dès sa construction"""
+    class PartialCache(UserCacheBackend):
+        def get(self, user_id):
+            return None
+
+    with pytest.raises(TypeError):
+        PartialCache()